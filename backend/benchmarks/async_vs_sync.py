@@ -0,0 +1,129 @@
+"""
+Patient info lookup through the threadpool model against the asyncpg layer.
+
+Serves the GetPatientInfoQuery SQL from two ASGI routes, a sync def handler on
+Database (psycopg2, run in Starlette's threadpool) and an async def handler on
+GetPatientInfoQuery (AsyncDatabase), and drives both with the same request load at
+several concurrency levels. Requests go through the ASGI stack in process, so the
+numbers exclude the network but include the threadpool hand-off:
+
+    python -m benchmarks.async_vs_sync --requests 5000 --concurrency 16 64 256
+"""
+import os
+import time
+import asyncio
+import argparse
+
+# psycopg2 closes connections returned above minconn, keep the whole sync pool open so
+# both layers measure pooled connections rather than reconnects
+os.environ.setdefault("POSTGRES_POOL_MIN", os.getenv("POSTGRES_POOL_MAX", "10"))
+
+from benchmarks.common import latency_summary, require_postgres
+
+BENCH_EMAIL = "async-vs-sync-bench@example.com"
+
+
+class _SqlRecorder:
+    # Stands in for AsyncDatabase to read the SQL a query class issues
+    async def execute_query(self, query, params=None):
+        self.query = query
+        return []
+
+
+def patient_info_sql() -> str:
+    from queries import GetPatientInfoQuery
+
+    query = GetPatientInfoQuery()
+    query.db = _SqlRecorder()
+    asyncio.run(query.get_patient_info(0))
+    return query.db.query
+
+
+def seed_patient():
+    from utils import Database
+
+    db = Database()
+    rows = db.execute_query("SELECT account_id FROM accounts WHERE email = %s", (BENCH_EMAIL,))
+    if rows:
+        return rows[0][0]
+    with db.transaction():
+        account_id = db.execute_query(
+            "INSERT INTO accounts (fullname, email, password_hash) VALUES (%s, %s, %s) RETURNING account_id",
+            ("Async Bench", BENCH_EMAIL, "not-a-hash"),
+        )[0][0]
+        patient_id = db.execute_query("INSERT INTO patients (account_id) VALUES (%s) RETURNING patient_id", (account_id,))[0][0]
+        db.execute_non_query(
+            "INSERT INTO patient_health_metrics (patient_id, bmi, glucose, heart_rate) VALUES (%s, %s, %s, %s)",
+            (patient_id, 24.5, 90.0, 70.0),
+        )
+    return account_id
+
+
+def build_app(sql: str):
+    from fastapi import FastAPI
+    from queries import GetPatientInfoQuery
+    from utils import Database
+
+    app = FastAPI()
+
+    @app.get("/sync/{account_id}")
+    def sync_patient_info(account_id: int):
+        rows = Database().execute_query(sql, (account_id,))
+        return {"found": bool(rows)}
+
+    @app.get("/async/{account_id}")
+    async def async_patient_info(account_id: int):
+        row = await GetPatientInfoQuery().get_patient_info(account_id)
+        return {"found": row is not None}
+
+    return app
+
+
+async def run(client, path: str, name: str, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def call():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path)
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200 and response.json()["found"], response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*[call() for _ in range(requests)])
+    print(latency_summary(name, samples, time.perf_counter() - start))
+
+
+async def main(args, sql):
+    import httpx
+    from migrations import MigrationRunner
+    from utils import Database, AsyncDatabase
+
+    Database.init_pool()
+    MigrationRunner().upgrade()
+    await AsyncDatabase.init_pool()
+    try:
+        account_id = seed_patient()
+        transport = httpx.ASGITransport(app=build_app(sql))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Warm both pools and the prepared statement caches before measuring
+            for mode in ("sync", "async"):
+                await run(client, f"/{mode}/{account_id}", f"warm-up ({mode})", 200, max(args.concurrency))
+            for concurrency in args.concurrency:
+                for mode in ("sync", "async"):
+                    await run(client, f"/{mode}/{account_id}", f"{mode} (concurrency {concurrency})", args.requests, concurrency)
+    finally:
+        await AsyncDatabase.close_shared_pool()
+        Database.close_shared_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256])
+    args = parser.parse_args()
+    require_postgres()
+    # Read before the event loop starts, the recorder runs its own
+    sql = patient_info_sql()
+    asyncio.run(main(args, sql))
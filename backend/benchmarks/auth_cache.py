@@ -0,0 +1,143 @@
+"""
+Redis cost of the auth dependency with a client per request against the shared pool.
+
+Calls patient_login_required with a valid token in three setups:
+
+- per-request client: every Cache() opens its own client and sends a PING before the
+  blacklist lookup, as before the shared pool
+- shared pool: Cache() reuses the process-wide client, the lookup is the only roundtrip
+- blacklist filter: the token blacklist filter is in sync and skips Redis entirely
+
+Runs against the Redis configured by REDIS_* with --redis, otherwise against an
+in-memory fakeredis server that adds --rtt-ms to every roundtrip:
+
+    python -m benchmarks.auth_cache --iterations 2000 --rtt-ms 0.5
+    python -m benchmarks.auth_cache --redis
+"""
+import os
+import sys
+import time
+import argparse
+import importlib
+
+from benchmarks.common import latency_summary
+
+
+class RoundtripCounter:
+    def __init__(self, rtt_ms: float):
+        self.rtt = rtt_ms / 1000.0
+        self.count = 0
+
+
+def fake_connection_class(counter: RoundtripCounter):
+    import fakeredis
+
+    class DelayedConnection(fakeredis.FakeRedisConnection):
+        # One reply read is one network roundtrip
+        def read_response(self, *args, **kwargs):
+            counter.count += 1
+            if counter.rtt:
+                time.sleep(counter.rtt)
+            return super().read_response(*args, **kwargs)
+
+    return DelayedConnection
+
+
+def install_fake_redis(counter: RoundtripCounter):
+    import fakeredis
+    import redis
+    from utils import Cache
+    from utils.cache import MeteredConnectionPool
+
+    server = fakeredis.FakeServer()
+    connection_class = fake_connection_class(counter)
+    Cache._shared_pool = MeteredConnectionPool(
+        connection_class=connection_class, server=server, max_connections=16, timeout=1, decode_responses=True
+    )
+    Cache._shared_client = redis.StrictRedis(connection_pool=Cache._shared_pool)
+
+    def new_client():
+        return redis.StrictRedis(connection_pool=redis.ConnectionPool(
+            connection_class=connection_class, server=server, decode_responses=True
+        ))
+
+    return new_client
+
+
+def real_redis_client():
+    import redis
+
+    return redis.StrictRedis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        db=int(os.getenv("REDIS_DB", 0)),
+        password=os.getenv("REDIS_PASSWORD", None),
+        decode_responses=True,
+    )
+
+
+def per_request_cache(new_client):
+    from utils import Cache
+
+    class PerRequestCache(Cache):
+        # The Cache of before the shared pool: a client of its own and a PING on construction
+        def __init__(self):
+            self.client = new_client()
+            self.client.ping()
+
+    return PerRequestCache
+
+
+def measure(name, func, iterations, counter):
+    func()
+    roundtrips = counter.count if counter else 0
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - call_start) * 1000)
+    summary = latency_summary(name, samples, time.perf_counter() - start)
+    if counter:
+        # The warm-up call is counted as well
+        summary += f"  roundtrips/req={(counter.count - roundtrips) / (iterations + 1):.1f}"
+    print(summary)
+
+
+def main(args):
+    from utils import Cache, sign_token, patient_login_required, token_blacklist
+
+    blacklist_module = importlib.import_module("utils.token_blacklist")
+    if args.redis:
+        # Only fakeredis connections count roundtrips
+        counter = None
+        new_client = real_redis_client
+        try:
+            Cache().ping()
+        except Exception:
+            sys.exit("Redis is not available, set REDIS_HOST/PORT/DB/PASSWORD")
+    else:
+        counter = RoundtripCounter(args.rtt_ms)
+        new_client = install_fake_redis(counter)
+
+    token = sign_token({"account_id": 1, "email": "bench@example.com", "role": "patient", "patient_id": 1})
+
+    def authenticate():
+        patient_login_required(token)
+
+    shared_cache = blacklist_module.Cache
+    token_blacklist._synced = False
+    blacklist_module.Cache = per_request_cache(new_client)
+    measure("per-request client", authenticate, args.iterations, counter)
+    blacklist_module.Cache = shared_cache
+    measure("shared pool", authenticate, args.iterations, counter)
+    token_blacklist._synced = True
+    measure("blacklist filter", authenticate, args.iterations, counter)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    parser.add_argument("--redis", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,67 @@
+"""
+Per-request cost of the auth dependency with and without the verified token cache.
+
+Calls patient_login_required in process, with the token blacklist filter in sync so
+no Redis roundtrip is involved and only the token handling is measured:
+
+- verify_token: every request decodes and verifies the JWT, as before the cache
+- cached (hit): repeat requests of one session, served from the verified token cache
+- cached (miss): a new token on every request, verification plus the cache insert
+
+    python -m benchmarks.auth_dependency --iterations 20000
+"""
+import time
+import argparse
+import importlib
+
+from benchmarks.common import latency_summary
+
+
+class NoTokenCache:
+    # Stands in for VerifiedTokenCache, every request goes through verify_token
+    def get(self, token):
+        return None
+
+    def set(self, token, claims):
+        pass
+
+
+def measure(name, func, iterations):
+    func()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - call_start) * 1000)
+    print(latency_summary(name, samples, time.perf_counter() - start))
+    return sorted(samples)[len(samples) // 2]
+
+
+def main(args):
+    from utils import sign_token, patient_login_required, token_blacklist
+
+    middleware_module = importlib.import_module("utils.middleware")
+    # An empty, in-sync filter answers every blacklist check locally
+    token_blacklist._synced = True
+
+    def claims(account_id):
+        return {"account_id": account_id, "email": f"bench-{account_id}@example.com", "role": "patient", "patient_id": account_id}
+
+    token = sign_token(claims(1))
+    # Signed up front, signing is not part of the request
+    fresh_tokens = iter([sign_token(claims(idx)) for idx in range(args.iterations + 1)])
+
+    cache = middleware_module.verified_token_cache
+    middleware_module.verified_token_cache = NoTokenCache()
+    uncached_p50 = measure("verify_token", lambda: patient_login_required(token), args.iterations)
+    middleware_module.verified_token_cache = cache
+    cached_p50 = measure("cached (hit)", lambda: patient_login_required(token), args.iterations)
+    measure("cached (miss)", lambda: patient_login_required(next(fresh_tokens)), args.iterations)
+    print(f"{'':<28} saved per request at p50: {(uncached_p50 - cached_p50) * 1000:.1f} us ({uncached_p50 / cached_p50:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args())
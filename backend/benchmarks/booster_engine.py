@@ -0,0 +1,91 @@
+"""
+MODEL_ENGINE=booster (Booster.inplace_predict) against the sklearn predict_proba path.
+
+Scores random matrices of several batch sizes through MLCore's scoring path with both
+engines and checks that the probabilities agree. Uses a synthetic XGBClassifier unless
+--model-uri points at a logged model (needs MLFLOW_TRACKING_URI):
+
+    python -m benchmarks.booster_engine --iterations 500
+    python -m benchmarks.booster_engine --model-uri models:/ehr_xgb_model/1
+"""
+import time
+import argparse
+
+import numpy as np
+
+from benchmarks.common import latency_summary
+
+
+def synthetic_model(features: int, classes: int, estimators: int):
+    from xgboost import XGBClassifier
+
+    generator = np.random.default_rng(0)
+    X = generator.normal(size=(2000, features))
+    y = np.digitize(X[:, 0] + X[:, 1], np.linspace(-1, 1, classes - 1))
+    model = XGBClassifier(n_estimators=estimators, max_depth=6, n_jobs=1)
+    model.fit(X, y)
+    return model
+
+
+def scoring_core(model, feature_columns, engine, nthread):
+    from mlcore import MLCore
+    from mlcore.encoder import FeatureEncoder
+
+    core = MLCore.__new__(MLCore)
+    core.model = model
+    core.booster = None
+    core.worker_pool = None
+    core.batcher = None
+    core.model_engine_nthread = nthread
+    core.feature_encoder = FeatureEncoder(feature_columns)
+    if engine == "booster":
+        core._set_booster()
+    return core
+
+
+def measure(name, func, iterations):
+    func()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - call_start) * 1000)
+    print(latency_summary(name, samples, time.perf_counter() - start))
+    return sorted(samples)[len(samples) // 2]
+
+
+def main(args):
+    if args.model_uri:
+        import mlflow.xgboost
+
+        model = mlflow.xgboost.load_model(args.model_uri)
+        features = model.n_features_in_
+    else:
+        model = synthetic_model(args.features, args.classes, args.estimators)
+        features = args.features
+    feature_columns = [f"f{idx}" for idx in range(features)]
+    if hasattr(model, "set_params"):
+        model.set_params(n_jobs=args.nthread)
+    sklearn_core = scoring_core(model, feature_columns, "sklearn", args.nthread)
+    booster_core = scoring_core(model, feature_columns, "booster", args.nthread)
+
+    generator = np.random.default_rng(1)
+    for batch_size in args.batch_sizes:
+        X = generator.normal(size=(batch_size, features))
+        np.testing.assert_allclose(booster_core.predict_proba(X), sklearn_core.predict_proba(X), rtol=1e-6, atol=1e-7)
+        sklearn_p50 = measure(f"sklearn  (batch {batch_size})", lambda: sklearn_core.predict_proba(X), args.iterations)
+        booster_p50 = measure(f"booster  (batch {batch_size})", lambda: booster_core.predict_proba(X), args.iterations)
+        print(f"{'':<28} speedup at p50: {sklearn_p50 / booster_p50:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-uri", default=None)
+    parser.add_argument("--features", type=int, default=40)
+    parser.add_argument("--classes", type=int, default=3)
+    parser.add_argument("--estimators", type=int, default=200)
+    parser.add_argument("--nthread", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1000])
+    main(parser.parse_args())
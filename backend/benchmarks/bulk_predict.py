@@ -0,0 +1,120 @@
+"""
+Throughput and peak memory of /ml/predict_bulk on a large upload.
+
+Drives BulkPredictController with a generated NDJSON or CSV body of --rows records,
+sent in 64 KiB chunks like a real upload, and drains the streamed response:
+
+    python -m benchmarks.bulk_predict --rows 1000000 --format csv
+
+Scores with the model at MODEL_URI (needs MLflow), or with --constant-model a stand-in
+that returns fixed probabilities, to measure upload, parsing and streaming alone.
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+import importlib
+
+import numpy as np
+
+from benchmarks.common import peak_rss_mb
+
+CHUNK_BYTES = 64 * 1024
+
+
+class ConstantModel:
+    def get_model(self):
+        return True
+
+    def preprocess_records(self, records):
+        return np.zeros((len(records), 1))
+
+    def predict_proba(self, X):
+        return np.tile([0.8, 0.15, 0.05], (len(X), 1))
+
+    def build_results(self, probabilities):
+        return [{"risk_level": "low", "confidence": float(row[0])} for row in probabilities]
+
+
+def generate_lines(rows: int, fmt: str):
+    generator = random.Random(42)
+    if fmt == "csv":
+        yield "gender,age,bmi,glucose,heart_rate,systolic_bp,diastolic_bp\n"
+    for _ in range(rows):
+        record = {
+            "gender": generator.choice(["F", "M"]),
+            "age": generator.randint(18, 90),
+            "bmi": round(generator.uniform(17, 40), 1),
+            "glucose": round(generator.uniform(70, 180), 1),
+            "heart_rate": generator.randint(50, 120),
+            "systolic_bp": generator.randint(95, 170),
+            "diastolic_bp": generator.randint(60, 110),
+        }
+        if fmt == "csv":
+            yield ",".join(str(value) for value in record.values()) + "\n"
+        else:
+            yield json.dumps(record) + "\n"
+
+
+def make_receive(rows: int, fmt: str):
+    lines = generate_lines(rows, fmt)
+
+    async def receive():
+        buffer = []
+        size = 0
+        for line in lines:
+            buffer.append(line)
+            size += len(line)
+            if size >= CHUNK_BYTES:
+                return {"type": "http.request", "body": "".join(buffer).encode("utf-8"), "more_body": True}
+        return {"type": "http.request", "body": "".join(buffer).encode("utf-8"), "more_body": False}
+
+    return receive
+
+
+async def run(ml_core, rows: int, fmt: str):
+    from starlette.requests import Request
+
+    controller_module = importlib.import_module("controller.ml.BulkPredictController")
+    content_type = b"text/csv" if fmt == "csv" else b"application/x-ndjson"
+    scope = {"type": "http", "method": "POST", "path": "/ml/predict_bulk", "headers": [(b"content-type", content_type)]}
+    request = Request(scope, make_receive(rows, fmt))
+
+    start = time.perf_counter()
+    response = await controller_module.BulkPredictController(request, ml_core).execute()
+    uploaded = time.perf_counter()
+    results = errors = 0
+    async for chunk in response.body_iterator:
+        results += chunk.count("\n")
+        errors += chunk.count('"error"')
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{fmt:<7} rows={rows:<9} results={results:<9} errors={errors:<6} "
+        f"upload={uploaded - start:7.2f} s  total={elapsed:7.2f} s  {rows / elapsed:10.0f} rows/s  "
+        f"peak RSS={peak_rss_mb():8.1f} MB"
+    )
+
+
+def load_model():
+    from mlcore import MLCore
+
+    ml_core = MLCore()
+    ml_core.load_model()
+    ml_core.load_artifacts()
+    return ml_core
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--constant-model", action="store_true", help="Score with a stand-in instead of MODEL_URI")
+    args = parser.parse_args()
+
+    ml_core = ConstantModel() if args.constant_model else load_model()
+    # Baseline after the app imports, the difference to the peak is the upload itself
+    importlib.import_module("controller.ml.BulkPredictController")
+    print(f"baseline RSS={peak_rss_mb():.1f} MB")
+    asyncio.run(run(ml_core, args.rows, args.format))
@@ -0,0 +1,52 @@
+import os
+import sys
+import resource
+from typing import List
+
+# Benchmarks run from the backend directory: python -m benchmarks.<name>
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MODEL_AUTOLOAD", "false")
+os.environ.setdefault("DB_MIGRATE_ON_STARTUP", "false")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(name: str, samples_ms: List[float], elapsed_s: float) -> str:
+    """
+    One result line: throughput and p50/p95/p99 latency in milliseconds.
+    """
+    return (
+        f"{name:<28} n={len(samples_ms):<7} {len(samples_ms) / elapsed_s:10.1f} req/s  "
+        f"p50={percentile(samples_ms, 50):8.3f} ms  p95={percentile(samples_ms, 95):8.3f} ms  "
+        f"p99={percentile(samples_ms, 99):8.3f} ms"
+    )
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def require_postgres():
+    """
+    Exit with a message when the PostgreSQL configured by POSTGRES_* is not reachable.
+    """
+    import psycopg2
+
+    try:
+        psycopg2.connect(
+            user=os.getenv("POSTGRES_USER", "postgres"),
+            password=os.getenv("POSTGRES_PASSWORD", "postgres"),
+            host=os.getenv("POSTGRES_HOST", "database"),
+            dbname=os.getenv("POSTGRES_DB", "test_db"),
+            port=int(os.getenv("POSTGRES_PORT", 5432)),
+            connect_timeout=3,
+        ).close()
+    except Exception as e:
+        sys.exit(f"PostgreSQL is not available ({e}), set POSTGRES_HOST/PORT/USER/PASSWORD/DB")
@@ -0,0 +1,86 @@
+"""
+FeatureEncoder against the pandas get_dummies preprocessing.
+
+Encodes random FeatureRecords in batches of several sizes with both paths and checks
+that they produce the same matrix:
+
+    python -m benchmarks.encoder --iterations 200
+"""
+import time
+import random
+import typing
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import latency_summary
+
+
+def build_feature_columns(categorical_features):
+    from models import FeatureRecord
+
+    numeric = [field for field in FeatureRecord.model_fields if field not in categorical_features]
+    onehot = [
+        f"{field}_{value}"
+        for field in categorical_features
+        for value in typing.get_args(FeatureRecord.model_fields[field].annotation)
+    ]
+    return numeric + onehot
+
+
+def random_records(count, generator, categorical_features):
+    from models import FeatureRecord
+
+    records = []
+    for _ in range(count):
+        values = {}
+        for field, info in FeatureRecord.model_fields.items():
+            if field in categorical_features:
+                values[field] = generator.choice(typing.get_args(info.annotation))
+            else:
+                values[field] = None if generator.random() < 0.2 else round(generator.uniform(0, 200), 3)
+        records.append(FeatureRecord(**values).model_dump())
+    return records
+
+
+def measure(name, func, iterations):
+    func()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - call_start) * 1000)
+    print(latency_summary(name, samples, time.perf_counter() - start))
+    return sorted(samples)[len(samples) // 2]
+
+
+def main(args):
+    from mlcore import MLCore
+    from mlcore.encoder import FeatureEncoder, CATEGORICAL_FEATURES
+
+    feature_columns = build_feature_columns(CATEGORICAL_FEATURES)
+    encoder = FeatureEncoder(feature_columns)
+    generator = random.Random(42)
+
+    for batch_size in args.batch_sizes:
+        records = random_records(batch_size, generator, CATEGORICAL_FEATURES)
+
+        def pandas_path():
+            return MLCore.preprocess_for_inference(None, pd.DataFrame(records), feature_columns).to_numpy(dtype=np.float64)
+
+        def encoder_path():
+            return encoder.transform(records)
+
+        np.testing.assert_array_equal(encoder_path(), pandas_path())
+        pandas_p50 = measure(f"pandas   (batch {batch_size})", pandas_path, args.iterations)
+        encoder_p50 = measure(f"encoder  (batch {batch_size})", encoder_path, args.iterations)
+        print(f"{'':<28} speedup at p50: {pandas_p50 / encoder_p50:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1000])
+    main(parser.parse_args())
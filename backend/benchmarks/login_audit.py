@@ -0,0 +1,97 @@
+"""
+Login latency with the login audit buffer on and off.
+
+Runs LoginController end to end against the PostgreSQL configured by POSTGRES_*, with
+a low bcrypt cost so the database writes dominate:
+
+    python -m benchmarks.login_audit --requests 2000 --concurrency 8
+"""
+import os
+import time
+import asyncio
+import argparse
+import importlib
+
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_QUEUE_DEPTH", "4096")
+
+from benchmarks.common import latency_summary, require_postgres
+
+BENCH_EMAIL = "login-audit-bench@example.com"
+BENCH_PASSWORD = "Bench12345"
+
+
+def seed_account():
+    import bcrypt
+    from utils import Database
+
+    db = Database()
+    rows = db.execute_query("SELECT account_id FROM accounts WHERE email = %s", (BENCH_EMAIL,))
+    if rows:
+        return rows[0][0]
+    password_hash = bcrypt.hashpw(BENCH_PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=int(os.environ["BCRYPT_ROUNDS"]))).decode("utf-8")
+    with db.transaction():
+        account_id = db.execute_query(
+            "INSERT INTO accounts (fullname, email, password_hash) VALUES (%s, %s, %s) RETURNING account_id",
+            ("Login Bench", BENCH_EMAIL, password_hash),
+        )[0][0]
+        db.execute_non_query("INSERT INTO patients (account_id) VALUES (%s)", (account_id,))
+    return account_id
+
+
+async def run(mode: str, requests: int, concurrency: int):
+    # The package re-exports the class under the module's name, fetch the module itself
+    login_module = importlib.import_module("controller.auth.LoginController")
+    from models import LoginModel
+    from utils import login_audit_buffer
+
+    buffered = mode == "buffered"
+    login_module.LOGIN_AUDIT_BUFFER_ENABLED = buffered
+    if buffered:
+        login_audit_buffer.start()
+
+    payload = LoginModel(email=BENCH_EMAIL, password=BENCH_PASSWORD, role="patient")
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            await login_module.LoginController(payload, "127.0.0.1", "benchmark").execute()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    if buffered:
+        # Shutdown flush is not part of the request latency, but must not lose rows
+        await login_audit_buffer.stop()
+    print(latency_summary(f"login ({mode})", samples, elapsed))
+
+
+async def main(args):
+    from migrations import MigrationRunner
+    from utils import Database, AsyncDatabase, password_hasher
+
+    Database.init_pool()
+    MigrationRunner().upgrade()
+    await AsyncDatabase.init_pool()
+    seed_account()
+    password_hasher.start()
+    try:
+        # Warm the pools and the hashing workers before measuring
+        await run("direct", min(50, args.requests), args.concurrency)
+        for mode in ("direct", "buffered"):
+            await run(mode, args.requests, args.concurrency)
+    finally:
+        password_hasher.close()
+        await AsyncDatabase.close_shared_pool()
+        Database.close_shared_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    require_postgres()
+    asyncio.run(main(parser.parse_args()))
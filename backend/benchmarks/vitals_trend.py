@@ -0,0 +1,98 @@
+"""
+Vitals trend latency on a patient with many readings.
+
+Seeds --readings readings over the last 90 days for one patient in the PostgreSQL
+configured by POSTGRES_*, then compares the bucketed trend query with fetching the
+raw readings of the same window:
+
+    python -m benchmarks.vitals_trend --readings 100000 --iterations 50
+"""
+import time
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import latency_summary, require_postgres
+
+BENCH_EMAIL = "vitals-trend-bench@example.com"
+
+
+def seed_patient(readings: int):
+    from utils import Database
+
+    db = Database()
+    rows = db.execute_query(
+        "SELECT accounts.account_id, patients.patient_id FROM accounts JOIN patients ON patients.account_id = accounts.account_id WHERE email = %s",
+        (BENCH_EMAIL,),
+    )
+    if rows:
+        account_id, patient_id = rows[0]
+    else:
+        with db.transaction():
+            account_id = db.execute_query(
+                "INSERT INTO accounts (fullname, email, password_hash) VALUES (%s, %s, %s) RETURNING account_id",
+                ("Vitals Bench", BENCH_EMAIL, "not-a-hash"),
+            )[0][0]
+            patient_id = db.execute_query("INSERT INTO patients (account_id) VALUES (%s) RETURNING patient_id", (account_id,))[0][0]
+
+    existing = db.execute_query("SELECT COUNT(*) FROM patient_health_metrics WHERE patient_id = %s", (patient_id,))[0][0]
+    if existing < readings:
+        db.execute_non_query("""
+            INSERT INTO patient_health_metrics (patient_id, pain_severity, age, bmi, glucose, heart_rate, systolic_bp, diastolic_bp, recorded_time)
+            SELECT %s, random() * 10, 40, 20 + random() * 10, 70 + random() * 60, 55 + random() * 50,
+                100 + random() * 50, 60 + random() * 40,
+                (CURRENT_TIMESTAMP AT TIME ZONE 'UTC') - random() * INTERVAL '90 days'
+            FROM generate_series(1, %s)
+        """, (patient_id, readings - existing))
+        db.execute_non_query("ANALYZE patient_health_metrics")
+    return account_id, patient_id
+
+
+def measure(name, func, iterations):
+    func()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - call_start) * 1000)
+    print(latency_summary(name, samples, time.perf_counter() - start))
+
+
+def main(args):
+    from migrations import MigrationRunner
+    from queries import GetVitalsTrendQuery
+    from utils import Database
+
+    Database.init_pool()
+    MigrationRunner().upgrade()
+    try:
+        account_id, patient_id = seed_patient(args.readings)
+        end_time = datetime.now(timezone.utc).replace(tzinfo=None)
+        start_time = end_time - timedelta(days=90)
+        query = GetVitalsTrendQuery()
+        db = Database()
+
+        for buckets in (10, 100, 1000):
+            measure(
+                f"trend ({buckets} buckets)",
+                lambda: query.get_vitals_trend(account_id, start_time, end_time, buckets),
+                args.iterations,
+            )
+        measure(
+            "raw readings",
+            lambda: db.execute_query(
+                "SELECT * FROM patient_health_metrics WHERE patient_id = %s AND recorded_time >= %s AND recorded_time < %s",
+                (patient_id, start_time, end_time),
+            ),
+            max(1, args.iterations // 10),
+        )
+    finally:
+        Database.close_shared_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readings", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=50)
+    require_postgres()
+    main(parser.parse_args())
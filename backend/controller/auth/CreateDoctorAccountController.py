@@ -1,9 +1,10 @@
 import re
-import bcrypt
+
+from starlette.concurrency import run_in_threadpool
 
 from models import CreateDoctorAccountModel
 from queries import CreateDoctorAccountQuery
-from utils import ServerErrorException, InvalidDataException
+from utils import ServerErrorException, InvalidDataException, password_hasher
 
 class CreateDoctorAccountController:
     def __init__(self, payload: CreateDoctorAccountModel):
@@ -76,11 +77,7 @@ class CreateDoctorAccountController:
         }
         
         
-    def __hashed_password(self, password):
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        
-
-    def __create_doctor_account(self):
+    def __check_account_available(self):
         email_exists = self.query.check_email_exists(self.payload.email)
         if email_exists:
             self.query.stop()
@@ -90,9 +87,10 @@ class CreateDoctorAccountController:
         if license_exists:
             self.query.stop()
             raise InvalidDataException("Medical license number already exists")
-        
-        hashed_password = self.__hashed_password(self.payload.password)
-        self.query_payload['password_hash'] = hashed_password
+
+
+    def __create_doctor_account(self, password_hash):
+        self.query_payload['password_hash'] = password_hash
         
         account_id = self.query.create_account(self.query_payload)
         if not account_id:
@@ -110,6 +108,9 @@ class CreateDoctorAccountController:
             "doctor_id": doctor_id,
         }
 
-    def execute(self):
-        self.__create_doctor_account()
+    async def execute(self):
+        # Queries are blocking and run on the threadpool, bcrypt runs in the password hashing pool
+        await run_in_threadpool(self.__check_account_available)
+        password_hash = await password_hasher.hash(self.payload.password)
+        await run_in_threadpool(self.__create_doctor_account, password_hash)
         return self.response
\ No newline at end of file
@@ -1,9 +1,10 @@
 import re
-import bcrypt
+
+from starlette.concurrency import run_in_threadpool
 
 from models import CreatePatientAccountModel
 from queries import CreatePatientAccountQuery
-from utils import ServerErrorException, InvalidDataException
+from utils import ServerErrorException, InvalidDataException, password_hasher
 
 class CreatePatientAccountController:
     def __init__(self, payload: CreatePatientAccountModel):
@@ -61,18 +62,16 @@ class CreatePatientAccountController:
         return f"{year}-{month}-{day}"
             
             
-    def __hashed_password(self, password):
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        
-
-    def __create_patient_account(self):
+    def __check_email_available(self):
         email_exists = self.query.check_email_exists(self.payload.email)
         if email_exists:
             self.query.stop()
             raise InvalidDataException("Email already exists")
-        
+
+
+    def __create_patient_account(self, password_hash):
         self.query_payload['date_of_birth'] = self.__convert_date_format(self.payload.date_of_birth) if self.payload.date_of_birth else None
-        self.query_payload['password_hash'] = self.__hashed_password(self.payload.password)
+        self.query_payload['password_hash'] = password_hash
 
         account_id = self.query.create_account(self.query_payload)
         if not account_id:
@@ -90,6 +89,9 @@ class CreatePatientAccountController:
         }
 
 
-    def execute(self):
-       self.__create_patient_account()
-       return self.response
\ No newline at end of file
+    async def execute(self):
+        # Queries are blocking and run on the threadpool, bcrypt runs in the password hashing pool
+        await run_in_threadpool(self.__check_email_available)
+        password_hash = await password_hasher.hash(self.payload.password)
+        await run_in_threadpool(self.__create_patient_account, password_hash)
+        return self.response
\ No newline at end of file
@@ -1,15 +1,20 @@
-from utils import InvalidDataException, sign_token, Cache
+from utils import (
+    InvalidDataException,
+    sign_token,
+    generate_refresh_token,
+    hash_refresh_token,
+    REFRESH_TOKEN_EXPIRATION_TIME,
+    revoke_token,
+    logger,
+)
 from queries import GetNewAccessTokenQuery
 
-TOKEN_EXPIRATION_TIME = 60 * 60  # 60 minutes
-
 class GetNewAccessTokenController:
     def __init__(self, refresh_token: str, access_token: str, role: str):
         self.refresh_token = refresh_token
         self.role = role
         self.current_access_token = access_token
         self.response = None
-        self.cache = Cache()
         self.query = GetNewAccessTokenQuery()
         self.__validate_data()
     
@@ -23,21 +28,35 @@ class GetNewAccessTokenController:
             raise InvalidDataException("Role must be either 'patient' or 'doctor'.")
     
     def __get_new_access_token(self):
-        response = self.query.check_refresh_token_exists(self.refresh_token)
+        # Every refresh rotates the refresh token, the presented one can not be used again
+        new_refresh_token = generate_refresh_token()
+        response = self.query.rotate_refresh_token(
+            hash_refresh_token(self.refresh_token),
+            self.role,
+            hash_refresh_token(new_refresh_token),
+            REFRESH_TOKEN_EXPIRATION_TIME,
+        )
         if not response:
             self.query.stop()
             raise InvalidDataException("Refresh token does not exist or is invalid.")
-        _, account_id, email = response
+        account_id, email = response
         new_access_token = sign_token({
             "account_id": account_id,
             "email": email,
             "role": self.role
         })
-        self.cache.set(self.current_access_token, account_id, TOKEN_EXPIRATION_TIME)  # Cache the old access token for 1 hour
+        if self.current_access_token:
+            # Blacklist the old access token until it expires. The refresh token is already
+            # rotated, so a Redis failure must not cost the client its new tokens
+            try:
+                revoke_token(self.current_access_token)
+            except Exception as e:
+                logger.error(f"Could not revoke the previous access token: {e}")
 
         self.query.close()
         self.response = {
-            "new_access_token": new_access_token
+            "new_access_token": new_access_token,
+            "refresh_token": new_refresh_token
         }
         
     def execute(self):
@@ -1,15 +1,26 @@
-import bcrypt
 import re
-import secrets
-import string
+
+from fastapi import BackgroundTasks
 
 from models import LoginModel
 from queries import LoginQuery
-from utils import InvalidDataException, ServerErrorException, sign_token
+from utils import (
+    InvalidDataException,
+    ServerErrorException,
+    sign_token,
+    generate_refresh_token,
+    hash_refresh_token,
+    REFRESH_TOKEN_EXPIRATION_TIME,
+    LOGIN_AUDIT_BUFFER_ENABLED,
+    login_audit_buffer,
+    password_hasher,
+    logger,
+)
 
 class LoginController:
-    def __init__(self, payload: LoginModel, client_ip: str, user_agent: str):
+    def __init__(self, payload: LoginModel, client_ip: str, user_agent: str, background_tasks: BackgroundTasks = None):
         self.payload = payload
+        self.background_tasks = background_tasks
         self.response = None
         self.login_log_payload = None
         self.client_ip = client_ip
@@ -17,12 +28,15 @@ class LoginController:
         self.query = LoginQuery()
         self.__validate_payload()
         
-    def __generate_refresh_token(self):
-        alphabet = string.ascii_lowercase + string.digits
-        return ''.join(secrets.choice(alphabet) for _ in range(64))
-      
-    def __verify_password(self, password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    @staticmethod
+    async def rehash_password(account_id, password: str):
+        # The bcrypt cost changed since this hash was made, upgrade it now that we know the password.
+        # Runs after the response with its own query, the request's query is closed by then
+        try:
+            password_hash = await password_hasher.hash(password)
+            await LoginQuery().update_password_hash(account_id, password_hash)
+        except Exception as e:
+            logger.warning(f"Could not rehash password of account {account_id}: {e}")
 
     def __validate_payload(self):
         email = self.payload.email
@@ -30,36 +44,38 @@ class LoginController:
         role = self.payload.role
 
         if not email or not password or not role:
-            self.query.stop()
             raise InvalidDataException("Email, password, and role must be provided")
 
         email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         if not re.match(email_regex, email):
-            self.query.stop()
             raise InvalidDataException("Invalid email format")
 
         if len(password) < 6 or len(password) > 50 \
             or not re.search(r"[A-Z]", password) \
             or not re.search(r"[a-z]", password) \
             or not re.search(r"[0-9]", password):
-            self.query.stop()
             raise InvalidDataException("Password must be at least 6 characters long")
         
         if role not in ["patient", "doctor"]:
-            self.query.stop()
             raise InvalidDataException("Role must be either 'patient' or 'doctor'")
 
-    def __login(self):
-        account = self.query.get_account_by_email(self.payload.email)
+    async def __login(self):
+        account = await self.query.get_account_by_email(self.payload.email)
         if not account:
-            self.query.stop()
+            await self.query.stop()
             raise InvalidDataException("Invalid email or password")
 
         account_id, email, password_hash, profile_picture_url, fullname = account
 
-        if not self.__verify_password(self.payload.password, password_hash):
-            self.query.stop()
+        # bcrypt is CPU bound, it runs in the password hashing pool
+        if not await password_hasher.verify(self.payload.password, password_hash):
+            await self.query.stop()
             raise InvalidDataException("Invalid email or password")
+        if password_hasher.needs_rehash(password_hash):
+            if self.background_tasks is not None:
+                self.background_tasks.add_task(self.rehash_password, account_id, self.payload.password)
+            else:
+                await self.rehash_password(account_id, self.payload.password)
         
         jwt_payload = {
             "account_id": account_id,
@@ -68,42 +84,47 @@ class LoginController:
         }
         
         if self.payload.role == "doctor":
-            doctor = self.query.get_doctor_by_account_id(account_id)
+            doctor = await self.query.get_doctor_by_account_id(account_id)
             if not doctor:
-                self.query.stop()
+                await self.query.stop()
                 raise InvalidDataException("No doctor account associated with this email")
             doctor_id, medical_license_number = doctor
             jwt_payload["doctor_id"] = doctor_id
             jwt_payload["medical_license_number"] = medical_license_number
         else:  # patient
-            patient = self.query.get_patient_by_account_id(account_id)
+            patient = await self.query.get_patient_by_account_id(account_id)
             if not patient:
-                self.query.stop()
+                await self.query.stop()
                 raise InvalidDataException("No patient account associated with this email")
             patient_id, = patient
             jwt_payload["patient_id"] = patient_id
-        refresh_token = self.__generate_refresh_token()
+        refresh_token = generate_refresh_token()
         access_token = sign_token(jwt_payload)
         del jwt_payload["exp"]
         jwt_payload["profile_picture_url"] = profile_picture_url
         jwt_payload["fullname"] = fullname
         self.login_log_payload = {
             "account_id": account_id,
-            "refresh_token": refresh_token,
             "ip_address": self.client_ip,
             "user_agent": self.user_agent
         }
-        if not self.query.create_login_log(account_id, self.login_log_payload):
-            self.query.stop()
-            raise ServerErrorException("Failed to create login log")
+        # The refresh token has to exist before we answer, logout and refresh depend on it
+        if not await self.query.create_refresh_token(account_id, self.payload.role, hash_refresh_token(refresh_token), REFRESH_TOKEN_EXPIRATION_TIME):
+            await self.query.stop()
+            raise ServerErrorException("Failed to create refresh token")
+        # The audit log is written behind, directly only when the buffer is off or full
+        if not (LOGIN_AUDIT_BUFFER_ENABLED and login_audit_buffer.enqueue(account_id, self.client_ip, self.user_agent)):
+            if not await self.query.create_login_log(account_id, self.login_log_payload):
+                await self.query.stop()
+                raise ServerErrorException("Failed to create login log")
         
-        self.query.close()
+        await self.query.close()
         self.response = {
             "refresh_token": refresh_token,
             "access_token": access_token,
             "account": jwt_payload
         }
 
-    def execute(self):
-        self.__login()
+    async def execute(self):
+        await self.__login()
         return self.response
\ No newline at end of file
@@ -0,0 +1,11 @@
+from mlcore import ModelRegistry
+from models import ActivateModelVersionPayload
+
+class ActivateModelVersionController:
+    def __init__(self, payload: ActivateModelVersionPayload, model_registry: ModelRegistry):
+        self.payload = payload
+        self.model_registry = model_registry
+
+    def execute(self):
+        self.model_registry.activate(self.payload.model_key)
+        return f"Model '{self.payload.model_key}' activated"
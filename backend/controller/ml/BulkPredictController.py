@@ -0,0 +1,136 @@
+import io
+import os
+import csv
+import json
+import tempfile
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from models import FeatureRecord
+from mlcore import MLCore
+from utils import BadRequestException, PayloadTooLargeException
+
+BULK_PREDICT_CHUNK_SIZE = int(os.getenv("BULK_PREDICT_CHUNK_SIZE", "1000"))
+# Request bodies larger than this are spooled to disk instead of memory
+BULK_PREDICT_SPOOL_MAX_BYTES = int(os.getenv("BULK_PREDICT_SPOOL_MAX_BYTES", 8 * 1024 * 1024))
+# Uploads above this size are rejected with 413, rows past the row limit are not scored
+BULK_PREDICT_MAX_BYTES = int(os.getenv("BULK_PREDICT_MAX_BYTES", 256 * 1024 * 1024))
+BULK_PREDICT_MAX_ROWS = int(os.getenv("BULK_PREDICT_MAX_ROWS", 1000000))
+
+class BulkPredictController:
+    def __init__(self, request: Request, ml_core: MLCore):
+        if not ml_core or not ml_core.get_model():
+            raise BadRequestException("MLCore instance is not initialized or model is not loaded.")
+        self.ml_core = ml_core
+        self.request = request
+        self.is_csv = request.headers.get("content-type", "").startswith("text/csv")
+        self.body_file = None
+        self.rows = None
+        self.next_index = 0
+
+    async def _spool_body(self):
+        # Read the whole upload before streaming the response: the body is not guaranteed
+        # to be readable once the response has started. Chunks go straight to the spool
+        # file, only the parsed chunk being scored is held in memory.
+        content_length = self.request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > BULK_PREDICT_MAX_BYTES:
+            raise PayloadTooLargeException(f"Upload is larger than {BULK_PREDICT_MAX_BYTES} bytes")
+
+        self.body_file = tempfile.SpooledTemporaryFile(max_size=BULK_PREDICT_SPOOL_MAX_BYTES)
+        size = 0
+        async for chunk in self.request.stream():
+            size += len(chunk)
+            if size > BULK_PREDICT_MAX_BYTES:
+                self.body_file.close()
+                raise PayloadTooLargeException(f"Upload is larger than {BULK_PREDICT_MAX_BYTES} bytes")
+            self.body_file.write(chunk)
+        self.body_file.seek(0)
+
+        if self.is_csv:
+            self.rows = self._read_csv(io.TextIOWrapper(self.body_file, encoding="utf-8", newline=""))
+        else:
+            self.rows = self._read_ndjson(self.body_file)
+
+    def _read_ndjson(self, body_file):
+        # Parse and decoding errors are yielded instead of raised so one bad line does not
+        # end the stream. Lines are decoded one by one, so the next line is still readable.
+        for line in body_file:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line.decode("utf-8"))
+            except ValueError as e:
+                yield e
+
+    def _read_csv(self, text):
+        reader = csv.DictReader(text)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except UnicodeDecodeError as e:
+                # The decoder can not resynchronize, report the error and end the input
+                yield e
+                return
+            # Empty CSV cells are missing values
+            yield {key: (value if value != "" else None) for key, value in row.items()}
+
+    def _score_next_chunk(self):
+        """
+        Parse and score the next BULK_PREDICT_CHUNK_SIZE rows.
+        :return: NDJSON text for the chunk, or None when the input is exhausted.
+        """
+        valid_indices = []
+        records = []
+        results = {}
+
+        for _ in range(BULK_PREDICT_CHUNK_SIZE):
+            index = self.next_index
+            try:
+                row = next(self.rows)
+            except StopIteration:
+                break
+            if index >= BULK_PREDICT_MAX_ROWS:
+                # Trailer row: the response has started, so the limit is reported in-band
+                results[index] = {"record_index": index, "error": f"Row limit of {BULK_PREDICT_MAX_ROWS} reached, remaining rows were not scored"}
+                self.rows = iter(())
+                break
+            self.next_index += 1
+            if isinstance(row, Exception):
+                results[index] = {"record_index": index, "error": f"Invalid row: {row}"}
+                continue
+
+            try:
+                records.append(FeatureRecord.model_validate(row).model_dump())
+                valid_indices.append(index)
+            except ValidationError as e:
+                results[index] = {"record_index": index, "error": f"Invalid record: {e.errors()[0]['msg']}"}
+
+        if not records and not results:
+            return None
+
+        if records:
+            probabilities = self.ml_core.predict_proba(self.ml_core.preprocess_records(records))
+            for index, result in zip(valid_indices, self.ml_core.build_results(probabilities)):
+                result["record_index"] = index
+                results[index] = result
+
+        return "".join(json.dumps(results[index]) + "\n" for index in sorted(results))
+
+    async def _stream_results(self):
+        try:
+            while True:
+                chunk = await run_in_threadpool(self._score_next_chunk)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self.body_file.close()
+
+    async def execute(self):
+        await self._spool_body()
+        return StreamingResponse(self._stream_results(), media_type="application/x-ndjson")
@@ -20,6 +20,9 @@ class GetModelMetadataController:
             "total_feature_columns": len(artifact_model.get("feature_columns", [])),
             "confidence_threshold": self.ml_core.confidence_threshold,
             "has_other_class": "other" in list(artifact_model.get("label_classes", [])),
+            "batching": self.ml_core.get_batching_stats(),
+            "worker_pool": self.ml_core.get_worker_pool_stats(),
+            "prediction_cache": self.ml_core.get_prediction_cache_stats(),
         }
     
     def execute(self):
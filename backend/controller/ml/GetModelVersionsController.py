@@ -0,0 +1,10 @@
+from mlcore import ModelRegistry
+
+class GetModelVersionsController:
+    def __init__(self, model_registry: ModelRegistry):
+        self.model_registry = model_registry
+        self.response = None
+
+    def execute(self):
+        self.response = self.model_registry.list_versions()
+        return self.response
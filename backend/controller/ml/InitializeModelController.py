@@ -1,14 +1,12 @@
-from mlcore import MLCore
+from mlcore import ModelRegistry
 from utils import BadRequestException
 
 class InitializeModelController:
-    def __init__(self, ml_core: MLCore):
-        if ml_core:
+    def __init__(self, model_registry: ModelRegistry):
+        if model_registry.get_active():
             raise BadRequestException("Model is already initialized.")
-        self.ml_core = MLCore()
+        self.model_registry = model_registry
         
 
     def execute(self):
-        self.ml_core.load_model()
-        self.ml_core.load_artifacts()
-        return self.ml_core
\ No newline at end of file
+        return self.model_registry.load(background=False)
\ No newline at end of file
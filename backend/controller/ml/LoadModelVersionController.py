@@ -0,0 +1,20 @@
+from mlcore import ModelRegistry
+from models import LoadModelVersionPayload
+from utils import InvalidDataException
+
+class LoadModelVersionController:
+    def __init__(self, payload: LoadModelVersionPayload, model_registry: ModelRegistry):
+        self.payload = payload
+        self.model_registry = model_registry
+        self.__validate_payload()
+
+    def __validate_payload(self):
+        model_uri = self.payload.model_uri.strip() if self.payload.model_uri else ""
+        parts = model_uri.split("/")
+        if not model_uri.startswith("models:/") or len(parts) != 3 or not parts[1] or not parts[2]:
+            raise InvalidDataException("Model URI must have the format models:/<model_name>/<version_or_alias>")
+        self.model_uri = model_uri
+
+    def execute(self):
+        self.model_registry.load(self.model_uri, activate=self.payload.activate)
+        return f"Loading model '{self.model_uri}' in background"
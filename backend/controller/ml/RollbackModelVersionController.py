@@ -0,0 +1,9 @@
+from mlcore import ModelRegistry
+
+class RollbackModelVersionController:
+    def __init__(self, model_registry: ModelRegistry):
+        self.model_registry = model_registry
+
+    def execute(self):
+        model_key = self.model_registry.rollback()
+        return f"Rolled back to model '{model_key}'"
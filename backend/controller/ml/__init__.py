@@ -1,3 +1,8 @@
 from .GetModelMetadataController import GetModelMetadataController
 from .InitializeModelController import InitializeModelController
-from .PredictController import PredictController
\ No newline at end of file
+from .PredictController import PredictController
+from .BulkPredictController import BulkPredictController
+from .GetModelVersionsController import GetModelVersionsController
+from .LoadModelVersionController import LoadModelVersionController
+from .ActivateModelVersionController import ActivateModelVersionController
+from .RollbackModelVersionController import RollbackModelVersionController
\ No newline at end of file
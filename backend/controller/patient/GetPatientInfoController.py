@@ -8,10 +8,10 @@ class GetPatientInfoController:
         self.query = GetPatientInfoQuery()
     
 
-    def _get_patient_info(self):
-        response = self.query.get_patient_info(self.account_info.get("account_id"))
+    async def _get_patient_info(self):
+        response = await self.query.get_patient_info(self.account_info.get("account_id"))
         if not response:
-            self.query.stop()
+            await self.query.stop()
             raise BadRequestException("Something went wrong when getting patient info")
         vital_ranges = self.query.get_vital_range()
         self.response = {
@@ -180,8 +180,8 @@ class GetPatientInfoController:
             ],
             "recorded_time": response[30],
         }
-        self.query.close()
+        await self.query.close()
 
-    def execute(self):
-        self._get_patient_info()
+    async def execute(self):
+        await self._get_patient_info()
         return self.response
\ No newline at end of file
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+from models import VitalsTrendModel
+from queries import GetVitalsTrendQuery
+from queries.patient.GetVitalsTrendQuery import VITAL_FIELDS
+from utils import BadRequestException
+
+DEFAULT_TREND_DAYS = 90
+
+class GetVitalsTrendController:
+    def __init__(self, account_info, payload: VitalsTrendModel):
+        self.account_info = account_info
+        self.payload = payload
+        self.response = None
+        self.query = GetVitalsTrendQuery()
+        self._validate_payload()
+
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        # recorded_time is stored as UTC without a time zone
+        if value.tzinfo:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def _validate_payload(self):
+        self.end_time = self._to_utc(self.payload.end_time) if self.payload.end_time else datetime.now(timezone.utc).replace(tzinfo=None)
+        self.start_time = self._to_utc(self.payload.start_time) if self.payload.start_time else self.end_time - timedelta(days=DEFAULT_TREND_DAYS)
+        if self.start_time >= self.end_time:
+            self.query.stop()
+            raise BadRequestException("start_time must be before end_time")
+
+    def _get_vitals_trend(self):
+        buckets = self.payload.buckets
+        rows = self.query.get_vitals_trend(self.account_info.get("account_id"), self.start_time, self.end_time, buckets)
+        bucket_width = (self.end_time - self.start_time) / buckets
+
+        vitals = {field: [] for field in VITAL_FIELDS}
+        for row in rows:
+            bucket, first_time, last_time, readings = row[:4]
+            bucket_start = self.start_time + bucket_width * (bucket - 1)
+            for idx, field in enumerate(VITAL_FIELDS):
+                count, minimum, maximum, average = row[4 + idx * 4:8 + idx * 4]
+                if not count:
+                    continue
+                vitals[field].append({
+                    "bucket_start": bucket_start,
+                    "first_time": first_time,
+                    "last_time": last_time,
+                    "count": count,
+                    "min": minimum,
+                    "max": maximum,
+                    "avg": average,
+                })
+
+        self.response = {
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "buckets": buckets,
+            "bucket_seconds": bucket_width.total_seconds(),
+            "readings": sum(row[3] for row in rows),
+            "vitals": vitals,
+        }
+        self.query.close()
+
+    def execute(self):
+        self._get_vitals_trend()
+        return self.response
\ No newline at end of file
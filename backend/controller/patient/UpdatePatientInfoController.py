@@ -29,12 +29,6 @@ class UpdatePatientInfoController:
         # Filter out None values
         account_fields = {k: v for k, v in account_fields.items() if v is not None}
         
-        if account_fields:
-            success = self.query.update_account_info(account_id, account_fields)
-            if not success:
-                self.query.stop()
-                raise BadRequestException("Failed to update account information")
-        
         # Update patient-specific information if provided
         patient_fields = {
             'medical_history': self.update_data.get('medical_history'),
@@ -45,12 +39,6 @@ class UpdatePatientInfoController:
         # Filter out None values
         patient_fields = {k: v for k, v in patient_fields.items() if v is not None}
         
-        if patient_fields:
-            success = self.query.update_patient_info(account_id, patient_fields)
-            if not success:
-                self.query.stop()
-                raise BadRequestException("Failed to update patient information")
-        
         # Update health metrics if provided
         health_metrics = {
             'gender': self.update_data.get('gender'),
@@ -77,9 +65,18 @@ class UpdatePatientInfoController:
         # Filter out None values
         health_metrics = {k: v for k, v in health_metrics.items() if v is not None}
         
-        if health_metrics:
-            success = self.query.update_health_metrics(account_id, health_metrics)
-            if not success:
+        # One roundtrip in one transaction, rolled back if any part did not apply
+        with self.query.transaction():
+            _, accounts_updated, patients_updated, metrics_inserted = self.query.update_patient(
+                account_id, account_fields, patient_fields, health_metrics
+            )
+            if account_fields and not accounts_updated:
+                self.query.stop()
+                raise BadRequestException("Failed to update account information")
+            if patient_fields and not patients_updated:
+                self.query.stop()
+                raise BadRequestException("Failed to update patient information")
+            if health_metrics and not metrics_inserted:
                 self.query.stop()
                 raise BadRequestException("Failed to update health metrics")
         
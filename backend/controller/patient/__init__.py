@@ -1,3 +1,4 @@
 from .GetPatientInfoController import GetPatientInfoController
 from .UpdatePatientInfoController import UpdatePatientInfoController
-from .GetRecommendationController import GetRecommendationController
\ No newline at end of file
+from .GetRecommendationController import GetRecommendationController
+from .GetVitalsTrendController import GetVitalsTrendController
\ No newline at end of file
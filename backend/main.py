@@ -1,17 +1,89 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from routes import *
-from utils import standard_response, StandardResponse, CustomException, Database, Cache
+from migrations import MigrationRunner
+from queries import GetNewAccessTokenQuery, HealthMetricsPartitionQuery
+from utils import standard_response, StandardResponse, CustomException, ServiceUnavailableException, Database, AsyncDatabase, Cache, logger, login_audit_buffer, LOGIN_AUDIT_BUFFER_ENABLED, token_blacklist, TOKEN_BLACKLIST_FILTER_ENABLED, password_hasher
 from fastapi.middleware.cors import CORSMiddleware
 
 ENV = os.getenv("ENV", "development")
 APP_VERSION = os.getenv("APP_VERSION", "version") if ENV == "production" else ENV
 API_VERSION = os.getenv("API_VERSION", "v1")
+MODEL_AUTOLOAD = os.getenv("MODEL_AUTOLOAD", "true").lower() in ["true", "1", "yes"]
+DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "true").lower() in ["true", "1", "yes"]
+REFRESH_TOKEN_PURGE_INTERVAL = int(os.getenv("REFRESH_TOKEN_PURGE_INTERVAL_SECONDS", 3600))
+HEALTH_METRICS_PARTITION_INTERVAL = int(os.getenv("HEALTH_METRICS_PARTITION_INTERVAL_SECONDS", 86400))
+HEALTH_METRICS_PARTITION_MONTHS_AHEAD = int(os.getenv("HEALTH_METRICS_PARTITION_MONTHS_AHEAD", 3))
 
-app = FastAPI(title="Mediverse Backend", version=APP_VERSION[:7])
+async def purge_refresh_tokens():
+    # Expired and revoked refresh tokens are deleted in the background, never on the request path
+    while True:
+        try:
+            deleted = await run_in_threadpool(GetNewAccessTokenQuery().purge_refresh_tokens)
+            if deleted:
+                logger.info(f"Purged {deleted} expired or revoked refresh token(s)")
+        except Exception as e:
+            logger.error(f"Failed to purge refresh tokens: {e}")
+        await asyncio.sleep(REFRESH_TOKEN_PURGE_INTERVAL)
+
+async def maintain_health_metrics_partitions():
+    # Keep monthly partitions ahead of the current month, so new readings never pile up in the default partition
+    while True:
+        try:
+            created = await run_in_threadpool(HealthMetricsPartitionQuery().ensure_partitions, HEALTH_METRICS_PARTITION_MONTHS_AHEAD)
+            if created:
+                logger.info(f"Created {created} patient_health_metrics partition(s)")
+        except Exception as e:
+            logger.error(f"Failed to create patient_health_metrics partitions: {e}")
+        await asyncio.sleep(HEALTH_METRICS_PARTITION_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One PostgreSQL pool for the whole process, shared by every query
+    try:
+        Database.init_pool()
+    except Exception as e:
+        logger.error(f"Database pool not available at startup, it will be created on first use: {e}")
+    # Bring the schema up to date, concurrent instances wait on an advisory lock
+    if DB_MIGRATE_ON_STARTUP:
+        try:
+            MigrationRunner().upgrade()
+        except Exception as e:
+            logger.error(f"Database migrations failed: {e}")
+    try:
+        await AsyncDatabase.init_pool()
+    except Exception as e:
+        logger.error(f"Async database pool not available at startup, it will be created on first use: {e}")
+    # Load and warm up the model in the background, /ready reports when it can serve traffic
+    if MODEL_AUTOLOAD:
+        logger.info("Loading model at startup")
+        model_registry.load()
+    purge_task = asyncio.create_task(purge_refresh_tokens())
+    partition_task = asyncio.create_task(maintain_health_metrics_partitions())
+    if LOGIN_AUDIT_BUFFER_ENABLED:
+        login_audit_buffer.start()
+    if TOKEN_BLACKLIST_FILTER_ENABLED:
+        token_blacklist.start()
+    password_hasher.start()
+    yield
+    token_blacklist.stop()
+    purge_task.cancel()
+    partition_task.cancel()
+    # Flush buffered login events before the database pools go away
+    await login_audit_buffer.stop()
+    model_registry.close()
+    password_hasher.close()
+    Database.close_shared_pool()
+    await AsyncDatabase.close_shared_pool()
+    Cache.close_shared_pool()
+
+app = FastAPI(title="Mediverse Backend", version=APP_VERSION[:7], lifespan=lifespan)
 
 # Register routes
 app.include_router(ml_router, tags=["Machine Learning System"], prefix=f"/ml/{API_VERSION}")
@@ -33,13 +105,42 @@ app.add_middleware(
 @standard_response
 def health_check():
     # Check database connection
-    db = Database()
-    db.execute_query("SELECT 1")
-    db.close_pool()
+    Database().execute_query("SELECT 1")
     # Check cache connection
-    Cache()
+    Cache().ping()
     return f"Mediverse Backend Service is running with version {APP_VERSION[:7]}"
 
+@app.get(f"/health/database", response_model=StandardResponse)
+@standard_response
+def database_pool_stats():
+    stats = Database.get_pool_stats()
+    if stats is None:
+        raise ServiceUnavailableException("Database pool is not initialized")
+    return stats
+
+@app.get(f"/health/cache", response_model=StandardResponse)
+@standard_response
+def cache_pool_stats():
+    stats = Cache.get_pool_stats()
+    if stats is None:
+        raise ServiceUnavailableException("Cache pool is not initialized")
+    stats["token_blacklist"] = token_blacklist.get_stats()
+    return stats
+
+@app.get(f"/ready", response_model=StandardResponse)
+@standard_response
+def readiness_check():
+    readiness = model_registry.get_readiness()
+    if readiness["active_model"] is None:
+        raise ServiceUnavailableException("Model is not loaded yet")
+    warmup = readiness["warmup"]
+    if not warmup["settled"]:
+        raise ServiceUnavailableException(
+            f"Model {readiness['active_model']} warm-up has not settled "
+            f"(p99 {warmup['p99_ms']:.2f} ms after {warmup['iterations']} predictions)"
+        )
+    return readiness
+
 @app.exception_handler(CustomException)
 async def http_exception_handler(request: Request, exc: CustomException):
     return JSONResponse(
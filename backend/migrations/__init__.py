@@ -0,0 +1 @@
+from .runner import MigrationRunner, split_statements
\ No newline at end of file
@@ -0,0 +1,49 @@
+import typer
+
+from utils import Database
+from .runner import MigrationRunner
+
+app = typer.Typer(help="Versioned database migrations, run with: python -m migrations <command>")
+
+
+@app.command()
+def upgrade(target: str = typer.Option(None, help="Last version to apply, defaults to the newest one")):
+    """
+    Apply every pending migration.
+    """
+    try:
+        applied = MigrationRunner().upgrade(target)
+        typer.echo(f"Applied {len(applied)} migration(s): {', '.join(applied) or '-'}")
+    finally:
+        Database.close_shared_pool()
+
+
+@app.command()
+def status():
+    """
+    List the migrations and whether they are applied.
+    """
+    try:
+        for migration in MigrationRunner().status():
+            state = "applied" if migration["applied"] else "pending"
+            if migration["modified"]:
+                state += " (modified since applied)"
+            typer.echo(f"{migration['version']}_{migration['name']}: {state}")
+    finally:
+        Database.close_shared_pool()
+
+
+@app.command()
+def baseline(target: str = typer.Argument(..., help="Last version already present in the database")):
+    """
+    Record migrations up to target as applied without running them, for databases created by the old init scripts.
+    """
+    try:
+        recorded = MigrationRunner().baseline(target)
+        typer.echo(f"Recorded {len(recorded)} migration(s) as applied: {', '.join(recorded) or '-'}")
+    finally:
+        Database.close_shared_pool()
+
+
+if __name__ == "__main__":
+    app()
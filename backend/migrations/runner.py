@@ -0,0 +1,226 @@
+import os
+import re
+import time
+import hashlib
+from typing import List, Optional
+
+from utils import Database, logger
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "versions")
+# First line of a migration that has to run outside a transaction, e.g. CREATE INDEX CONCURRENTLY
+NO_TRANSACTION_MARKER = "-- migrate:no-transaction"
+# Held for the whole run so concurrent app instances apply migrations one at a time
+ADVISORY_LOCK_ID = 720_300_118
+
+_FILENAME_PATTERN = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+_DOLLAR_QUOTE_PATTERN = re.compile(r"\$[A-Za-z_]*\$")
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Split a SQL script on top-level semicolons, skipping quoted strings, dollar-quoted
+    bodies and comments.
+    """
+    statements = []
+    start = 0
+    idx = 0
+    length = len(sql)
+    while idx < length:
+        char = sql[idx]
+        if sql.startswith("--", idx):
+            end = sql.find("\n", idx)
+            idx = length if end == -1 else end + 1
+        elif sql.startswith("/*", idx):
+            end = sql.find("*/", idx + 2)
+            idx = length if end == -1 else end + 2
+        elif char in ("'", '"'):
+            end = idx + 1
+            while end < length:
+                if sql[end] == char:
+                    # Doubled quote is an escaped quote
+                    if end + 1 < length and sql[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            idx = end + 1
+        elif char == "$" and (match := _DOLLAR_QUOTE_PATTERN.match(sql, idx)):
+            tag = match.group(0)
+            end = sql.find(tag, match.end())
+            idx = length if end == -1 else end + len(tag)
+        elif char == ";":
+            statements.append(sql[start:idx])
+            idx += 1
+            start = idx
+        else:
+            idx += 1
+    statements.append(sql[start:])
+
+    # Keep only statements with something besides comments and whitespace
+    return [
+        statement.strip() for statement in statements
+        if re.sub(r"--[^\n]*", "", statement).strip()
+    ]
+
+
+class Migration:
+    def __init__(self, path: str):
+        match = _FILENAME_PATTERN.match(os.path.basename(path))
+        if not match:
+            raise ValueError(f"Invalid migration file name '{os.path.basename(path)}', expected <version>_<name>.sql")
+        self.path = path
+        self.version = match.group(1)
+        self.name = match.group(2)
+        with open(path, "r", encoding="utf-8") as f:
+            self.sql = f.read()
+        self.checksum = hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+        self.transactional = not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+
+class MigrationRunner:
+    """
+    Applies the versioned SQL files in migrations/versions in order and records them
+    in schema_migrations.
+
+    Each migration runs in its own transaction, so a failed one leaves no partial
+    changes behind. Files starting with "-- migrate:no-transaction" run statement by
+    statement in autocommit mode for online operations such as CREATE INDEX
+    CONCURRENTLY, and should be written so they can be re-run (IF NOT EXISTS).
+    """
+
+    def __init__(self, migrations_dir: str = VERSIONS_DIR, connection_pool=None):
+        self.migrations_dir = migrations_dir
+        self.db = Database(connection_pool)
+
+    def discover(self) -> List[Migration]:
+        migrations = [
+            Migration(os.path.join(self.migrations_dir, filename))
+            for filename in os.listdir(self.migrations_dir)
+            if filename.endswith(".sql")
+        ]
+        migrations.sort(key=lambda migration: int(migration.version))
+        versions = [migration.version for migration in migrations]
+        if len(versions) != len(set(versions)):
+            raise ValueError("Duplicate migration versions in " + self.migrations_dir)
+        return migrations
+
+    def _ensure_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(32) PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                checksum VARCHAR(64) NOT NULL,
+                execution_ms FLOAT,
+                applied_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def _applied(self, cursor) -> dict:
+        cursor.execute("SELECT version, checksum FROM schema_migrations")
+        return dict(cursor.fetchall())
+
+    def _record(self, cursor, migration: Migration, execution_ms: Optional[float]):
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, name, checksum, execution_ms) VALUES (%s, %s, %s, %s)",
+            (migration.version, migration.name, migration.checksum, execution_ms),
+        )
+
+    def _apply(self, connection, migration: Migration):
+        start_time = time.perf_counter()
+        if migration.transactional:
+            connection.autocommit = False
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(migration.sql)
+                    self._record(cursor, migration, (time.perf_counter() - start_time) * 1000)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                connection.autocommit = True
+        else:
+            with connection.cursor() as cursor:
+                for statement in split_statements(migration.sql):
+                    cursor.execute(statement)
+                self._record(cursor, migration, (time.perf_counter() - start_time) * 1000)
+
+    def _run_locked(self, action):
+        with self.db.connection() as connection:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+            try:
+                with connection.cursor() as cursor:
+                    self._ensure_table(cursor)
+                return action(connection)
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_ID,))
+                connection.autocommit = False
+
+    def upgrade(self, target: Optional[str] = None) -> List[str]:
+        """
+        Apply every pending migration up to and including target.
+        :param target: Last version to apply, defaults to the newest one.
+        :return: Versions applied by this run.
+        """
+        migrations = self.discover()
+
+        def action(connection):
+            with connection.cursor() as cursor:
+                applied = self._applied(cursor)
+            newly_applied = []
+            for migration in migrations:
+                if target is not None and int(migration.version) > int(target):
+                    break
+                if migration.version in applied:
+                    if applied[migration.version] != migration.checksum:
+                        logger.warning(f"Migration {migration.version}_{migration.name} changed after it was applied")
+                    continue
+                logger.info(f"Applying migration {migration.version}_{migration.name}")
+                self._apply(connection, migration)
+                newly_applied.append(migration.version)
+            return newly_applied
+
+        newly_applied = self._run_locked(action)
+        logger.info(f"Database schema is up to date ({len(newly_applied)} migration(s) applied)")
+        return newly_applied
+
+    def baseline(self, target: str) -> List[str]:
+        """
+        Mark every migration up to target as applied without running it, for databases
+        created before migrations were tracked.
+        """
+        migrations = [m for m in self.discover() if int(m.version) <= int(target)]
+
+        def action(connection):
+            with connection.cursor() as cursor:
+                applied = self._applied(cursor)
+                recorded = []
+                for migration in migrations:
+                    if migration.version not in applied:
+                        self._record(cursor, migration, None)
+                        recorded.append(migration.version)
+            return recorded
+
+        return self._run_locked(action)
+
+    def status(self):
+        migrations = self.discover()
+
+        def action(connection):
+            with connection.cursor() as cursor:
+                return self._applied(cursor)
+
+        applied = self._run_locked(action)
+        return [
+            {
+                "version": migration.version,
+                "name": migration.name,
+                "applied": migration.version in applied,
+                "modified": migration.version in applied and applied[migration.version] != migration.checksum,
+                "transactional": migration.transactional,
+            }
+            for migration in migrations
+        ]
@@ -1,12 +1,7 @@
 -- ========================================
--- CLEAN INIT SCRIPT FOR POSTGRESQL
+-- INITIAL SCHEMA
 -- ========================================
-
--- Drop custom enum types if they exist
-DO $$ BEGIN
-    DROP TYPE IF EXISTS priority_level CASCADE;
-    DROP TYPE IF EXISTS appointment_status CASCADE;
-END $$;
+-- Baseline schema, formerly init_scripts/init-db1.sql.
 
 -- ========================================
 -- ENUM DEFINITIONS
@@ -14,19 +9,6 @@ END $$;
 CREATE TYPE priority_level AS ENUM ('low','medium','high');
 CREATE TYPE appointment_status AS ENUM ('pending','confirmed','rejected','completed');
 
--- ========================================
--- DROP TABLES IN ORDER
--- ========================================
-DROP TABLE IF EXISTS patient_recommendations CASCADE;
-DROP TABLE IF EXISTS appointments CASCADE;
-DROP TABLE IF EXISTS patient_doctors CASCADE;
-DROP TABLE IF EXISTS patient_health_metrics CASCADE;
-DROP TABLE IF EXISTS medical_records CASCADE;
-DROP TABLE IF EXISTS login_logs CASCADE;
-DROP TABLE IF EXISTS doctors CASCADE;
-DROP TABLE IF EXISTS patients CASCADE;
-DROP TABLE IF EXISTS accounts CASCADE;
-
 -- ========================================
 -- CORE USER ACCOUNT
 -- ========================================
@@ -128,7 +110,8 @@ CREATE TABLE patient_health_metrics (
     systolic_bp FLOAT,
     urea_nitrogen FLOAT,
     recorded_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    CONSTRAINT fk_metrics_patient FOREIGN KEY (patient_id) REFERENCES patients(patient_id)
+    CONSTRAINT fk_metrics_patient FOREIGN KEY (patient_id) REFERENCES patients(patient_id),
+    CONSTRAINT uq_metrics_patient UNIQUE (patient_id)
 );
 
 -- ========================================
@@ -0,0 +1,186 @@
+-- ========================================
+-- MIGRATION: TIME-SERIES PATIENT HEALTH METRICS
+-- ========================================
+-- patient_health_metrics becomes an append-only table partitioned by month of
+-- recorded_time. Every update appends a full snapshot, and patient_latest_metrics
+-- keeps the newest snapshot per patient so the patient info read stays a single
+-- primary key lookup. The rows already stored are kept as the first history entries.
+
+ALTER TABLE patient_health_metrics RENAME TO patient_health_metrics_legacy;
+
+-- ========================================
+-- APPEND-ONLY METRICS HISTORY
+-- ========================================
+CREATE TABLE patient_health_metrics (
+    metric_id BIGSERIAL,
+    patient_id INT NOT NULL,
+    gender VARCHAR(50),
+    race VARCHAR(50),
+    ethnicity VARCHAR(50),
+    tobacco_smoking_status VARCHAR(50),
+    pain_severity FLOAT,
+    age FLOAT,
+    bmi FLOAT,
+    calcium FLOAT,
+    carbon_dioxide FLOAT,
+    chloride FLOAT,
+    creatinine FLOAT,
+    diastolic_bp FLOAT,
+    glucose FLOAT,
+    heart_rate FLOAT,
+    potassium FLOAT,
+    respiratory_rate FLOAT,
+    sodium FLOAT,
+    systolic_bp FLOAT,
+    urea_nitrogen FLOAT,
+    recorded_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- The partition key has to be part of the primary key
+    CONSTRAINT pk_health_metrics PRIMARY KEY (metric_id, recorded_time),
+    CONSTRAINT fk_metrics_patient FOREIGN KEY (patient_id) REFERENCES patients(patient_id)
+) PARTITION BY RANGE (recorded_time);
+
+-- Rows outside every monthly partition land here instead of failing the insert
+CREATE TABLE patient_health_metrics_default PARTITION OF patient_health_metrics DEFAULT;
+
+-- Per-patient history scans, newest first. The vitals are included so trend
+-- queries are answered from the index alone.
+CREATE INDEX idx_health_metrics_patient_time ON patient_health_metrics (patient_id, recorded_time DESC)
+    INCLUDE (pain_severity, bmi, calcium, carbon_dioxide, chloride, creatinine, diastolic_bp, glucose,
+             heart_rate, potassium, respiratory_rate, sodium, systolic_bp, urea_nitrogen);
+
+-- Create the monthly partitions from start_month up to months_ahead months after the
+-- current one. The application calls it at startup and then daily, so partitions always
+-- exist ahead of the rows written into them. Rows that already landed in the default
+-- partition for a missing month are moved into the new partition, otherwise Postgres
+-- refuses to create it.
+CREATE OR REPLACE FUNCTION ensure_health_metrics_partitions(start_month DATE, months_ahead INT DEFAULT 3)
+RETURNS INT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', start_month)::DATE;
+    last_month DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => months_ahead))::DATE;
+    month_end DATE;
+    partition_name TEXT;
+    created INT := 0;
+BEGIN
+    -- Serialize concurrent callers, e.g. several app instances starting together
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_health_metrics_partitions'));
+    WHILE month_start <= last_month LOOP
+        month_end := (month_start + INTERVAL '1 month')::DATE;
+        partition_name := format('patient_health_metrics_%s', to_char(month_start, 'YYYY_MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I (LIKE patient_health_metrics INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format(
+                'WITH moved AS (
+                    DELETE FROM patient_health_metrics_default
+                    WHERE recorded_time >= %L AND recorded_time < %L
+                    RETURNING *
+                 ) INSERT INTO %I SELECT * FROM moved',
+                month_start, month_end, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE patient_health_metrics ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_end
+            );
+            created := created + 1;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_health_metrics_partitions(
+    LEAST(CURRENT_DATE, COALESCE((SELECT MIN(recorded_time)::DATE FROM patient_health_metrics_legacy), CURRENT_DATE))
+);
+
+-- ========================================
+-- LATEST VITALS PROJECTION
+-- ========================================
+CREATE TABLE patient_latest_metrics (
+    patient_id INT PRIMARY KEY,
+    metric_id BIGINT NOT NULL,
+    gender VARCHAR(50),
+    race VARCHAR(50),
+    ethnicity VARCHAR(50),
+    tobacco_smoking_status VARCHAR(50),
+    pain_severity FLOAT,
+    age FLOAT,
+    bmi FLOAT,
+    calcium FLOAT,
+    carbon_dioxide FLOAT,
+    chloride FLOAT,
+    creatinine FLOAT,
+    diastolic_bp FLOAT,
+    glucose FLOAT,
+    heart_rate FLOAT,
+    potassium FLOAT,
+    respiratory_rate FLOAT,
+    sodium FLOAT,
+    systolic_bp FLOAT,
+    urea_nitrogen FLOAT,
+    recorded_time TIMESTAMP NOT NULL,
+    CONSTRAINT fk_latest_metrics_patient FOREIGN KEY (patient_id) REFERENCES patients(patient_id)
+);
+
+-- Keep patient_latest_metrics in step with every appended snapshot. Late arriving
+-- snapshots older than the stored one do not replace it.
+CREATE OR REPLACE FUNCTION refresh_patient_latest_metrics()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO patient_latest_metrics (
+        patient_id, metric_id, gender, race, ethnicity, tobacco_smoking_status, pain_severity, age, bmi,
+        calcium, carbon_dioxide, chloride, creatinine, diastolic_bp, glucose, heart_rate, potassium,
+        respiratory_rate, sodium, systolic_bp, urea_nitrogen, recorded_time
+    ) VALUES (
+        NEW.patient_id, NEW.metric_id, NEW.gender, NEW.race, NEW.ethnicity, NEW.tobacco_smoking_status,
+        NEW.pain_severity, NEW.age, NEW.bmi, NEW.calcium, NEW.carbon_dioxide, NEW.chloride, NEW.creatinine,
+        NEW.diastolic_bp, NEW.glucose, NEW.heart_rate, NEW.potassium, NEW.respiratory_rate, NEW.sodium,
+        NEW.systolic_bp, NEW.urea_nitrogen, NEW.recorded_time
+    )
+    ON CONFLICT (patient_id) DO UPDATE SET
+        metric_id = EXCLUDED.metric_id,
+        gender = EXCLUDED.gender,
+        race = EXCLUDED.race,
+        ethnicity = EXCLUDED.ethnicity,
+        tobacco_smoking_status = EXCLUDED.tobacco_smoking_status,
+        pain_severity = EXCLUDED.pain_severity,
+        age = EXCLUDED.age,
+        bmi = EXCLUDED.bmi,
+        calcium = EXCLUDED.calcium,
+        carbon_dioxide = EXCLUDED.carbon_dioxide,
+        chloride = EXCLUDED.chloride,
+        creatinine = EXCLUDED.creatinine,
+        diastolic_bp = EXCLUDED.diastolic_bp,
+        glucose = EXCLUDED.glucose,
+        heart_rate = EXCLUDED.heart_rate,
+        potassium = EXCLUDED.potassium,
+        respiratory_rate = EXCLUDED.respiratory_rate,
+        sodium = EXCLUDED.sodium,
+        systolic_bp = EXCLUDED.systolic_bp,
+        urea_nitrogen = EXCLUDED.urea_nitrogen,
+        recorded_time = EXCLUDED.recorded_time
+    WHERE patient_latest_metrics.recorded_time <= EXCLUDED.recorded_time;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_refresh_patient_latest_metrics
+    AFTER INSERT ON patient_health_metrics
+    FOR EACH ROW EXECUTE FUNCTION refresh_patient_latest_metrics();
+
+-- ========================================
+-- BACKFILL
+-- ========================================
+INSERT INTO patient_health_metrics (
+    patient_id, gender, race, ethnicity, tobacco_smoking_status, pain_severity, age, bmi, calcium,
+    carbon_dioxide, chloride, creatinine, diastolic_bp, glucose, heart_rate, potassium, respiratory_rate,
+    sodium, systolic_bp, urea_nitrogen, recorded_time
+)
+SELECT
+    patient_id, gender, race, ethnicity, tobacco_smoking_status, pain_severity, age, bmi, calcium,
+    carbon_dioxide, chloride, creatinine, diastolic_bp, glucose, heart_rate, potassium, respiratory_rate,
+    sodium, systolic_bp, urea_nitrogen, COALESCE(recorded_time, CURRENT_TIMESTAMP)
+FROM patient_health_metrics_legacy
+ORDER BY recorded_time;
+
+DROP TABLE patient_health_metrics_legacy;
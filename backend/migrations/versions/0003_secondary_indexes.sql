@@ -0,0 +1,50 @@
+-- migrate:no-transaction
+-- ========================================
+-- MIGRATION: SECONDARY INDEXES FOR HOT LOOKUPS
+-- ========================================
+-- Foreign keys do not get an index of their own in PostgreSQL, so every lookup by
+-- account_id / patient_id / doctor_id below was a sequential scan. Built CONCURRENTLY
+-- so the migration can run against a live database. patient_health_metrics is already
+-- covered by idx_health_metrics_patient_time from 0002.
+
+-- A CREATE INDEX CONCURRENTLY that fails (e.g. on a deadlock or when cancelled) leaves an
+-- INVALID index behind, which IF NOT EXISTS would then skip forever. Drop those first so
+-- re-running this migration after a failure rebuilds them.
+DO $$
+DECLARE
+    invalid_index TEXT;
+BEGIN
+    FOR invalid_index IN
+        SELECT index_class.relname
+        FROM pg_index
+        JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+        JOIN pg_namespace ON pg_namespace.oid = index_class.relnamespace
+        WHERE NOT pg_index.indisvalid
+            AND pg_namespace.nspname = current_schema()
+            AND index_class.relname IN (
+                'idx_patients_account_id', 'idx_doctors_account_id',
+                'idx_appointments_doctor_date', 'idx_appointments_patient_date',
+                'idx_medical_records_patient_date', 'idx_medical_records_doctor_id',
+                'idx_patient_doctors_patient_id', 'idx_patient_doctors_doctor_id',
+                'idx_patient_recommendations_patient_id'
+            )
+    LOOP
+        EXECUTE format('DROP INDEX %I', invalid_index);
+    END LOOP;
+END;
+$$;
+
+-- Login and patient info: account -> patient / doctor
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_patients_account_id ON patients (account_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_doctors_account_id ON doctors (account_id);
+
+-- Doctor and patient schedules
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_appointments_doctor_date ON appointments (doctor_id, appointment_date);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_appointments_patient_date ON appointments (patient_id, appointment_date);
+
+-- Remaining foreign keys, also used for the foreign key checks when referenced rows are deleted
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_medical_records_patient_date ON medical_records (patient_id, record_date DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_medical_records_doctor_id ON medical_records (doctor_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_patient_doctors_patient_id ON patient_doctors (patient_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_patient_doctors_doctor_id ON patient_doctors (doctor_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_patient_recommendations_patient_id ON patient_recommendations (patient_id, created_time DESC);
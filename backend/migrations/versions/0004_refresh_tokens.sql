@@ -0,0 +1,30 @@
+-- ========================================
+-- MIGRATION: HASHED REFRESH TOKENS
+-- ========================================
+-- Refresh tokens move out of login_logs into their own table. Only the SHA-256 of a
+-- token is stored, the unique index makes a refresh a single index lookup, and every
+-- use revokes the presented token and issues a new one.
+
+CREATE TABLE refresh_tokens (
+    token_id BIGSERIAL PRIMARY KEY,
+    token_hash CHAR(64) NOT NULL,
+    account_id INT NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    expires_time TIMESTAMP NOT NULL,
+    revoked_time TIMESTAMP,
+    created_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_refresh_tokens_hash UNIQUE (token_hash),
+    CONSTRAINT fk_refresh_tokens_account FOREIGN KEY (account_id) REFERENCES accounts(account_id)
+);
+
+-- Background purge of expired and revoked tokens
+CREATE INDEX idx_refresh_tokens_expires_time ON refresh_tokens (expires_time);
+CREATE INDEX idx_refresh_tokens_account_id ON refresh_tokens (account_id);
+
+-- login_logs is an audit trail now, it no longer keeps usable credentials
+UPDATE login_logs SET refresh_token = NULL WHERE refresh_token IS NOT NULL;
+
+-- Refresh and logout no longer look tokens up in login_logs, drop the indexes an
+-- earlier revision of 0003 built for them
+DROP INDEX IF EXISTS idx_login_logs_account_refresh_token;
+DROP INDEX IF EXISTS idx_login_logs_refresh_token;
@@ -1 +1,2 @@
-from .mlcore import MLCore, ClinicalAssistant
\ No newline at end of file
+from .mlcore import MLCore, ClinicalAssistant
+from .registry import ModelRegistry
\ No newline at end of file
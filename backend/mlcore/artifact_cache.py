@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Callable, Dict, Optional
+
+from utils import logger
+
+MANIFEST_FILE = "manifest.json"
+ALIASES_FILE = "aliases.json"
+
+
+def _sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class ArtifactCache:
+    """
+    Local on-disk cache of model files and their side artifacts.
+
+    Entries are keyed by a hash of (model name, version, run_id) and hold a manifest
+    with the sha256 of every file, checked before an entry is used. The total size
+    is bounded by MODEL_CACHE_MAX_BYTES, least recently used entries are evicted first.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = root or os.getenv("MODEL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "medivise-model-cache"))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("MODEL_CACHE_MAX_BYTES", 1024 ** 3))
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def entry_key(model_name, model_version, run_id) -> str:
+        raw = f"{model_name}\0{model_version}\0{run_id}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()[:32]
+
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def _read_manifest(self, key):
+        try:
+            with open(os.path.join(self._entry_dir(key), MANIFEST_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _list_keys(self):
+        return [
+            name for name in os.listdir(self.root)
+            if not name.startswith(".") and os.path.isdir(self._entry_dir(name))
+        ]
+
+    def _verify(self, key, manifest) -> bool:
+        entry_dir = self._entry_dir(key)
+        for rel_path, expected in manifest.get("files", {}).items():
+            path = os.path.join(entry_dir, rel_path)
+            if not os.path.isfile(path) or os.path.getsize(path) != expected["size"] or _sha256_file(path) != expected["sha256"]:
+                return False
+        return True
+
+    def _remove(self, key):
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def _touch(self, key, manifest):
+        manifest["last_used_time"] = time.time()
+        _write_json_atomic(os.path.join(self._entry_dir(key), MANIFEST_FILE), manifest)
+
+    def get(self, model_name, model_version, run_id) -> Optional[Dict]:
+        """
+        Return the manifest of a cached entry, or None on a miss or failed integrity check.
+        """
+        key = self.entry_key(model_name, model_version, run_id)
+        with self._lock:
+            manifest = self._read_manifest(key)
+            if not manifest:
+                return None
+            if not self._verify(key, manifest):
+                logger.warning(f"Model cache entry {key} failed integrity check, removing it")
+                self._remove(key)
+                return None
+            self._touch(key, manifest)
+        return manifest
+
+    def find(self, model_name, model_version) -> Optional[Dict]:
+        """
+        Look up a cached entry by model name and version without knowing its run_id.
+        """
+        for key in self._list_keys():
+            manifest = self._read_manifest(key)
+            if manifest and manifest["model_name"] == model_name and str(manifest["model_version"]) == str(model_version):
+                return self.get(model_name, manifest["model_version"], manifest["run_id"])
+        return None
+
+    def put(self, model_name, model_version, run_id, metadata: Dict, download_fn: Callable[[str], Dict[str, str]]) -> Dict:
+        """
+        Download an entry with download_fn into a staging directory and publish it atomically.
+        :param download_fn: Called with the staging directory, returns {name: path} of the downloaded files.
+        :return: Manifest of the new entry.
+        """
+        key = self.entry_key(model_name, model_version, run_id)
+        staging_dir = tempfile.mkdtemp(dir=self.root, prefix=".tmp-")
+        try:
+            paths = download_fn(staging_dir)
+
+            files = {}
+            for dir_path, _, file_names in os.walk(staging_dir):
+                for file_name in file_names:
+                    path = os.path.join(dir_path, file_name)
+                    files[os.path.relpath(path, staging_dir)] = {
+                        "sha256": _sha256_file(path),
+                        "size": os.path.getsize(path),
+                    }
+
+            now = time.time()
+            manifest = {
+                "model_name": model_name,
+                "model_version": str(model_version),
+                "run_id": run_id,
+                "metadata": metadata,
+                "paths": {name: os.path.relpath(path, staging_dir) for name, path in paths.items()},
+                "files": files,
+                "size": sum(f["size"] for f in files.values()),
+                "created_time": now,
+                "last_used_time": now,
+            }
+            _write_json_atomic(os.path.join(staging_dir, MANIFEST_FILE), manifest)
+
+            with self._lock:
+                try:
+                    os.rename(staging_dir, self._entry_dir(key))
+                except OSError:
+                    # Another process published the same entry first
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+                self._evict(keep_key=key)
+            return manifest
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+    def fetch(self, model_name, model_version, run_id, metadata: Dict, download_fn: Callable[[str], Dict[str, str]]) -> Dict:
+        manifest = self.get(model_name, model_version, run_id)
+        if manifest:
+            logger.info(f"Model cache hit for {model_name}/{model_version}")
+            return manifest
+        logger.info(f"Model cache miss for {model_name}/{model_version}, downloading artifacts")
+        return self.put(model_name, model_version, run_id, metadata, download_fn)
+
+    def path(self, manifest: Dict, name: str) -> str:
+        key = self.entry_key(manifest["model_name"], manifest["model_version"], manifest["run_id"])
+        return os.path.join(self._entry_dir(key), manifest["paths"][name])
+
+    def _evict(self, keep_key=None):
+        entries = []
+        for key in self._list_keys():
+            manifest = self._read_manifest(key)
+            if manifest is None:
+                self._remove(key)
+                continue
+            entries.append((manifest.get("last_used_time", 0), key, manifest.get("size", 0)))
+
+        total = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep_key:
+                continue
+            logger.info(f"Evicting model cache entry {key} ({size} bytes)")
+            self._remove(key)
+            total -= size
+
+    def _read_aliases(self):
+        try:
+            with open(os.path.join(self.root, ALIASES_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def set_alias(self, model_name, alias, model_version):
+        """
+        Remember the version an alias resolved to, so it can be loaded while MLflow is unreachable.
+        """
+        with self._lock:
+            aliases = self._read_aliases()
+            aliases[f"{model_name}/{alias}"] = str(model_version)
+            _write_json_atomic(os.path.join(self.root, ALIASES_FILE), aliases)
+
+    def get_alias(self, model_name, alias) -> Optional[str]:
+        return self._read_aliases().get(f"{model_name}/{alias}")
@@ -0,0 +1,178 @@
+import queue
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable
+
+from utils import ServiceUnavailableException, logger
+
+
+class _BatchItem:
+    def __init__(self, X: np.ndarray):
+        self.X = X
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent inference requests into one model call.
+
+    A background thread takes the first waiting request, then keeps collecting
+    requests until max_batch_size records are queued or max_wait_ms has passed
+    since that first request. The merged matrix is scored once and every caller
+    gets back its own slice of the result. predict waits at most result_timeout_ms.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray], max_batch_size: int = 64, max_wait_ms: float = 5.0, result_timeout_ms: float = 30000.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.result_timeout = max(0.0, float(result_timeout_ms)) / 1000.0
+
+        self._queue = queue.Queue()
+        self._carry = None
+        # Guards _closed with the puts, so no request is queued behind the stop sentinel
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._records = 0
+        self._requests = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+
+        self._worker = threading.Thread(target=self._run, name="mlcore-micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, X: np.ndarray) -> Future:
+        """
+        Queue a matrix of encoded records for scoring.
+        :param X: 2D matrix, one row per record.
+        :return: Future resolving to the model output rows for X.
+        """
+        item = _BatchItem(X)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put(item)
+        return item.future
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        try:
+            return self.submit(X).result(timeout=self.result_timeout)
+        except FutureTimeoutError:
+            logger.error(f"Micro-batch inference timed out after {self.result_timeout:.1f}s")
+            raise ServiceUnavailableException("Inference timed out, please retry later")
+
+    def close(self):
+        """
+        Stop the worker thread once all queued requests are scored.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+        self._fail_pending()
+
+    def _fail_pending(self):
+        # Nothing should be left once the worker exits, but a request must never hang
+        pending = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                pending.append(item)
+        for item in pending:
+            if not item.future.done():
+                item.future.set_exception(RuntimeError("MicroBatcher is closed"))
+
+    def get_stats(self):
+        with self._stats_lock:
+            batches = self._batches
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "total_batches": batches,
+                "total_requests": self._requests,
+                "total_records": self._records,
+                "avg_batch_records": self._records / batches if batches else 0.0,
+                "avg_fill_ratio": self._records / (batches * self.max_batch_size) if batches else 0.0,
+                "avg_queue_wait_ms": self._queue_wait_total / self._requests * 1000.0 if self._requests else 0.0,
+                "max_queue_wait_ms": self._queue_wait_max * 1000.0,
+                "queue_size": self._queue.qsize(),
+            }
+
+    def _next_item(self, timeout=None):
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item
+        return self._queue.get(timeout=timeout)
+
+    def _collect_batch(self):
+        first = self._next_item()
+        if first is None:
+            return None, True
+
+        batch = [first]
+        rows = len(first.X)
+        deadline = first.enqueued_at + self.max_wait
+
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._next_item(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            if rows + len(item.X) > self.max_batch_size:
+                # Keep the request whole, it opens the next batch
+                self._carry = item
+                break
+            batch.append(item)
+            rows += len(item.X)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop or self._carry is not None:
+            batch, closed = self._collect_batch()
+            stop = stop or closed
+            if batch:
+                self._score(batch)
+
+    def _score(self, batch):
+        started_at = time.perf_counter()
+        try:
+            merged = batch[0].X if len(batch) == 1 else np.vstack([item.X for item in batch])
+            output = self.predict_fn(merged)
+        except Exception as e:
+            logger.error(f"Micro-batch inference error: {e}")
+            for item in batch:
+                item.future.set_exception(e)
+            return
+
+        offset = 0
+        for item in batch:
+            size = len(item.X)
+            item.future.set_result(output[offset:offset + size])
+            offset += size
+
+        with self._stats_lock:
+            self._batches += 1
+            self._records += offset
+            self._requests += len(batch)
+            for item in batch:
+                wait = started_at - item.enqueued_at
+                self._queue_wait_total += wait
+                self._queue_wait_max = max(self._queue_wait_max, wait)
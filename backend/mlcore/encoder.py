@@ -0,0 +1,78 @@
+import numpy as np
+from typing import Dict, List
+
+# Columns one-hot encoded by pd.get_dummies during training (string values)
+CATEGORICAL_FEATURES: List[str] = [
+    "gender",
+    "race",
+    "ethnicity",
+    "tobacco_smoking_status",
+]
+
+
+class FeatureEncoder:
+    """
+    Compiled replacement for the pandas preprocessing path.
+
+    Column positions are resolved once from feature_columns.json, so encoding a batch
+    only fills a preallocated matrix. Output matches preprocess_for_inference:
+    - categorical values become 1.0 in their "<field>_<value>" column (unknown values are dropped)
+    - numeric values are copied as float, missing values become 0.0
+    - columns not produced by the records stay 0.0
+    """
+
+    def __init__(self, feature_columns: List[str], categorical_features: List[str] = CATEGORICAL_FEATURES):
+        self.feature_columns = list(feature_columns)
+        self.n_features = len(self.feature_columns)
+        self.categorical_features = list(categorical_features)
+
+        column_index = {column: idx for idx, column in enumerate(self.feature_columns)}
+
+        # field -> {category value -> column index}
+        self.onehot_index: Dict[str, Dict[str, int]] = {field: {} for field in self.categorical_features}
+        for column, idx in column_index.items():
+            for field in self.categorical_features:
+                prefix = f"{field}_"
+                if column.startswith(prefix):
+                    self.onehot_index[field][column[len(prefix):]] = idx
+
+        # field -> column index, for every feature column that is not a one-hot column
+        onehot_columns = {idx for lookup in self.onehot_index.values() for idx in lookup.values()}
+        self.numeric_index: Dict[str, int] = {
+            column: idx for column, idx in column_index.items() if idx not in onehot_columns
+        }
+
+    def transform(self, records: List[dict], dtype=np.float64) -> np.ndarray:
+        """
+        Encode a list of FeatureRecord dicts into a (n_records, n_features) matrix.
+        :param records: List of dicts, e.g. [record.model_dump() for record in payload.records].
+        :param dtype: Output dtype, float64 (default, same as the pandas path) or float32.
+        :return: Contiguous NumPy matrix ordered like feature_columns.
+        """
+        n_records = len(records)
+        X = np.zeros((n_records, self.n_features), dtype=dtype)
+        if n_records == 0:
+            return X
+
+        rows = np.arange(n_records)
+
+        for field, lookup in self.onehot_index.items():
+            if not lookup:
+                continue
+            cols = np.fromiter(
+                (lookup.get(record.get(field), -1) for record in records),
+                dtype=np.intp,
+                count=n_records,
+            )
+            hit = cols >= 0
+            X[rows[hit], cols[hit]] = 1.0
+
+        for field, idx in self.numeric_index.items():
+            values = np.fromiter(
+                (np.nan if record.get(field) is None else record.get(field) for record in records),
+                dtype=np.float64,
+                count=n_records,
+            )
+            X[:, idx] = np.where(np.isnan(values), 0.0, values)
+
+        return X
@@ -1,26 +1,79 @@
 import os
+import time
 import mlflow
 import json
 import numpy as np
 import pandas as pd
 from typing import List
+from starlette.concurrency import run_in_threadpool
 from sklearn.preprocessing import LabelEncoder
 from groq import Groq
 import os
-from utils import BadRequestException
+from utils import BadRequestException, logger
+from models import FeatureRecord
+from .encoder import FeatureEncoder
+from .batcher import MicroBatcher
+from .artifact_cache import ArtifactCache
+from .worker_pool import InferencePool
+from .prediction_cache import PredictionCache
+
+# Inference engines selectable with MODEL_ENGINE
+MODEL_ENGINES = ["sklearn", "booster"]
+
+# Where inference runs: in the API process or in a pool of worker processes
+INFERENCE_BACKENDS = ["thread", "process"]
+
+# Risk level -> health score shown to patients
+HEALTH_SCORES = {
+    "low": "good",
+    "moderate": "average",
+    "high": "poor",
+}
 
 class MLCore:
-    def __init__(self):
+    def __init__(self, model_uri=None):
         self.mlflow_tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5001")
         self.default_experiment_name = os.getenv("MLFLOW_EXPERIMENT_NAME", "ehr_xgb_experiment")
-        self.model_uri = os.getenv("MODEL_URI", "models:/ehr_xgb_model/1")
+        self.model_uri = model_uri or os.getenv("MODEL_URI", "models:/ehr_xgb_model/1")
+        self.model_engine = os.getenv("MODEL_ENGINE", "sklearn").lower()
+        self.model_engine_nthread = int(os.getenv("MODEL_ENGINE_NTHREAD", "1"))
         self.confidence_threshold = float(os.getenv("PRED_THRESHOLD", "0.0"))
+        self.batching_enabled = os.getenv("PRED_BATCHING_ENABLED", "false").lower() in ["true", "1", "yes"]
+        self.batch_max_size = int(os.getenv("PRED_BATCH_MAX_SIZE", "64"))
+        self.batch_max_wait_ms = float(os.getenv("PRED_BATCH_MAX_WAIT_MS", "5"))
+        self.batch_result_timeout_ms = float(os.getenv("PRED_BATCH_RESULT_TIMEOUT_MS", "30000"))
+        self.inference_backend = os.getenv("INFERENCE_BACKEND", "thread").lower()
+        self.inference_pool_size = int(os.getenv("INFERENCE_POOL_SIZE", "2"))
+        self.inference_worker_threads = int(os.getenv("INFERENCE_WORKER_THREADS", "1"))
+        self.inference_queue_depth = int(os.getenv("INFERENCE_QUEUE_DEPTH", "64"))
+        self.inference_queue_timeout_ms = float(os.getenv("INFERENCE_QUEUE_TIMEOUT_MS", "100"))
+        self.inference_start_timeout = float(os.getenv("INFERENCE_START_TIMEOUT_SECONDS", "300"))
+        self.prediction_cache_enabled = os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() in ["true", "1", "yes"]
+        self.prediction_cache_size = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+        self.prediction_cache_ttl = int(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+        self.prediction_cache_redis = os.getenv("PREDICTION_CACHE_REDIS", "true").lower() in ["true", "1", "yes"]
+        self.model_cache_enabled = os.getenv("MODEL_CACHE_ENABLED", "true").lower() in ["true", "1", "yes"]
+
+        if self.model_engine not in MODEL_ENGINES:
+            raise BadRequestException(f"Unknown MODEL_ENGINE '{self.model_engine}'. Expected one of {MODEL_ENGINES}")
+        if self.inference_backend not in INFERENCE_BACKENDS:
+            raise BadRequestException(f"Unknown INFERENCE_BACKEND '{self.inference_backend}'. Expected one of {INFERENCE_BACKENDS}")
 
         self.model = None
+        self.booster = None
         self.mlflow_client = None
         self.artifact_model = None
         self.model_metadata = None
         self.label_encoder = None
+        self.feature_encoder = None
+        self.batcher = None
+        self.worker_pool = None
+        self.prediction_cache = None
+        self.class_index = None
+        self.proba_keys = None
+        self.class_health_scores = None
+        self.artifact_cache = ArtifactCache() if self.model_cache_enabled else None
+        self.cache_manifest = None
 
         self._set_tracking_uri()
         self._configure_experiment()
@@ -32,18 +85,19 @@ class MLCore:
         
         
     def _configure_experiment(self):
-        mlflow.set_experiment(self.default_experiment_name)
+        # Only needed for logging runs, inference must still start when MLflow is down
+        try:
+            mlflow.set_experiment(self.default_experiment_name)
+        except Exception as e:
+            logger.warning(f"Could not configure MLflow experiment '{self.default_experiment_name}': {e}")
         
     
     def _set_mlflow_client(self):
         self.mlflow_client = mlflow.tracking.MlflowClient()
         
         
-    def _set_model_metadata(self):
-        _, model_name, model_version_or_alias = self.model_uri.split("/", 2)
-        
+    def _get_model_version(self, model_name, model_version_or_alias):
         # Version is digit, alias is string. Example: 1, 2, 3... or Production, Staging, etc.
-        
         if model_version_or_alias.isdigit():
             model_version = self.mlflow_client.get_model_version(model_name, model_version_or_alias)
         else:
@@ -52,7 +106,7 @@ class MLCore:
         if not model_version:
             raise BadRequestException(f"Model version or alias '{model_version_or_alias}' not found for model '{model_name}'")
             
-        self.model_metadata = {
+        return {
             "model_name": model_name,
             "model_version": model_version.version,
             "model_run_id": model_version.run_id,
@@ -60,6 +114,63 @@ class MLCore:
             "model_status": model_version.status,
         }
         
+        
+    def _set_model_metadata(self):
+        _, model_name, model_version_or_alias = self.model_uri.split("/", 2)
+        
+        if not self.artifact_cache:
+            self.model_metadata = self._get_model_version(model_name, model_version_or_alias)
+            return
+        
+        # A version number always points to the same run, so a cached entry is enough
+        if model_version_or_alias.isdigit():
+            self.cache_manifest = self.artifact_cache.find(model_name, model_version_or_alias)
+            if self.cache_manifest:
+                self.model_metadata = self.cache_manifest["metadata"]
+                return
+            self.model_metadata = self._get_model_version(model_name, model_version_or_alias)
+            return
+        
+        # Aliases can move, resolve them on the server and only fall back to the last known version
+        try:
+            self.model_metadata = self._get_model_version(model_name, model_version_or_alias)
+            self.artifact_cache.set_alias(model_name, model_version_or_alias, self.model_metadata["model_version"])
+        except BadRequestException:
+            raise
+        except Exception as e:
+            cached_version = self.artifact_cache.get_alias(model_name, model_version_or_alias)
+            self.cache_manifest = self.artifact_cache.find(model_name, cached_version) if cached_version else None
+            if not self.cache_manifest:
+                raise
+            logger.warning(f"MLflow unavailable ({e}), using cached version {cached_version} for alias '{model_version_or_alias}'")
+            self.model_metadata = self.cache_manifest["metadata"]
+            
+            
+    def _download_model_files(self, dst_path):
+        model_path = mlflow.artifacts.download_artifacts(
+            artifact_uri=f"models:/{self.model_metadata['model_name']}/{self.model_metadata['model_version']}",
+            dst_path=os.path.join(dst_path, "model"),
+        )
+        run_id = self.model_metadata["model_run_id"]
+        return {
+            "model": model_path,
+            "feature_columns": self.mlflow_client.download_artifacts(run_id, "artifacts/feature_columns.json", dst_path),
+            "label_classes": self.mlflow_client.download_artifacts(run_id, "artifacts/label_classes.json", dst_path),
+        }
+        
+        
+    def _fetch_cache_manifest(self):
+        if not self.cache_manifest:
+            self.cache_manifest = self.artifact_cache.fetch(
+                self.model_metadata["model_name"],
+                self.model_metadata["model_version"],
+                self.model_metadata["model_run_id"],
+                self.model_metadata,
+                self._download_model_files,
+            )
+        return self.cache_manifest
+        
+        
     def get_model(self):
         return self.model
         
@@ -76,8 +187,13 @@ class MLCore:
         if not self.model_metadata:
             raise BadRequestException("Model metadata is not set. Please load the model first.")
         
-        features_column_path = self.mlflow_client.download_artifacts(self.model_metadata["model_run_id"], "artifacts/feature_columns.json")
-        label_classes_path = self.mlflow_client.download_artifacts(self.model_metadata["model_run_id"], "artifacts/label_classes.json")
+        if self.artifact_cache:
+            manifest = self._fetch_cache_manifest()
+            features_column_path = self.artifact_cache.path(manifest, "feature_columns")
+            label_classes_path = self.artifact_cache.path(manifest, "label_classes")
+        else:
+            features_column_path = self.mlflow_client.download_artifacts(self.model_metadata["model_run_id"], "artifacts/feature_columns.json")
+            label_classes_path = self.mlflow_client.download_artifacts(self.model_metadata["model_run_id"], "artifacts/label_classes.json")
 
         feature_columns = json.load(open(features_column_path))["feature_columns"]
         label_classes = np.array(json.load(open(label_classes_path))["classes"])
@@ -85,6 +201,14 @@ class MLCore:
         self.label_encoder = LabelEncoder()
         self.label_encoder.classes_ = label_classes
         
+        self.feature_encoder = FeatureEncoder(feature_columns)
+        
+        # Class lookups used to build prediction results without per-row searches
+        class_names = [str(cls).lower() for cls in label_classes]
+        self.class_index = {cls: idx for idx, cls in enumerate(class_names)}
+        self.proba_keys = [f"proba_{cls}" for cls in class_names]
+        self.class_health_scores = [HEALTH_SCORES.get(cls) for cls in class_names]
+        
         self.artifact_model = {
             "feature_columns": feature_columns,
             "label_classes": label_classes
@@ -92,8 +216,222 @@ class MLCore:
 
 
     def load_model(self):
-        self.model = mlflow.xgboost.load_model(self.model_uri)
         self._set_model_metadata()
+        if self.artifact_cache:
+            manifest = self._fetch_cache_manifest()
+            self.model = mlflow.xgboost.load_model(self.artifact_cache.path(manifest, "model"))
+        else:
+            self.model = mlflow.xgboost.load_model(self.model_uri)
+        if self.model_engine == "booster":
+            self._set_booster()
+        if self.prediction_cache_enabled and not self.prediction_cache:
+            model_key = f"{self.model_metadata['model_name']}/{self.model_metadata['model_version']}/{self.model_metadata['model_run_id']}"
+            self.prediction_cache = PredictionCache(model_key, self.prediction_cache_size, self.prediction_cache_ttl, self.prediction_cache_redis)
+        if self.inference_backend == "process":
+            self._start_worker_pool()
+        elif self.batching_enabled and not self.batcher:
+            self.batcher = MicroBatcher(self._predict_proba_matrix, self.batch_max_size, self.batch_max_wait_ms, self.batch_result_timeout_ms)
+            
+            
+    def _start_worker_pool(self):
+        if self.worker_pool:
+            return
+        if self.batching_enabled:
+            logger.warning("PRED_BATCHING_ENABLED is ignored with INFERENCE_BACKEND=process")
+        # Pin the resolved version so workers load exactly the same model even if an alias moves
+        worker_pool = InferencePool(
+            f"models:/{self.model_metadata['model_name']}/{self.model_metadata['model_version']}",
+            self.inference_pool_size,
+            self.inference_worker_threads,
+            self.inference_queue_depth,
+            self.inference_queue_timeout_ms,
+        )
+        try:
+            worker_pool.start(self.inference_start_timeout)
+        except Exception:
+            worker_pool.executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        self.worker_pool = worker_pool
+        
+        
+    def get_batching_stats(self):
+        return self.batcher.get_stats() if self.batcher else None
+    
+    
+    def get_worker_pool_stats(self):
+        return self.worker_pool.get_stats() if self.worker_pool else None
+    
+    
+    def get_prediction_cache_stats(self):
+        return self.prediction_cache.get_stats() if self.prediction_cache else None
+    
+    
+    def close(self):
+        if self.batcher:
+            self.batcher.close()
+            self.batcher = None
+        if self.worker_pool:
+            self.worker_pool.close()
+            self.worker_pool = None
+        
+        
+    def _set_booster(self):
+        # mlflow.xgboost returns either the sklearn wrapper or a raw Booster depending on how it was logged
+        self.booster = self.model.get_booster() if hasattr(self.model, "get_booster") else self.model
+        self.booster.set_param({"nthread": self.model_engine_nthread})
+        
+        
+    def _predict_proba_booster(self, X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        probabilities = self.booster.inplace_predict(X)
+        # Binary objectives return P(class 1) only, expand to one column per class like predict_proba
+        if probabilities.ndim == 1:
+            probabilities = np.column_stack([1.0 - probabilities, probabilities])
+        return probabilities
+        
+        
+    def _predict_proba_matrix(self, X: np.ndarray) -> np.ndarray:
+        if self.worker_pool:
+            return self.worker_pool.predict(X)
+        if self.booster:
+            return self._predict_proba_booster(X)
+        return self.model.predict_proba(pd.DataFrame(X, columns=self.feature_encoder.feature_columns, copy=False))
+    
+    
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Class probabilities for preprocessed records (DataFrame or matrix ordered like
+        feature_columns). MODEL_ENGINE=booster scores through Booster.inplace_predict,
+        INFERENCE_BACKEND=process sends the matrix to the worker pool, and with
+        PRED_BATCHING_ENABLED the call is merged with concurrent requests.
+        """
+        if isinstance(X, pd.DataFrame):
+            X = X.to_numpy()
+        if self.batcher:
+            return self.batcher.predict(X)
+        return self._predict_proba_matrix(X)
+    
+    
+    def predict_proba_cached(self, X) -> np.ndarray:
+        """
+        predict_proba through the prediction cache: only rows missing from the cache are
+        scored, and their probabilities are cached for the next request.
+        """
+        if isinstance(X, pd.DataFrame):
+            X = X.to_numpy()
+        if not self.prediction_cache:
+            return self.predict_proba(X)
+        
+        keys = self.prediction_cache.make_keys(X)
+        cached_rows = self.prediction_cache.get_many(keys)
+        miss_indices = [idx for idx, row in enumerate(cached_rows) if row is None]
+        
+        miss_probabilities = self.predict_proba(X[miss_indices]) if miss_indices else None
+        if miss_indices:
+            self.prediction_cache.set_many({keys[idx]: row for idx, row in zip(miss_indices, miss_probabilities.tolist())})
+        return self._merge_cached(len(X), cached_rows, miss_indices, miss_probabilities)
+    
+    
+    async def predict_proba_cached_async(self, X) -> np.ndarray:
+        """
+        predict_proba_cached for the event loop. With INFERENCE_BACKEND=process the request
+        awaits the worker pool's future without holding a thread, other backends and the
+        cache lookups run in the threadpool.
+        """
+        if isinstance(X, pd.DataFrame):
+            X = X.to_numpy()
+        if not self.worker_pool:
+            return await run_in_threadpool(self.predict_proba_cached, X)
+        if not self.prediction_cache:
+            return await self.worker_pool.predict_async(X)
+        
+        keys = self.prediction_cache.make_keys(X)
+        cached_rows = await run_in_threadpool(self.prediction_cache.get_many, keys)
+        miss_indices = [idx for idx, row in enumerate(cached_rows) if row is None]
+        
+        miss_probabilities = await self.worker_pool.predict_async(X[miss_indices]) if miss_indices else None
+        if miss_indices:
+            await run_in_threadpool(
+                self.prediction_cache.set_many,
+                {keys[idx]: row for idx, row in zip(miss_indices, miss_probabilities.tolist())},
+            )
+        return self._merge_cached(len(X), cached_rows, miss_indices, miss_probabilities)
+    
+    
+    def _merge_cached(self, size, cached_rows, miss_indices, miss_probabilities) -> np.ndarray:
+        probabilities = np.empty((size, len(self.class_index)), dtype=np.float64)
+        if miss_indices:
+            probabilities[miss_indices] = miss_probabilities
+        for idx, row in enumerate(cached_rows):
+            if row is not None:
+                probabilities[idx] = row
+        return probabilities
+    
+    
+    def build_results(self, probabilities: np.ndarray, start_index: int = 0) -> List[dict]:
+        """
+        Turn a predict_proba matrix into prediction results. Labels are the argmax class,
+        score_number is 1 - proba_high (0.5 when the model has no "high" class) and
+        labels outside HEALTH_SCORES are returned as risk_level.
+        """
+        if not self.class_index:
+            raise BadRequestException("Model artifacts are not loaded. Please load the artifacts first.")
+        
+        label_indices = probabilities.argmax(axis=1).tolist()
+        labels = self.label_encoder.classes_
+        
+        high_idx = self.class_index.get("high")
+        if high_idx is not None:
+            score_numbers = (1.0 - probabilities[:, high_idx].astype(np.float64)).tolist()
+        else:
+            score_numbers = [0.5] * len(probabilities)
+        
+        results = []
+        for offset, (label_idx, proba_row, score_number) in enumerate(zip(label_indices, probabilities.tolist(), score_numbers)):
+            result = {"record_index": start_index + offset}
+            health_score = self.class_health_scores[label_idx]
+            if health_score:
+                result["health_score"] = health_score
+                result.update(zip(self.proba_keys, proba_row))
+                result["score_number"] = score_number
+            else:
+                result["risk_level"] = labels[label_idx]
+                result.update(zip(self.proba_keys, proba_row))
+            results.append(result)
+        return results
+        
+        
+    def warm_up(self, batch_size: int = 8, max_iterations: int = 1, window: int = 20, p99_tolerance: float = 0.2):
+        """
+        Run predictions on a synthetic batch of default FeatureRecords so the first real
+        requests do not pay for lazy initialization in pandas/XGBoost. Stops early once the
+        p99 latency of the last window is within p99_tolerance of the window before it.
+        :return: Warm-up stats (iterations, last window p99 in ms, whether latency settled).
+        """
+        records = [FeatureRecord().model_dump() for _ in range(batch_size)]
+        window = max(1, window)
+        latencies = []
+        previous_p99 = None
+        p99 = None
+        settled = False
+        
+        for _ in range(max(1, max_iterations)):
+            started_at = time.perf_counter()
+            self.build_results(self.predict_proba(self.preprocess_records(records)))
+            latencies.append(time.perf_counter() - started_at)
+            
+            if len(latencies) % window == 0:
+                p99 = float(np.percentile(latencies[-window:], 99))
+                if previous_p99 is not None and abs(p99 - previous_p99) <= p99_tolerance * previous_p99:
+                    settled = True
+                    break
+                previous_p99 = p99
+        
+        return {
+            "iterations": len(latencies),
+            "p99_ms": (p99 if p99 is not None else float(np.percentile(latencies, 99))) * 1000.0,
+            "settled": settled,
+        }
         
         
     def preprocess_for_inference(self, df: pd.DataFrame, feature_columns: List[str]) -> pd.DataFrame:
@@ -113,6 +451,17 @@ class MLCore:
         X = X.fillna(0.0)
         return X
     
+    
+    def preprocess_records(self, records: List[dict]) -> pd.DataFrame:
+        """
+        Fast path of preprocess_for_inference: encodes FeatureRecord dicts with the
+        compiled FeatureEncoder instead of get_dummies/apply/reindex. Values are identical.
+        """
+        if not self.feature_encoder:
+            raise BadRequestException("Model artifacts are not loaded. Please load the artifacts first.")
+        X = self.feature_encoder.transform(records)
+        return pd.DataFrame(X, columns=self.feature_encoder.feature_columns, copy=False)
+    
 class ClinicalAssistant:
     def __init__(self, api_key=None, model="openai/gpt-oss-20b"):
         self.api_key = os.getenv("GROQ_API_KEY")
@@ -0,0 +1,121 @@
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import List, Optional
+
+from utils import Cache, logger
+
+REDIS_KEY_PREFIX = "prediction:"
+
+
+class PredictionCache:
+    """
+    Two-tier cache of predict_proba rows: an in-process LRU in front of Redis.
+
+    Keys are a hash of the model version and the encoded feature vector, so every
+    FeatureRecord that produces the same model input shares an entry, and loading a
+    new model version never reuses results of the previous one.
+
+    The Redis tier does not depend on Redis being up when the model loads: the shared
+    Cache client is picked up on first use, and while Redis is unreachable lookups and
+    writes are served by the local LRU alone until the client's backoff lets them through.
+    """
+
+    def __init__(self, model_key: str, max_size: int = 10000, ttl: int = 3600, use_redis: bool = True):
+        self.model_key = model_key
+        self.max_size = max(1, int(max_size))
+        self.ttl = int(ttl)
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+
+        self.use_redis = use_redis
+        self._redis = None
+
+    def _get_redis(self) -> Optional[Cache]:
+        # Cache() only fails while the shared client is backing off after a connection
+        # error, skip the Redis tier for this call and try again on the next one
+        if self.use_redis and self._redis is None:
+            try:
+                self._redis = Cache()
+            except Exception:
+                return None
+        return self._redis
+
+    def make_keys(self, X: np.ndarray) -> List[str]:
+        prefix = self.model_key.encode("utf-8") + b"\0"
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        return [hashlib.sha256(prefix + row.tobytes()).hexdigest() for row in X]
+
+    def get_many(self, keys: List[str]) -> List[Optional[list]]:
+        """
+        Look up cached probability rows, None for every miss.
+        """
+        results = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for idx, key in enumerate(keys):
+                row = self._entries.get(key)
+                if row is not None:
+                    self._entries.move_to_end(key)
+                    results[idx] = row
+                else:
+                    missing.append(idx)
+            self._local_hits += len(keys) - len(missing)
+
+        redis_cache = self._get_redis() if missing else None
+        if redis_cache:
+            values = redis_cache.get_many_json([REDIS_KEY_PREFIX + keys[idx] for idx in missing])
+            found = {}
+            for idx, value in zip(missing, values):
+                if value is not None:
+                    results[idx] = value
+                    found[keys[idx]] = value
+            if found:
+                self._store_local(found)
+            missing = [idx for idx in missing if results[idx] is None]
+            with self._lock:
+                self._redis_hits += len(found)
+
+        with self._lock:
+            self._misses += len(missing)
+        return results
+
+    def set_many(self, mapping: dict):
+        """
+        Store freshly computed probability rows (key -> list of floats) in both tiers.
+        """
+        self._store_local(mapping)
+        redis_cache = self._get_redis()
+        if redis_cache:
+            try:
+                redis_cache.set_many_json({REDIS_KEY_PREFIX + key: row for key, row in mapping.items()}, self.ttl)
+            except Exception as e:
+                logger.warning(f"Could not write predictions to Redis: {e}")
+
+    def _store_local(self, mapping: dict):
+        with self._lock:
+            for key, row in mapping.items():
+                self._entries[key] = row
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_stats(self):
+        with self._lock:
+            hits = self._local_hits + self._redis_hits
+            lookups = hits + self._misses
+            return {
+                "model_key": self.model_key,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "redis_enabled": self.use_redis,
+                "local_hits": self._local_hits,
+                "redis_hits": self._redis_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,195 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from utils import BadRequestException, NotFoundException, logger
+from .mlcore import MLCore
+
+
+class ModelRegistry:
+    """
+    Holds the loaded MLCore versions and the one currently serving predictions.
+
+    New versions are loaded and warmed up next to the active one, then swapped in by
+    replacing a single reference. Requests that already hold the previous MLCore finish
+    on it, and instances dropped from the registry are closed after a drain delay.
+    """
+
+    def __init__(self):
+        self.max_versions = int(os.getenv("MODEL_REGISTRY_MAX_VERSIONS", "3"))
+        self.drain_seconds = float(os.getenv("MODEL_REGISTRY_DRAIN_SECONDS", "30"))
+        self.warmup_batch_size = int(os.getenv("MODEL_WARMUP_BATCH_SIZE", "8"))
+        self.warmup_iterations = int(os.getenv("MODEL_WARMUP_ITERATIONS", "200"))
+        self.warmup_window = int(os.getenv("MODEL_WARMUP_WINDOW", "20"))
+        self.warmup_p99_tolerance = float(os.getenv("MODEL_WARMUP_P99_TOLERANCE", "0.2"))
+
+        self._lock = threading.Lock()
+        self._versions = OrderedDict()  # model key -> {"ml_core", "model_uri", "loaded_time", "warmup"}
+        self._active_key = None
+        self._history = []  # previously active model keys, most recent last
+        self._loading = {}  # model_uri -> {"status", "error", "started_time"}
+
+    @staticmethod
+    def _model_key(ml_core: MLCore) -> str:
+        metadata = ml_core.get_model_metadata()
+        return f"{metadata['model_name']}/{metadata['model_version']}"
+
+    def get_active(self) -> Optional[MLCore]:
+        entry = self._versions.get(self._active_key) if self._active_key else None
+        return entry["ml_core"] if entry else None
+
+    def get_readiness(self) -> dict:
+        """
+        Active model key, its warm-up stats and the versions still loading.
+        """
+        with self._lock:
+            entry = self._versions.get(self._active_key) if self._active_key else None
+            return {
+                "active_model": self._active_key,
+                "warmup": entry["warmup"] if entry else None,
+                "loading": [model_uri for model_uri, status in self._loading.items() if status["status"] == "loading"],
+            }
+
+    def is_ready(self) -> bool:
+        """
+        True once a model is active and its warm-up latency has settled.
+        """
+        warmup = self.get_readiness()["warmup"]
+        return warmup is not None and warmup["settled"]
+
+    def load(self, model_uri: Optional[str] = None, activate: bool = True, background: bool = True):
+        """
+        Load, warm up and optionally activate a model version.
+        :param model_uri: models:/<name>/<version or alias>, defaults to MODEL_URI.
+        :param activate: Swap the new version in once it is ready.
+        :param background: Return immediately and load on a separate thread.
+        """
+        model_uri = model_uri or os.getenv("MODEL_URI", "models:/ehr_xgb_model/1")
+        with self._lock:
+            if self._loading.get(model_uri, {}).get("status") == "loading":
+                raise BadRequestException(f"Model '{model_uri}' is already being loaded")
+            self._loading[model_uri] = {"status": "loading", "error": None, "started_time": time.time()}
+
+        if background:
+            threading.Thread(target=self._load, args=(model_uri, activate), name="model-registry-loader", daemon=True).start()
+            return None
+        return self._load(model_uri, activate, raise_errors=True)
+
+    def _load(self, model_uri, activate, raise_errors=False):
+        try:
+            ml_core = MLCore(model_uri)
+            ml_core.load_model()
+            ml_core.load_artifacts()
+            warmup_stats = ml_core.warm_up(
+                self.warmup_batch_size,
+                self.warmup_iterations,
+                self.warmup_window,
+                self.warmup_p99_tolerance,
+            )
+        except Exception as e:
+            logger.error(f"Failed to load model '{model_uri}': {e}")
+            with self._lock:
+                self._loading[model_uri] = {"status": "failed", "error": str(e), "started_time": self._loading[model_uri]["started_time"]}
+            if raise_errors:
+                raise
+            return None
+
+        key = self._model_key(ml_core)
+        with self._lock:
+            self._loading.pop(model_uri, None)
+            previous = self._versions.pop(key, None)
+            self._versions[key] = {"ml_core": ml_core, "model_uri": model_uri, "loaded_time": time.time(), "warmup": warmup_stats}
+            if previous:
+                self._retire(previous["ml_core"])
+            if activate:
+                self._activate(key)
+            self._evict()
+        logger.info(
+            f"Model {key} loaded from '{model_uri}'" + (" and activated" if activate else "")
+            + f", warm-up p99 {warmup_stats['p99_ms']:.2f} ms after {warmup_stats['iterations']} predictions"
+        )
+        if not warmup_stats["settled"]:
+            logger.warning(
+                f"Model {key} warm-up latency did not settle within {warmup_stats['iterations']} predictions, "
+                "it is not reported as ready"
+            )
+        return ml_core
+
+    def _activate(self, key):
+        if key == self._active_key:
+            return
+        if self._active_key:
+            self._history.append(self._active_key)
+        self._active_key = key
+
+    def activate(self, key: str):
+        """
+        Swap an already loaded version in as the active model.
+        """
+        with self._lock:
+            if key not in self._versions:
+                raise NotFoundException(f"Model version '{key}' is not loaded")
+            self._activate(key)
+        logger.info(f"Model {key} activated")
+
+    def rollback(self) -> str:
+        """
+        Re-activate the most recent previously active version that is still loaded.
+        The version rolled back from goes onto the history, so a second rollback rolls
+        forward again.
+        """
+        with self._lock:
+            while self._history:
+                key = self._history.pop()
+                if key in self._versions and key != self._active_key:
+                    self._activate(key)
+                    logger.info(f"Rolled back to model {key}")
+                    return key
+        raise BadRequestException("No previous model version to roll back to")
+
+    def _retire(self, ml_core: MLCore):
+        # Give in-flight predictions time to finish before stopping the instance's batcher
+        timer = threading.Timer(self.drain_seconds, ml_core.close)
+        timer.daemon = True
+        timer.start()
+
+    def _evict(self):
+        while len(self._versions) > self.max_versions:
+            key = next((k for k in self._versions if k != self._active_key), None)
+            if key is None:
+                return
+            entry = self._versions.pop(key)
+            self._history = [k for k in self._history if k != key]
+            self._retire(entry["ml_core"])
+            logger.info(f"Model {key} unloaded from registry")
+
+    def list_versions(self):
+        with self._lock:
+            versions = [
+                {
+                    "model_key": key,
+                    "model_uri": entry["model_uri"],
+                    "model_metadata": entry["ml_core"].get_model_metadata(),
+                    "loaded_time": entry["loaded_time"],
+                    "warmup": entry["warmup"],
+                    "active": key == self._active_key,
+                }
+                for key, entry in self._versions.items()
+            ]
+            loading = [{"model_uri": model_uri, **status} for model_uri, status in self._loading.items()]
+        return {
+            "active_model": self._active_key,
+            "rollback_model": next((k for k in reversed(self._history) if k in self._versions and k != self._active_key), None),
+            "versions": versions,
+            "loading": loading,
+        }
+
+    def close(self):
+        with self._lock:
+            for entry in self._versions.values():
+                entry["ml_core"].close()
+            self._versions.clear()
+            self._active_key = None
+            self._history = []
@@ -0,0 +1,192 @@
+import os
+import time
+import asyncio
+import threading
+import multiprocessing
+import numpy as np
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from starlette.concurrency import run_in_threadpool
+
+from utils import TooManyRequestsException, ServiceUnavailableException, logger
+
+# MLCore of the current worker process, set by _init_worker
+_worker_ml_core = None
+
+
+def _init_worker(model_uri, worker_threads):
+    global _worker_ml_core
+    # Workers score in-process with a fixed thread budget and must not start their own pool or batcher.
+    # Caching stays in the API process, which looks rows up before sending the misses here
+    os.environ["INFERENCE_BACKEND"] = "thread"
+    os.environ["PRED_BATCHING_ENABLED"] = "false"
+    os.environ["PREDICTION_CACHE_ENABLED"] = "false"
+    os.environ["MODEL_ENGINE_NTHREAD"] = str(worker_threads)
+    os.environ["OMP_NUM_THREADS"] = str(worker_threads)
+
+    from .mlcore import MLCore
+
+    _worker_ml_core = MLCore(model_uri)
+    _worker_ml_core.load_model()
+    _worker_ml_core.load_artifacts()
+    _worker_ml_core.warm_up()
+
+
+def _worker_predict_proba(X: np.ndarray) -> np.ndarray:
+    return _worker_ml_core.predict_proba(X)
+
+
+def _worker_ready() -> int:
+    # Hold the worker briefly so the other ready checks land on different processes
+    time.sleep(0.05)
+    return os.getpid()
+
+
+class InferencePool:
+    """
+    Pool of worker processes that each load the model once and score encoded matrices.
+
+    Requests travel over the executor's pipes. At most queue_depth requests can be
+    queued or running, further requests are rejected with TooManyRequestsException
+    after waiting queue_timeout_ms for a free slot. A worker that dies breaks the whole
+    executor, so a broken executor is replaced by a fresh one.
+    """
+
+    def __init__(self, model_uri: str, pool_size: int = 2, worker_threads: int = 1, queue_depth: int = 64, queue_timeout_ms: float = 100.0):
+        self.model_uri = model_uri
+        self.pool_size = max(1, int(pool_size))
+        self.worker_threads = max(1, int(worker_threads))
+        self.queue_depth = max(1, int(queue_depth))
+        self.queue_timeout = max(0.0, float(queue_timeout_ms)) / 1000.0
+
+        self._slots = threading.BoundedSemaphore(self.queue_depth)
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._restarts = 0
+
+        self._executor_lock = threading.Lock()
+        self.executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # spawn instead of fork: the parent already runs XGBoost/OpenMP threads
+        return ProcessPoolExecutor(
+            max_workers=self.pool_size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.model_uri, self.worker_threads),
+        )
+
+    def _replace_broken(self, executor: ProcessPoolExecutor):
+        with self._executor_lock:
+            # Concurrent requests see the same broken executor, only the first one replaces it
+            if self.executor is not executor:
+                return
+            logger.error(f"Inference pool for '{self.model_uri}' is broken, restarting its workers")
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._create_executor()
+            with self._stats_lock:
+                self._restarts += 1
+
+    def start(self, timeout: float = 300.0):
+        """
+        Start every worker and wait until each one has loaded the model.
+        Raises ServiceUnavailableException when the workers are not up within timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        pids = set()
+        try:
+            while len(pids) < self.pool_size:
+                futures = [self.executor.submit(_worker_ready) for _ in range(self.pool_size)]
+                for future in futures:
+                    pids.add(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except FutureTimeoutError:
+            raise ServiceUnavailableException(
+                f"Inference pool started only {len(pids)}/{self.pool_size} worker(s) within {timeout:.0f}s"
+            )
+        logger.info(f"Inference pool started {len(pids)}/{self.pool_size} worker(s) for '{self.model_uri}'")
+
+    def _submit(self, X: np.ndarray) -> Future:
+        # Called with a slot held, releases it if the request can not be queued
+        with self._stats_lock:
+            self._in_flight += 1
+        try:
+            executor = self.executor
+            try:
+                future = executor.submit(_worker_predict_proba, X)
+            except BrokenProcessPool:
+                self._replace_broken(executor)
+                executor = self.executor
+                future = executor.submit(_worker_predict_proba, X)
+        except Exception:
+            with self._stats_lock:
+                self._in_flight -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release)
+        future.executor = executor
+        return future
+
+    def _reject(self):
+        with self._stats_lock:
+            self._rejected += 1
+        raise TooManyRequestsException("Inference queue is full, please retry later")
+
+    def submit(self, X: np.ndarray) -> Future:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._reject()
+        return self._submit(X)
+
+    async def submit_async(self, X: np.ndarray) -> Future:
+        """
+        submit for the event loop: waits for a free slot on a thread only when the queue is full.
+        """
+        if not self._slots.acquire(blocking=False):
+            if not await run_in_threadpool(self._slots.acquire, timeout=self.queue_timeout):
+                self._reject()
+        return self._submit(X)
+
+    def _release(self, _future):
+        with self._stats_lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def _worker_crashed(self, future: Future):
+        self._replace_broken(future.executor)
+        # The request may be what killed the worker, so it is not retried
+        return ServiceUnavailableException("Inference worker crashed, please retry later")
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        future = self.submit(X)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            raise self._worker_crashed(future)
+
+    async def predict_async(self, X: np.ndarray) -> np.ndarray:
+        """
+        predict for the event loop: awaits the worker's result without holding a thread.
+        """
+        future = await self.submit_async(X)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            raise self._worker_crashed(future)
+
+    def get_stats(self):
+        with self._stats_lock:
+            return {
+                "pool_size": self.pool_size,
+                "worker_threads": self.worker_threads,
+                "queue_depth": self.queue_depth,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "restarts": self._restarts,
+            }
+
+    def close(self):
+        with self._executor_lock:
+            self.executor.shutdown(wait=True, cancel_futures=False)
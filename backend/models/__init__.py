@@ -1,2 +1,2 @@
-from .prediction import PredictPayload, FeatureRecord, RecommendationPayload
+from .prediction import PredictPayload, FeatureRecord, RecommendationPayload, LoadModelVersionPayload, ActivateModelVersionPayload
 from .auth import *
\ No newline at end of file
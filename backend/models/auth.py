@@ -1,3 +1,5 @@
+from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, Field
 
 class LoginModel(BaseModel):
@@ -81,6 +83,18 @@ class LogoutModel(BaseModel):
             }
         }
 
+class GetNewAccessTokenModel(BaseModel):
+    refresh_token: str = Field(..., example="some-refresh-token-string")
+    role: str = Field(..., example="patient")  # or "doctor"
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "refresh_token": "some-refresh-token-string",
+                "role": "patient"
+            }
+        }
+
 class TokenModel(BaseModel):
     access_token: str = Field(..., example="some-access-token-string")
     refresh_token: str = Field(..., example="some-refresh-token-string")
@@ -133,3 +147,9 @@ class UpdatePatientInfoModel(BaseModel):
                 "current_medications": "Updated medications"
             }
         }
+
+
+class VitalsTrendModel(BaseModel):
+    start_time: Optional[datetime] = Field(None, example="2025-01-01T00:00:00", description="Defaults to 90 days before end_time")
+    end_time: Optional[datetime] = Field(None, example="2025-04-01T00:00:00", description="Defaults to now")
+    buckets: int = Field(100, ge=1, le=1000, example=100, description="Number of time buckets per vital")
\ No newline at end of file
@@ -29,4 +29,11 @@ class PredictPayload(BaseModel):
     
 class RecommendationPayload(BaseModel):
     model_prediction: Optional[Any]
-    patient_vitals: PredictPayload
\ No newline at end of file
+    patient_vitals: PredictPayload
+    
+class LoadModelVersionPayload(BaseModel):
+    model_uri: str = Field(..., example="models:/ehr_xgb_model/2")
+    activate: bool = Field(True, description="Swap the model in as soon as it is loaded and warmed up")
+    
+class ActivateModelVersionPayload(BaseModel):
+    model_key: str = Field(..., example="ehr_xgb_model/2")
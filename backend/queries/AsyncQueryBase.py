@@ -0,0 +1,20 @@
+from abc import ABC
+from utils import AsyncDatabase
+
+class AsyncQueryBase(ABC):
+    def __init__(self, connection_pool=None):
+        # Queries share the application-wide asyncpg pool unless one is injected
+        self.db = AsyncDatabase(connection_pool)
+
+    def transaction(self):
+        # Statements awaited by this query inside the block share one transaction
+        return self.db.transaction()
+
+    async def close(self):
+        # Connections go back to the pool after every statement, nothing to release here
+        pass
+
+    async def stop(self):
+        # Statements outside db.transaction() commit on their own and transaction() blocks
+        # roll back when the exception leaves them, so there is nothing left to undo
+        pass
\ No newline at end of file
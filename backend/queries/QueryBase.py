@@ -2,12 +2,17 @@ from abc import ABC
 from utils import Database
 
 class QueryBase(ABC):
-    def __init__(self):
-        self.db = Database()
+    def __init__(self, connection_pool=None):
+        # Queries share the application-wide pool unless one is injected
+        self.db = Database(connection_pool)
+
+    def transaction(self):
+        # Statements issued by this query inside the block share one transaction
+        return self.db.transaction()
 
     def close(self):
-        self.db.close_pool()
+        # Connections go back to the shared pool after every statement, nothing to release here
+        pass
         
     def stop(self):
-        self.db.rollback()
-        self.db.close_pool()
\ No newline at end of file
+        self.db.rollback()
\ No newline at end of file
@@ -1,18 +1,52 @@
 from ..QueryBase import QueryBase
 
 class GetNewAccessTokenQuery(QueryBase):
-    def check_refresh_token_exists(self, refresh_token: str):
+    def rotate_refresh_token(self, token_hash: str, role: str, new_token_hash: str, expires_in: int):
+        """
+        Revoke a valid refresh token and issue its replacement in one statement.
+        Returns (account_id, email) or None if the token is unknown, expired, revoked or
+        was issued for another role.
+        """
         query = """
-            SELECT 
-                login_logs.log_id, 
-                accounts.account_id as account_id,
-                accounts.email as email
-            FROM login_logs 
-            LEFT JOIN accounts ON login_logs.account_id = accounts.account_id
+            WITH revoked AS (
+                UPDATE refresh_tokens
+                SET revoked_time = CURRENT_TIMESTAMP
+                WHERE token_hash = %s
+                    AND role = %s
+                    AND revoked_time IS NULL
+                    AND expires_time > CURRENT_TIMESTAMP
+                RETURNING account_id, role
+            ), issued AS (
+                INSERT INTO refresh_tokens (token_hash, account_id, role, expires_time)
+                SELECT %s, account_id, role, CURRENT_TIMESTAMP + make_interval(secs => %s)
+                FROM revoked
+                RETURNING account_id
+            )
+            SELECT accounts.account_id, accounts.email
+            FROM issued
+            JOIN accounts ON accounts.account_id = issued.account_id
         """
-
-        params = (refresh_token,)
-        result = self.db.execute_query(query, params)
+        result = self.db.execute_query(query, (token_hash, role, new_token_hash, expires_in))
         if not result or len(result) == 0:
             return None
-        return result[0]
\ No newline at end of file
+        return result[0]
+
+    def purge_refresh_tokens(self, batch_size: int = 1000):
+        """
+        Delete expired and revoked refresh tokens in batches.
+        Returns the number of deleted rows.
+        """
+        query = """
+            DELETE FROM refresh_tokens
+            WHERE token_id IN (
+                SELECT token_id FROM refresh_tokens
+                WHERE expires_time < CURRENT_TIMESTAMP OR revoked_time IS NOT NULL
+                LIMIT %s
+            )
+        """
+        deleted = 0
+        while True:
+            rowaffected = self.db.execute_non_query(query, (batch_size,))
+            deleted += rowaffected
+            if rowaffected < batch_size:
+                return deleted
\ No newline at end of file
@@ -1,39 +1,57 @@
-from ..QueryBase import QueryBase
+from ..AsyncQueryBase import AsyncQueryBase
 
-class LoginQuery(QueryBase):
-    def get_account_by_email(self, email):
+class LoginQuery(AsyncQueryBase):
+    async def get_account_by_email(self, email):
         query = "SELECT account_id, email, password_hash, profile_picture_url, fullname FROM accounts WHERE email = %s"
-        response = self.db.execute_query(query, (email,))
+        response = await self.db.execute_query(query, (email,))
         if not response or len(response) == 0:
             return None
         return response[0]
     
     
-    def get_doctor_by_account_id(self, account_id):
+    async def get_doctor_by_account_id(self, account_id):
         query = "SELECT doctor_id, medical_license_number FROM doctors WHERE account_id = %s"
-        response = self.db.execute_query(query, (account_id,))
+        response = await self.db.execute_query(query, (account_id,))
         if not response or len(response) == 0:
             return None
         return response[0]
     
     
-    def get_patient_by_account_id(self, account_id):
+    async def get_patient_by_account_id(self, account_id):
         query = "SELECT patient_id FROM patients WHERE account_id = %s"
-        response = self.db.execute_query(query, (account_id,))
+        response = await self.db.execute_query(query, (account_id,))
         if not response or len(response) == 0:
             return None
         return response[0]
     
     
-    def create_login_log(self, account_id, payload):
-        query = "INSERT INTO login_logs (account_id, refresh_token, ip_address, user_agent) VALUES (%s, %s, %s, %s)"
-        rowaffected = self.db.execute_non_query(query, (
+    async def create_login_log(self, account_id, payload):
+        query = "INSERT INTO login_logs (account_id, ip_address, user_agent) VALUES (%s, %s, %s)"
+        rowaffected = await self.db.execute_non_query(query, (
             account_id,
-            payload.get("refresh_token"),
             payload.get("ip_address"),
             payload.get("user_agent"),
         ))
         
+        if not rowaffected or rowaffected == 0:
+            return False
+        return True
+    
+    
+    async def create_refresh_token(self, account_id, role, token_hash, expires_in):
+        query = """
+            INSERT INTO refresh_tokens (token_hash, account_id, role, expires_time)
+            VALUES (%s, %s, %s, CURRENT_TIMESTAMP + make_interval(secs => %s))
+        """
+        rowaffected = await self.db.execute_non_query(query, (token_hash, account_id, role, float(expires_in)))
+        if not rowaffected or rowaffected == 0:
+            return False
+        return True
+    
+    
+    async def update_password_hash(self, account_id, password_hash):
+        query = "UPDATE accounts SET password_hash = %s WHERE account_id = %s"
+        rowaffected = await self.db.execute_non_query(query, (password_hash, account_id))
         if not rowaffected or rowaffected == 0:
             return False
         return True
\ No newline at end of file
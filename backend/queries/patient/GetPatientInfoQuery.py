@@ -1,7 +1,7 @@
-from ..QueryBase import QueryBase
+from ..AsyncQueryBase import AsyncQueryBase
 
-class GetPatientInfoQuery(QueryBase):
-    def get_patient_info(self, account_id):
+class GetPatientInfoQuery(AsyncQueryBase):
+    async def get_patient_info(self, account_id):
         query = """
             SELECT
                 accounts.account_id AS account_id,
@@ -15,32 +15,32 @@ class GetPatientInfoQuery(QueryBase):
                 patients.medical_history AS medical_history,
                 patients.allergies AS allergies,
                 patients.current_medications AS current_medications,
-                patient_health_metrics.gender AS gender,
-                patient_health_metrics.race AS race,
-                patient_health_metrics.ethnicity AS ethnicity,
-                patient_health_metrics.tobacco_smoking_status AS tobacco_smoking_status,
-                patient_health_metrics.pain_severity AS pain_severity,
-                patient_health_metrics.age AS age,
-                patient_health_metrics.bmi AS bmi,
-                patient_health_metrics.calcium AS calcium,
-                patient_health_metrics.carbon_dioxide AS carbon_dioxide,
-                patient_health_metrics.chloride AS chloride,
-                patient_health_metrics.creatinine AS creatinine,
-                patient_health_metrics.diastolic_bp AS diastolic_bp,
-                patient_health_metrics.glucose AS glucose,
-                patient_health_metrics.heart_rate AS heart_rate,
-                patient_health_metrics.potassium AS potassium,
-                patient_health_metrics.respiratory_rate AS respiratory_rate,
-                patient_health_metrics.sodium AS sodium,
-                patient_health_metrics.systolic_bp AS systolic_bp,
-                patient_health_metrics.urea_nitrogen AS urea_nitrogen,
-                patient_health_metrics.recorded_time AS recorded_time
+                patient_latest_metrics.gender AS gender,
+                patient_latest_metrics.race AS race,
+                patient_latest_metrics.ethnicity AS ethnicity,
+                patient_latest_metrics.tobacco_smoking_status AS tobacco_smoking_status,
+                patient_latest_metrics.pain_severity AS pain_severity,
+                patient_latest_metrics.age AS age,
+                patient_latest_metrics.bmi AS bmi,
+                patient_latest_metrics.calcium AS calcium,
+                patient_latest_metrics.carbon_dioxide AS carbon_dioxide,
+                patient_latest_metrics.chloride AS chloride,
+                patient_latest_metrics.creatinine AS creatinine,
+                patient_latest_metrics.diastolic_bp AS diastolic_bp,
+                patient_latest_metrics.glucose AS glucose,
+                patient_latest_metrics.heart_rate AS heart_rate,
+                patient_latest_metrics.potassium AS potassium,
+                patient_latest_metrics.respiratory_rate AS respiratory_rate,
+                patient_latest_metrics.sodium AS sodium,
+                patient_latest_metrics.systolic_bp AS systolic_bp,
+                patient_latest_metrics.urea_nitrogen AS urea_nitrogen,
+                patient_latest_metrics.recorded_time AS recorded_time
             FROM accounts
             LEFT JOIN patients ON accounts.account_id = patients.account_id
-            LEFT JOIN patient_health_metrics ON patients.patient_id = patient_health_metrics.patient_id
+            LEFT JOIN patient_latest_metrics ON patients.patient_id = patient_latest_metrics.patient_id
             WHERE accounts.account_id = %s
         """
-        response = self.db.execute_query(query, (account_id,))
+        response = await self.db.execute_query(query, (account_id,))
         if not response or len(response) == 0:
             return None
         return response[0]
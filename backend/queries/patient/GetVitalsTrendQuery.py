@@ -0,0 +1,44 @@
+from ..QueryBase import QueryBase
+
+VITAL_FIELDS = [
+    "pain_severity", "age", "bmi", "calcium", "carbon_dioxide", "chloride", "creatinine", "diastolic_bp",
+    "glucose", "heart_rate", "potassium", "respiratory_rate", "sodium", "systolic_bp", "urea_nitrogen",
+]
+
+class GetVitalsTrendQuery(QueryBase):
+    def get_vitals_trend(self, account_id, start_time, end_time, buckets):
+        """
+        Aggregate the readings between start_time and end_time into equal-width time buckets.
+        Returns one row per non-empty bucket: (bucket, first time, last time, readings,
+        then count, min, max and avg of every vital in VITAL_FIELDS).
+        """
+        aggregates = ", ".join(
+            f"COUNT({field}), MIN({field}), MAX({field}), AVG({field})" for field in VITAL_FIELDS
+        )
+        query = f"""
+            SELECT
+                width_bucket(
+                    EXTRACT(EPOCH FROM recorded_time),
+                    EXTRACT(EPOCH FROM %s::timestamp),
+                    EXTRACT(EPOCH FROM %s::timestamp),
+                    %s
+                ) AS bucket,
+                MIN(recorded_time),
+                MAX(recorded_time),
+                COUNT(*),
+                {aggregates}
+            FROM patient_health_metrics
+            WHERE patient_id = (SELECT patient_id FROM patients WHERE account_id = %s)
+                AND recorded_time >= %s
+                AND recorded_time < %s
+            GROUP BY bucket
+            ORDER BY bucket
+        """
+        return self.db.execute_query(query, (
+            start_time,
+            end_time,
+            buckets,
+            account_id,
+            start_time,
+            end_time,
+        ))
\ No newline at end of file
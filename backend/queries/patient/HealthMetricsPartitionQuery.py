@@ -0,0 +1,12 @@
+from ..QueryBase import QueryBase
+
+class HealthMetricsPartitionQuery(QueryBase):
+    def ensure_partitions(self, months_ahead: int = 3):
+        """
+        Create the monthly patient_health_metrics partitions up to months_ahead months
+        after the current one.
+        Returns the number of created partitions.
+        """
+        query = "SELECT ensure_health_metrics_partitions(CURRENT_DATE, %s)"
+        response = self.db.execute_query(query, (months_ahead,))
+        return response[0][0] if response else 0
\ No newline at end of file
@@ -1,126 +1,73 @@
 from ..QueryBase import QueryBase
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
+
+HEALTH_METRIC_FIELDS = [
+    "gender", "race", "ethnicity", "tobacco_smoking_status", "pain_severity", "age", "bmi",
+    "calcium", "carbon_dioxide", "chloride", "creatinine", "diastolic_bp", "glucose", "heart_rate",
+    "potassium", "respiratory_rate", "sodium", "systolic_bp", "urea_nitrogen",
+]
 
 class UpdatePatientInfoQuery(QueryBase):
-    def update_account_info(self, account_id, fields):
-        """Update account information"""
-        if not fields:
-            return True
-        
-        # Build dynamic query
-        set_clauses = []
-        params = []
-        
-        for field, value in fields.items():
-            set_clauses.append(f"{field} = %s")
-            params.append(value)
-        
-        params.append(account_id)
-        
-        query = f"""
-            UPDATE accounts 
-            SET {', '.join(set_clauses)}
-            WHERE account_id = %s
+    def update_patient(self, account_id, account_fields, patient_fields, health_metrics):
         """
-        
-        result = self.db.execute_non_query(query, tuple(params))
-        if not result or result == 0:
-            return False
-        return True
-    
-    
-    def update_patient_info(self, account_id, fields):
-        """Update patient-specific information"""
-        if not fields:
-            return True
-        
-        # First get patient_id from account_id
-        patient_id_query = """
-            SELECT patient_id FROM patients WHERE account_id = %s
-        """
-        patient_result = self.db.execute_query(patient_id_query, (account_id,))
-        
-        if not patient_result or len(patient_result) == 0:
-            return False
-        
-        patient_id = patient_result[0][0]
-        
-        # Build dynamic query
-        set_clauses = []
-        params = []
-        
-        for field, value in fields.items():
-            set_clauses.append(f"{field} = %s")
-            params.append(value)
-        
-        params.append(patient_id)
-        
-        query = f"""
-            UPDATE patients 
-            SET {', '.join(set_clauses)}
-            WHERE patient_id = %s
+        Update account, patient and health metric fields in a single statement.
+        The patient_id is resolved once and health metrics are appended as a new snapshot.
+        Returns (patient_id, accounts updated, patients updated, metrics inserted).
         """
-        
-        
-        result = self.db.execute_non_query(query, tuple(params))
-        if not result or result == 0:
-            return False
-        return True
-    
-    def update_health_metrics(self, account_id, fields):
-        """Update patient health metrics"""
-        if not fields:
-            return True
-        
-        # First get patient_id from account_id
-        patient_id_query = """
-            SELECT patient_id FROM patients WHERE account_id = %s
-        """
-        patient_result = self.db.execute_query(patient_id_query, (account_id,))
-        
-        if not patient_result or len(patient_result) == 0:
-            return False
-        
-        patient_id = patient_result[0][0]
-        
-        # Check if health metrics record exists
-        check_query = """
-            SELECT COUNT(*) FROM patient_health_metrics WHERE patient_id = %s
-        """
-        check_result = self.db.execute_query(check_query, (patient_id,))
-        
-        if check_result and check_result[0][0] > 0:
-            # Update existing record
-            set_clauses = []
-            params = []
-            
-            for field, value in fields.items():
-                set_clauses.append(f"{field} = %s")
-                params.append(value)
-            
-            # Add recorded_time update
-            set_clauses.append("recorded_time = %s")
-            params.append(datetime.now(timezone(timedelta(hours=7))))
-            params.append(patient_id)
+        ctes = ["patient AS (SELECT patient_id FROM patients WHERE account_id = %s)"]
+        params = [account_id]
+        counts = []
 
-            query = f"""
-                UPDATE patient_health_metrics 
-                SET {', '.join(set_clauses)}
-                WHERE patient_id = %s
-            """
+        if account_fields:
+            ctes.append(f"""account_update AS (
+                UPDATE accounts
+                SET {', '.join(f"{field} = %s" for field in account_fields)}
+                WHERE account_id = %s
+                RETURNING account_id
+            )""")
+            params.extend(account_fields.values())
+            params.append(account_id)
+            counts.append("(SELECT COUNT(*) FROM account_update)")
         else:
-            # Insert new record
-            field_names = list(fields.keys()) + ['patient_id', 'recorded_time']
-            field_values = list(fields.values()) + [patient_id, datetime.now(timezone(timedelta(hours=7)))]
-            placeholders = ', '.join(['%s'] * len(field_names))
-            
-            query = f"""
-                INSERT INTO patient_health_metrics ({', '.join(field_names)})
-                VALUES ({placeholders})
-            """
-            params = field_values
-        print(query, params)
-        result = self.db.execute_non_query(query, tuple(params))
-        if not result or result == 0:
-            return False
-        return True
+            counts.append("0")
+
+        if patient_fields:
+            ctes.append(f"""patient_update AS (
+                UPDATE patients
+                SET {', '.join(f"{field} = %s" for field in patient_fields)}
+                WHERE patient_id = (SELECT patient_id FROM patient)
+                RETURNING patient_id
+            )""")
+            params.extend(patient_fields.values())
+            counts.append("(SELECT COUNT(*) FROM patient_update)")
+        else:
+            counts.append("0")
+
+        if health_metrics:
+            # Append a full snapshot: changed fields from the request, the rest carried over from the latest one
+            select_values = []
+            for field in HEALTH_METRIC_FIELDS:
+                if field in health_metrics:
+                    select_values.append("%s")
+                    params.append(health_metrics[field])
+                else:
+                    select_values.append(f"latest.{field}")
+            # recorded_time is a TIMESTAMP holding UTC, an offset would be dropped, not converted
+            params.append(datetime.now(timezone.utc).replace(tzinfo=None))
+            ctes.append(f"""metrics_insert AS (
+                INSERT INTO patient_health_metrics (patient_id, {', '.join(HEALTH_METRIC_FIELDS)}, recorded_time)
+                SELECT patient.patient_id, {', '.join(select_values)}, %s
+                FROM patient
+                LEFT JOIN patient_latest_metrics latest ON latest.patient_id = patient.patient_id
+                RETURNING patient_id
+            )""")
+            counts.append("(SELECT COUNT(*) FROM metrics_insert)")
+        else:
+            counts.append("0")
+
+        query = f"""
+            WITH {', '.join(ctes)}
+            SELECT (SELECT patient_id FROM patient), {', '.join(counts)}
+        """
+        result = self.db.execute_query(query, tuple(params))
+        return result[0]
\ No newline at end of file
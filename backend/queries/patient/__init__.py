@@ -1,2 +1,4 @@
 from .GetPatientInfoQuery import GetPatientInfoQuery
-from .UpdatePatientInfoQuery import UpdatePatientInfoQuery
\ No newline at end of file
+from .UpdatePatientInfoQuery import UpdatePatientInfoQuery
+from .GetVitalsTrendQuery import GetVitalsTrendQuery
+from .HealthMetricsPartitionQuery import HealthMetricsPartitionQuery
\ No newline at end of file
@@ -1,4 +1,4 @@
-from .ml_router import ml_router
+from .ml_router import ml_router, model_registry
 from .auth_router import auth_router
 from .patient_router import patient_router
 from .doctor_router import doctor_router
\ No newline at end of file
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Request
 from utils import standard_response, login_required
-from models import CreatePatientAccountModel, CreateDoctorAccountModel, LoginModel, ResetPasswordModel, LogoutModel
+from models import CreatePatientAccountModel, CreateDoctorAccountModel, LoginModel, ResetPasswordModel, LogoutModel, GetNewAccessTokenModel
 from controller import (
     CreatePatientAccountController, 
     CreateDoctorAccountController, 
@@ -13,25 +13,25 @@ auth_router = APIRouter()
 
 @auth_router.post("/create_patient_account")
 @standard_response
-def create_patient_account(payload: CreatePatientAccountModel):
+async def create_patient_account(payload: CreatePatientAccountModel):
     controller = CreatePatientAccountController(payload)
-    response = controller.execute()
+    response = await controller.execute()
     return response
 
 @auth_router.post("/create_doctor_account")
 @standard_response
-def create_doctor_account(payload: CreateDoctorAccountModel):
+async def create_doctor_account(payload: CreateDoctorAccountModel):
     controller = CreateDoctorAccountController(payload)
-    response = controller.execute()
+    response = await controller.execute()
     return response
 
 @auth_router.post("/login")
 @standard_response
-def login(payload: LoginModel, request: Request):
+async def login(payload: LoginModel, request: Request, background_tasks: BackgroundTasks):
     client_ip = request.client.host
     user_agent = request.headers.get('User-Agent', 'unknown')
-    controller = LoginController(payload, client_ip, user_agent)
-    response = controller.execute()
+    controller = LoginController(payload, client_ip, user_agent, background_tasks)
+    response = await controller.execute()
     return response
 
 @auth_router.post("/logout")
@@ -42,11 +42,12 @@ def logout(payload: LogoutModel, request: Request, account_info=Depends(login_re
     response = controller.execute()
     return response
 
-@auth_router.get("/get_new_access_token")
+@auth_router.post("/get_new_access_token")
 @standard_response
-def get_new_access_token(refresh_token: str, role: str, request: Request):
+def get_new_access_token(payload: GetNewAccessTokenModel, request: Request):
+    # POST body, so the refresh token stays out of URLs, access logs and proxies
     access_token = request.headers.get("Authorization")
-    controller = GetNewAccessTokenController(refresh_token, access_token, role)
+    controller = GetNewAccessTokenController(payload.refresh_token, access_token, payload.role)
     response = controller.execute()
     return response
 
@@ -1,30 +1,74 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Request
 
-from controller import InitializeModelController, GetModelMetadataController, PredictController
-from utils import standard_response
-from models import PredictPayload
+from controller import (
+    InitializeModelController,
+    GetModelMetadataController,
+    PredictController,
+    BulkPredictController,
+    GetModelVersionsController,
+    LoadModelVersionController,
+    ActivateModelVersionController,
+    RollbackModelVersionController
+)
+from mlcore import ModelRegistry
+from utils import standard_response, model_admin_required
+from models import PredictPayload, LoadModelVersionPayload, ActivateModelVersionPayload
 
 ml_router = APIRouter()
-ml_core = None
+model_registry = ModelRegistry()
 
 @ml_router.get("/get_model_metadata")
 @standard_response
 def get_model_metadata():
-    controller = GetModelMetadataController(ml_core)
+    controller = GetModelMetadataController(model_registry.get_active())
     response = controller.execute()
     return response
 
 @ml_router.post("/initialize_model")
 @standard_response
-def initialize_model():
-    global ml_core
-    controller = InitializeModelController(ml_core)
-    ml_core = controller.execute()
+def initialize_model(account_info=Depends(model_admin_required)):
+    controller = InitializeModelController(model_registry)
+    controller.execute()
     return "Model initialized successfully"
 
 @ml_router.post("/predict")
 @standard_response
-def predict(request_payload: PredictPayload):
-    controller = PredictController(request_payload, ml_core)
+async def predict(request_payload: PredictPayload):
+    controller = PredictController(request_payload, model_registry.get_active())
+    response = await controller.execute()
+    return response
+
+@ml_router.post("/predict_bulk")
+async def predict_bulk(request: Request):
+    # Streams NDJSON results, so the response is not wrapped by standard_response
+    controller = BulkPredictController(request, model_registry.get_active())
+    response = await controller.execute()
+    return response
+
+@ml_router.get("/get_model_versions")
+@standard_response
+def get_model_versions():
+    controller = GetModelVersionsController(model_registry)
+    response = controller.execute()
+    return response
+
+@ml_router.post("/load_model_version")
+@standard_response
+def load_model_version(payload: LoadModelVersionPayload, account_info=Depends(model_admin_required)):
+    controller = LoadModelVersionController(payload, model_registry)
+    response = controller.execute()
+    return response
+
+@ml_router.post("/activate_model_version")
+@standard_response
+def activate_model_version(payload: ActivateModelVersionPayload, account_info=Depends(model_admin_required)):
+    controller = ActivateModelVersionController(payload, model_registry)
+    response = controller.execute()
+    return response
+
+@ml_router.post("/rollback_model_version")
+@standard_response
+def rollback_model_version(account_info=Depends(model_admin_required)):
+    controller = RollbackModelVersionController(model_registry)
     response = controller.execute()
     return response
\ No newline at end of file
@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
 from utils import standard_response, patient_login_required
-from controller import GetPatientInfoController, UpdatePatientInfoController, GetRecommendationController
-from models import UpdatePatientInfoModel, RecommendationPayload
+from controller import GetPatientInfoController, UpdatePatientInfoController, GetRecommendationController, GetVitalsTrendController
+from models import UpdatePatientInfoModel, RecommendationPayload, VitalsTrendModel
 
 patient_router = APIRouter()
 
 # Patient information management
 @patient_router.get("/get_patient_info")
 @standard_response
-def get_patient_info(account_info=Depends(patient_login_required)):
+async def get_patient_info(account_info=Depends(patient_login_required)):
     controller = GetPatientInfoController(account_info)
-    response = controller.execute()
+    response = await controller.execute()
     return response
 
 @patient_router.post("/update_patient_info")
@@ -20,6 +22,13 @@ def update_patient_info(update_data: UpdatePatientInfoModel, account_info=Depend
     response = controller.execute()
     return response
 
+@patient_router.get("/get_vitals_trend")
+@standard_response
+def get_vitals_trend(payload: Annotated[VitalsTrendModel, Query()], account_info=Depends(patient_login_required)):
+    controller = GetVitalsTrendController(account_info, payload)
+    response = controller.execute()
+    return response
+
 @patient_router.post("/get_recommendation")
 @standard_response
 def get_recommendation(payload: RecommendationPayload, account_info=Depends(patient_login_required)):
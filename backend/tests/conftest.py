@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the backend modules the same way the app does, from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MODEL_AUTOLOAD", "false")
+os.environ.setdefault("DB_MIGRATE_ON_STARTUP", "false")
+os.environ.setdefault("PREDICTION_CACHE_REDIS", "false")
+os.environ.setdefault("POSTGRES_HOST", "localhost")
+
+
+@pytest.fixture
+def fake_redis():
+    """
+    Point the shared Cache client at an in-memory fakeredis server.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    import redis
+    from utils import Cache
+    from utils.cache import MeteredConnectionPool
+
+    Cache._shared_pool = MeteredConnectionPool(
+        connection_class=fakeredis.FakeConnection,
+        server=fakeredis.FakeServer(),
+        max_connections=16,
+        timeout=1,
+        decode_responses=True,
+    )
+    Cache._shared_client = redis.StrictRedis(connection_pool=Cache._shared_pool)
+    Cache._failures = 0
+    Cache._unavailable_until = 0.0
+    yield Cache
+    Cache.close_shared_pool()
+
+
+@pytest.fixture(scope="session")
+def postgres():
+    """
+    Shared Database pool on the PostgreSQL configured by the POSTGRES_* variables, with
+    every migration applied. Tests using it are skipped when no server is reachable.
+    """
+    import psycopg2
+    from utils import Database
+    from migrations import MigrationRunner
+
+    try:
+        psycopg2.connect(
+            user=os.getenv("POSTGRES_USER", "postgres"),
+            password=os.getenv("POSTGRES_PASSWORD", "postgres"),
+            host=os.getenv("POSTGRES_HOST"),
+            dbname=os.getenv("POSTGRES_DB", "test_db"),
+            port=int(os.getenv("POSTGRES_PORT", 5432)),
+            connect_timeout=2,
+        ).close()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL is not available: {e}")
+
+    Database.init_pool()
+    MigrationRunner().upgrade()
+    yield Database
+    Database.close_shared_pool()
+
+
+@pytest.fixture
+def make_patient(postgres):
+    """
+    Create an account with a patient profile, returns (account_id, patient_id).
+    """
+    import uuid
+
+    def factory():
+        db = postgres()
+        with db.transaction():
+            account_id = db.execute_query(
+                "INSERT INTO accounts (fullname, email, password_hash) VALUES (%s, %s, %s) RETURNING account_id",
+                ("Test Patient", f"patient-{uuid.uuid4().hex}@example.com", "not-a-hash"),
+            )[0][0]
+            patient_id = db.execute_query(
+                "INSERT INTO patients (account_id) VALUES (%s) RETURNING patient_id", (account_id,)
+            )[0][0]
+        return account_id, patient_id
+
+    return factory
@@ -0,0 +1,143 @@
+import os
+import json
+from types import SimpleNamespace
+
+import mlflow
+import pytest
+
+from mlcore import MLCore
+from mlcore.artifact_cache import ArtifactCache
+
+MODEL_NAME = "ehr_xgb_model"
+
+
+class FakeMlflowStore:
+    """
+    Stand-in for the MLflow registry and artifact store. Each run has its own feature
+    columns so a stale entry is visible, and every download is counted.
+    """
+
+    def __init__(self):
+        self.runs = {"1": "run-1"}
+        self.aliases = {"Production": "1"}
+        self.available = True
+        self.downloads = []
+
+    def _model_version(self, version):
+        if not self.available:
+            raise ConnectionError("MLflow is unreachable")
+        return SimpleNamespace(version=version, run_id=self.runs[version], source=f"runs:/{self.runs[version]}/model", status="READY")
+
+    def get_model_version(self, model_name, version):
+        return self._model_version(version)
+
+    def get_model_version_by_alias(self, model_name, alias):
+        if not self.available:
+            raise ConnectionError("MLflow is unreachable")
+        return self._model_version(self.aliases[alias])
+
+    def _write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def download_artifacts(self, run_id, artifact_path, dst_path):
+        self.downloads.append((run_id, artifact_path))
+        if artifact_path.endswith("feature_columns.json"):
+            content = {"feature_columns": ["age", "bmi", f"from_{run_id}"]}
+        else:
+            content = {"classes": ["high", "low", "medium"]}
+        return self._write(os.path.join(dst_path, artifact_path), json.dumps(content))
+
+    def download_model(self, artifact_uri, dst_path):
+        self.downloads.append((artifact_uri, "model"))
+        self._write(os.path.join(dst_path, "model.ubj"), artifact_uri)
+        return dst_path
+
+
+@pytest.fixture
+def store(monkeypatch):
+    fake_store = FakeMlflowStore()
+    monkeypatch.setattr(mlflow.artifacts, "download_artifacts", fake_store.download_model)
+    return fake_store
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactCache(root=str(tmp_path / "model-cache"), max_bytes=1024 ** 2)
+
+
+def load(store, cache, model_uri):
+    # Only the attributes the loading path reads, MLflow is the fake store
+    core = MLCore.__new__(MLCore)
+    core.model_uri = model_uri
+    core.mlflow_client = store
+    core.artifact_cache = cache
+    core.cache_manifest = None
+    core.model_metadata = None
+    core._set_model_metadata()
+    core.load_artifacts()
+    return core
+
+
+def test_miss_downloads_then_hit_serves_from_disk(store, cache):
+    first = load(store, cache, f"models:/{MODEL_NAME}/1")
+    assert len(store.downloads) == 3
+    assert first.artifact_model["feature_columns"] == ["age", "bmi", "from_run-1"]
+
+    # A pinned version is served from the cache without contacting MLflow at all
+    store.available = False
+    second = load(store, cache, f"models:/{MODEL_NAME}/1")
+    assert len(store.downloads) == 3
+    assert second.model_metadata == first.model_metadata
+    assert second.artifact_model["feature_columns"] == ["age", "bmi", "from_run-1"]
+    with open(cache.path(second.cache_manifest, "model") + "/model.ubj") as f:
+        assert f.read() == f"models:/{MODEL_NAME}/1"
+
+
+def test_moved_alias_invalidates_the_cached_version(store, cache):
+    load(store, cache, f"models:/{MODEL_NAME}/Production")
+    assert cache.get_alias(MODEL_NAME, "Production") == "1"
+
+    store.runs["2"] = "run-2"
+    store.aliases["Production"] = "2"
+    moved = load(store, cache, f"models:/{MODEL_NAME}/Production")
+
+    assert moved.model_metadata["model_version"] == "2"
+    assert moved.artifact_model["feature_columns"] == ["age", "bmi", "from_run-2"]
+    assert {run_id for run_id, _ in store.downloads if run_id.startswith("run-")} == {"run-1", "run-2"}
+    assert cache.get_alias(MODEL_NAME, "Production") == "2"
+
+    # While MLflow is down the alias resolves to the last version it pointed to, not the first one cached
+    store.available = False
+    offline = load(store, cache, f"models:/{MODEL_NAME}/Production")
+    assert offline.model_metadata["model_version"] == "2"
+    assert offline.artifact_model["feature_columns"] == ["age", "bmi", "from_run-2"]
+
+
+def test_unknown_alias_without_mlflow_is_not_served_from_the_cache(store, cache):
+    load(store, cache, f"models:/{MODEL_NAME}/1")
+    store.available = False
+    with pytest.raises(ConnectionError):
+        load(store, cache, f"models:/{MODEL_NAME}/Staging")
+
+
+def test_corrupted_entry_is_removed_and_downloaded_again(store, cache):
+    first = load(store, cache, f"models:/{MODEL_NAME}/1")
+    with open(cache.path(first.cache_manifest, "feature_columns"), "w") as f:
+        json.dump({"feature_columns": ["tampered"]}, f)
+
+    second = load(store, cache, f"models:/{MODEL_NAME}/1")
+    assert len(store.downloads) == 6
+    assert second.artifact_model["feature_columns"] == ["age", "bmi", "from_run-1"]
+
+
+def test_least_recently_used_entry_is_evicted(store, cache):
+    store.runs["2"] = "run-2"
+    first = load(store, cache, f"models:/{MODEL_NAME}/1")
+    cache.max_bytes = first.cache_manifest["size"] + 1
+    load(store, cache, f"models:/{MODEL_NAME}/2")
+
+    assert cache.find(MODEL_NAME, "1") is None
+    assert cache.find(MODEL_NAME, "2")["run_id"] == "run-2"
@@ -0,0 +1,96 @@
+import asyncio
+
+from utils import LoginAuditBuffer
+
+
+class SlowSink:
+    """
+    Stands in for AsyncDatabase, each COPY takes delay seconds.
+    """
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.rows = []
+
+    async def copy_records(self, table, columns, records):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("database is down")
+        self.rows.extend(records)
+        return len(records)
+
+
+def make_buffer(sink, batch_size=2, flush_interval_ms=10):
+    buffer = LoginAuditBuffer(batch_size=batch_size, flush_interval_ms=flush_interval_ms, max_buffered=100)
+    buffer.db = sink
+    return buffer
+
+
+def test_stop_during_slow_flush_writes_every_event():
+    async def scenario():
+        sink = SlowSink(delay=0.2)
+        buffer = make_buffer(sink)
+        buffer.start()
+        for account_id in range(5):
+            assert buffer.enqueue(account_id, "127.0.0.1", "pytest")
+        # Let the flush loop pick up the first batch, then stop while the COPY is running
+        await asyncio.sleep(0.05)
+        await buffer.stop()
+        return sink, buffer
+
+    sink, buffer = asyncio.run(scenario())
+    assert sorted(row[0] for row in sink.rows) == [0, 1, 2, 3, 4]
+    assert buffer.get_stats()["buffered"] == 0
+
+
+def test_cancelled_flush_puts_batch_back():
+    async def scenario():
+        sink = SlowSink(delay=1.0)
+        buffer = make_buffer(sink, batch_size=10, flush_interval_ms=10000)
+        buffer.start()
+        for account_id in range(3):
+            buffer.enqueue(account_id, "127.0.0.1", "pytest")
+        flush = asyncio.create_task(buffer.flush())
+        await asyncio.sleep(0.05)
+        flush.cancel()
+        try:
+            await flush
+        except asyncio.CancelledError:
+            pass
+        buffered = buffer.get_stats()["buffered"]
+        sink.delay = 0.0
+        await buffer.stop()
+        return buffered, sink
+
+    buffered, sink = asyncio.run(scenario())
+    assert buffered == 3
+    assert [row[0] for row in sink.rows] == [0, 1, 2]
+
+
+def test_failed_flush_keeps_events_in_order():
+    async def scenario():
+        sink = SlowSink(fail=True)
+        buffer = make_buffer(sink, batch_size=2)
+        buffer.start()
+        for account_id in range(4):
+            buffer.enqueue(account_id, "127.0.0.1", "pytest")
+        await buffer.flush()
+        events = [event[0] for event in buffer._events]
+        sink.fail = False
+        await buffer.stop()
+        return events, sink
+
+    events, sink = asyncio.run(scenario())
+    assert events == [0, 1, 2, 3]
+    assert [row[0] for row in sink.rows] == [0, 1, 2, 3]
+
+
+def test_enqueue_is_rejected_once_stopping():
+    async def scenario():
+        buffer = make_buffer(SlowSink())
+        buffer.start()
+        await buffer.stop()
+        return buffer.enqueue(1, "127.0.0.1", "pytest")
+
+    assert asyncio.run(scenario()) is False
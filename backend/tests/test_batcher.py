@@ -0,0 +1,85 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from mlcore.batcher import MicroBatcher
+from utils import ServiceUnavailableException
+
+
+def double(X):
+    return X * 2
+
+
+def test_concurrent_requests_get_their_own_rows():
+    batcher = MicroBatcher(double, max_batch_size=8, max_wait_ms=5)
+    results = {}
+
+    def request(value):
+        results[value] = batcher.predict(np.full((2, 3), value, dtype=float))
+
+    threads = [threading.Thread(target=request, args=(value,)) for value in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    for value, rows in results.items():
+        assert rows.shape == (2, 3)
+        assert np.all(rows == value * 2)
+    assert batcher.get_stats()["total_requests"] == 20
+
+
+def test_submit_racing_close_never_leaves_a_pending_future():
+    for _ in range(20):
+        batcher = MicroBatcher(double, max_batch_size=4, max_wait_ms=1)
+        futures = []
+        start = threading.Event()
+
+        def submitter():
+            start.wait()
+            for _ in range(50):
+                try:
+                    futures.append(batcher.submit(np.ones((1, 2))))
+                except RuntimeError:
+                    return
+
+        threads = [threading.Thread(target=submitter) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        batcher.close()
+        for thread in threads:
+            thread.join()
+
+        # Every accepted request is either scored or failed, none waits forever
+        for future in futures:
+            try:
+                assert np.all(future.result(timeout=1) == 2)
+            except RuntimeError as e:
+                assert str(e) == "MicroBatcher is closed"
+
+
+def test_submit_after_close_is_rejected():
+    batcher = MicroBatcher(double)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit(np.ones((1, 2)))
+
+
+def test_predict_times_out():
+    release = threading.Event()
+
+    def stuck(X):
+        release.wait()
+        return X
+
+    batcher = MicroBatcher(stuck, max_wait_ms=0, result_timeout_ms=50)
+    started_at = time.perf_counter()
+    with pytest.raises(ServiceUnavailableException):
+        batcher.predict(np.ones((1, 2)))
+    assert time.perf_counter() - started_at < 1.0
+    release.set()
+    batcher.close()
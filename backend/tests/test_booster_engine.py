@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from xgboost import XGBClassifier
+
+from mlcore import MLCore
+from mlcore.encoder import FeatureEncoder
+
+FEATURE_COLUMNS = [f"feature_{idx}" for idx in range(12)]
+
+
+def random_matrix(rows, seed):
+    generator = np.random.default_rng(seed)
+    X = generator.normal(size=(rows, len(FEATURE_COLUMNS)))
+    # Missing values go through the booster's default directions on both paths
+    X[generator.random(X.shape) < 0.1] = np.nan
+    return X
+
+
+def scoring_core(model, engine):
+    # Only the attributes the scoring path reads, no MLflow server involved
+    core = MLCore.__new__(MLCore)
+    core.model = model
+    core.booster = None
+    core.worker_pool = None
+    core.batcher = None
+    core.model_engine_nthread = 1
+    core.feature_encoder = FeatureEncoder(FEATURE_COLUMNS)
+    if engine == "booster":
+        core._set_booster()
+    return core
+
+
+@pytest.fixture(scope="module", params=[2, 3], ids=["binary", "multiclass"])
+def model(request):
+    X = random_matrix(400, seed=0)
+    y = np.digitize(np.nan_to_num(X[:, 0]) + np.nan_to_num(X[:, 1]), np.linspace(-1, 1, request.param - 1))
+    classifier = XGBClassifier(n_estimators=20, max_depth=3, n_jobs=1)
+    classifier.fit(X, y)
+    return classifier
+
+
+@pytest.mark.parametrize("rows", [1, 7, 256])
+def test_booster_engine_matches_predict_proba(model, rows):
+    X = random_matrix(rows, seed=rows)
+    expected = scoring_core(model, "sklearn").predict_proba(X)
+    probabilities = scoring_core(model, "booster").predict_proba(X)
+
+    assert probabilities.shape == expected.shape == (rows, len(model.classes_))
+    np.testing.assert_allclose(probabilities, expected, rtol=1e-6, atol=1e-7)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0, rtol=1e-6)
+
+
+def test_booster_engine_accepts_a_non_contiguous_matrix(model):
+    X = random_matrix(32, seed=1)
+    view = np.asfortranarray(X)[::2]
+    expected = scoring_core(model, "sklearn").predict_proba(np.ascontiguousarray(view))
+    np.testing.assert_allclose(scoring_core(model, "booster").predict_proba(view), expected, rtol=1e-6, atol=1e-7)
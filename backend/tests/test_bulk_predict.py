@@ -0,0 +1,96 @@
+import json
+import importlib
+
+import numpy as np
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from utils import CustomException
+
+# The package re-exports the class under the module's name, fetch the module itself
+bulk_predict_module = importlib.import_module("controller.ml.BulkPredictController")
+BulkPredictController = bulk_predict_module.BulkPredictController
+
+
+class ConstantModel:
+    """
+    Stand-in for a loaded MLCore, every record scores the same.
+    """
+
+    def get_model(self):
+        return True
+
+    def preprocess_records(self, records):
+        return np.zeros((len(records), 1))
+
+    def predict_proba(self, X):
+        return np.tile([0.9, 0.1], (len(X), 1))
+
+    def build_results(self, probabilities):
+        return [{"risk_level": "low", "proba_low": float(row[0])} for row in probabilities]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.exception_handler(CustomException)
+    async def handler(request, exc):
+        return JSONResponse(status_code=exc.status_code, content={"message": exc.message})
+
+    @app.post("/predict_bulk")
+    async def predict_bulk(request: Request):
+        return await BulkPredictController(request, ConstantModel()).execute()
+
+    return TestClient(app)
+
+
+def parse(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_ndjson_rows_are_scored_in_order_with_errors_in_place(client):
+    body = "\n".join([json.dumps({"age": 40}), "not json", json.dumps({"gender": "X"}), json.dumps({})]) + "\n"
+    rows = parse(client.post("/predict_bulk", content=body, headers={"content-type": "application/x-ndjson"}))
+
+    assert [row["record_index"] for row in rows] == [0, 1, 2, 3]
+    assert rows[0]["risk_level"] == "low"
+    assert rows[1]["error"].startswith("Invalid row")
+    assert rows[2]["error"].startswith("Invalid record")
+    assert rows[3]["risk_level"] == "low"
+
+
+def test_ndjson_bad_encoding_only_fails_its_line(client):
+    body = json.dumps({"age": 40}).encode() + b"\n{\"age\": \xff}\n" + json.dumps({"age": 50}).encode() + b"\n"
+    rows = parse(client.post("/predict_bulk", content=body, headers={"content-type": "application/x-ndjson"}))
+
+    assert "error" not in rows[0]
+    assert rows[1]["error"].startswith("Invalid row")
+    assert rows[2]["risk_level"] == "low"
+
+
+def test_csv_bad_encoding_ends_with_an_error_row(client):
+    body = b"age,bmi\n40,22\n" + b"\xff\xfe,1\n" * 3
+    rows = parse(client.post("/predict_bulk", content=body, headers={"content-type": "text/csv"}))
+
+    assert rows[-1]["error"].startswith("Invalid row")
+    assert "codec" in rows[-1]["error"]
+
+
+def test_upload_over_the_size_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(bulk_predict_module, "BULK_PREDICT_MAX_BYTES", 100)
+    body = (json.dumps({"age": 40}) + "\n") * 20
+    response = client.post("/predict_bulk", content=body, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 413
+
+
+def test_rows_over_the_row_limit_get_a_trailer(client, monkeypatch):
+    monkeypatch.setattr(bulk_predict_module, "BULK_PREDICT_MAX_ROWS", 5)
+    monkeypatch.setattr(bulk_predict_module, "BULK_PREDICT_CHUNK_SIZE", 2)
+    body = (json.dumps({"age": 40}) + "\n") * 8
+    rows = parse(client.post("/predict_bulk", content=body, headers={"content-type": "application/x-ndjson"}))
+
+    assert [row["record_index"] for row in rows] == [0, 1, 2, 3, 4, 5]
+    assert "Row limit of 5" in rows[-1]["error"]
@@ -0,0 +1,143 @@
+import os
+import uuid
+import random
+import threading
+
+import pytest
+from psycopg2 import extensions
+
+from utils import Database, ServiceUnavailableException
+from utils.database import ConnectionPool
+
+POOL_MAX = 4
+THREADS = 16
+TRANSACTIONS_PER_THREAD = 25
+
+
+def make_pool(minconn, maxconn, acquire_timeout_ms):
+    return ConnectionPool(
+        minconn,
+        maxconn,
+        acquire_timeout_ms,
+        user=os.getenv("POSTGRES_USER", "postgres"),
+        password=os.getenv("POSTGRES_PASSWORD", "postgres"),
+        host=os.getenv("POSTGRES_HOST"),
+        database=os.getenv("POSTGRES_DB", "test_db"),
+        port=int(os.getenv("POSTGRES_PORT", 5432)),
+    )
+
+
+@pytest.fixture
+def stress_pool(postgres):
+    # minconn == maxconn: psycopg2 closes returned connections above minconn, keeping them
+    # all open makes every server backend the pool ever used visible through pg_backend_pid
+    connection_pool = make_pool(POOL_MAX, POOL_MAX, 10000)
+    yield connection_pool
+    connection_pool.closeall()
+
+
+@pytest.fixture
+def stress_table(postgres):
+    table = f"pool_stress_{uuid.uuid4().hex[:8]}"
+    db = postgres()
+    db.execute_non_query(f"CREATE TABLE {table} (thread_id INT NOT NULL, seq INT NOT NULL, txid BIGINT NOT NULL)")
+    yield table
+    db.execute_non_query(f"DROP TABLE {table}")
+
+
+class RollbackRequested(Exception):
+    pass
+
+
+def test_threads_sharing_a_database_never_share_a_transaction(stress_pool, stress_table):
+    # One Database instance shared by every thread, like the controllers share their queries
+    db = Database(stress_pool)
+    lock = threading.Lock()
+    committed = {thread_id: [] for thread_id in range(THREADS)}
+    txids = []
+    backend_pids = set()
+    max_in_use = [0]
+    errors = []
+    start = threading.Barrier(THREADS)
+
+    def worker(thread_id):
+        generator = random.Random(thread_id)
+        try:
+            start.wait()
+            for seq in range(TRANSACTIONS_PER_THREAD):
+                rollback = generator.random() < 0.3
+                try:
+                    with db.transaction():
+                        txid, pid = db.execute_query("SELECT txid_current(), pg_backend_pid()")[0]
+                        db.execute_non_query(
+                            f"INSERT INTO {stress_table} (thread_id, seq, txid) VALUES (%s, %s, %s)", (thread_id, seq, txid)
+                        )
+                        with lock:
+                            max_in_use[0] = max(max_in_use[0], stress_pool.get_stats()["in_use"])
+                            txids.append(txid)
+                            backend_pids.add(pid)
+                        # Every statement of the block runs in this thread's transaction, on its connection
+                        assert db.execute_query("SELECT txid_current(), pg_backend_pid()")[0] == (txid, pid)
+                        # Only this thread's committed rows and its own pending insert are visible
+                        rows = db.execute_query(f"SELECT seq FROM {stress_table} WHERE thread_id = %s ORDER BY seq", (thread_id,))
+                        assert [row[0] for row in rows] == committed[thread_id] + [seq]
+                        if rollback:
+                            raise RollbackRequested()
+                    committed[thread_id].append(seq)
+                except RollbackRequested:
+                    pass
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(thread_id,)) for thread_id in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=120)
+
+    assert not errors, errors[:3]
+    assert len(txids) == THREADS * TRANSACTIONS_PER_THREAD
+    assert len(set(txids)) == len(txids)
+
+    # Pool bounds held under contention and every connection came back clean
+    stats = stress_pool.get_stats()
+    assert max_in_use[0] <= POOL_MAX
+    assert len(backend_pids) <= POOL_MAX
+    assert stats["in_use"] == 0 and stats["waiting"] == 0 and stats["timeouts"] == 0
+    assert stats["acquired"] >= THREADS * TRANSACTIONS_PER_THREAD
+    for connection in stress_pool.pool._pool:
+        assert connection.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE
+
+    rows = Database(stress_pool).execute_query(f"SELECT thread_id, seq FROM {stress_table}")
+    assert sorted(rows) == sorted((thread_id, seq) for thread_id, seqs in committed.items() for seq in seqs)
+
+
+def test_acquire_times_out_when_the_pool_is_exhausted(postgres):
+    connection_pool = make_pool(1, 2, 50)
+    try:
+        held = [connection_pool.getconn() for _ in range(2)]
+        outcome = []
+
+        def waiter():
+            try:
+                connection_pool.putconn(connection_pool.getconn())
+                outcome.append("acquired")
+            except ServiceUnavailableException:
+                outcome.append("timed out")
+
+        threads = [threading.Thread(target=waiter) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert outcome == ["timed out"] * 4
+        assert connection_pool.get_stats()["timeouts"] == 4
+        assert connection_pool.get_stats()["in_use"] == 2
+
+        for connection in held:
+            connection_pool.putconn(connection)
+        assert Database(connection_pool).execute_query("SELECT 1") == [(1,)]
+        assert connection_pool.get_stats()["in_use"] == 0
+    finally:
+        connection_pool.closeall()
@@ -0,0 +1,73 @@
+import random
+import typing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlcore import MLCore
+from mlcore.encoder import FeatureEncoder, CATEGORICAL_FEATURES
+from models import FeatureRecord
+
+
+def category_values(field):
+    return list(typing.get_args(FeatureRecord.model_fields[field].annotation))
+
+
+NUMERIC_FEATURES = [field for field in FeatureRecord.model_fields if field not in CATEGORICAL_FEATURES]
+
+# Like feature_columns.json: numeric columns and the one-hot columns seen during training.
+# race_other never occurred in the training data, gender_Unknown is never produced by a record
+FEATURE_COLUMNS = NUMERIC_FEATURES + [
+    f"{field}_{value}"
+    for field in CATEGORICAL_FEATURES
+    for value in category_values(field)
+    if (field, value) != ("race", "other")
+] + ["gender_Unknown"]
+
+
+def random_records(count, generator):
+    records = []
+    for _ in range(count):
+        values = {field: generator.choice(category_values(field)) for field in CATEGORICAL_FEATURES}
+        for field in NUMERIC_FEATURES:
+            # About one value in five is missing
+            values[field] = None if generator.random() < 0.2 else round(generator.uniform(0, 200), 3)
+        records.append(FeatureRecord(**values).model_dump())
+    return records
+
+
+def pandas_encode(records):
+    # The preprocessing used at training time
+    return MLCore.preprocess_for_inference(None, pd.DataFrame(records), FEATURE_COLUMNS).to_numpy(dtype=np.float64)
+
+
+@pytest.mark.parametrize("seed, count", [(0, 1), (1, 2), (2, 17), (3, 64), (4, 500)])
+def test_encoder_matches_the_pandas_path(seed, count):
+    records = random_records(count, random.Random(seed))
+    encoded = FeatureEncoder(FEATURE_COLUMNS).transform(records)
+
+    assert encoded.shape == (count, len(FEATURE_COLUMNS))
+    np.testing.assert_array_equal(encoded, pandas_encode(records))
+
+
+def test_encoder_matches_when_a_numeric_field_is_missing_everywhere():
+    records = random_records(8, random.Random(5))
+    for record in records:
+        record["bmi"] = None
+    np.testing.assert_array_equal(FeatureEncoder(FEATURE_COLUMNS).transform(records), pandas_encode(records))
+
+
+def test_unknown_category_is_dropped():
+    record = FeatureRecord(race="other").model_dump()
+    encoded = FeatureEncoder(FEATURE_COLUMNS).transform([record])
+    race_columns = [idx for idx, column in enumerate(FEATURE_COLUMNS) if column.startswith("race_")]
+    assert not encoded[0, race_columns].any()
+    np.testing.assert_array_equal(encoded, pandas_encode([record]))
+
+
+def test_float32_output():
+    records = random_records(4, random.Random(6))
+    encoded = FeatureEncoder(FEATURE_COLUMNS).transform(records, dtype=np.float32)
+    assert encoded.dtype == np.float32
+    np.testing.assert_allclose(encoded, pandas_encode(records), rtol=1e-6)
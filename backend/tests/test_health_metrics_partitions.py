@@ -0,0 +1,49 @@
+from datetime import date, datetime
+
+from queries import HealthMetricsPartitionQuery
+
+
+def months_until(month_start: date) -> int:
+    today = date.today()
+    return (month_start.year - today.year) * 12 + month_start.month - today.month
+
+
+def test_rows_in_default_partition_move_to_new_partition(postgres, make_patient):
+    db = postgres()
+    _, patient_id = make_patient()
+    # Far enough ahead that no partition exists yet, the reading lands in the default partition
+    month_start = date(date.today().year + 5, 6, 1)
+    partition = f"patient_health_metrics_{month_start:%Y_%m}"
+    db.execute_non_query(f"DROP TABLE IF EXISTS {partition}")
+    db.execute_non_query(
+        "INSERT INTO patient_health_metrics (patient_id, heart_rate, recorded_time) VALUES (%s, %s, %s)",
+        (patient_id, 71.0, datetime(month_start.year, month_start.month, 15, 8, 30)),
+    )
+    assert db.execute_query(
+        "SELECT COUNT(*) FROM patient_health_metrics_default WHERE patient_id = %s", (patient_id,)
+    )[0][0] == 1
+
+    created = HealthMetricsPartitionQuery().ensure_partitions(months_until(month_start))
+    assert created >= 1
+    assert db.execute_query(
+        "SELECT COUNT(*) FROM patient_health_metrics_default WHERE patient_id = %s", (patient_id,)
+    )[0][0] == 0
+    assert db.execute_query(f"SELECT heart_rate FROM {partition} WHERE patient_id = %s", (patient_id,)) == [(71.0,)]
+
+    # New readings for that month go straight to the partition, and a second run is a no-op
+    db.execute_non_query(
+        "INSERT INTO patient_health_metrics (patient_id, heart_rate, recorded_time) VALUES (%s, %s, %s)",
+        (patient_id, 72.0, datetime(month_start.year, month_start.month, 20)),
+    )
+    assert db.execute_query(f"SELECT COUNT(*) FROM {partition} WHERE patient_id = %s", (patient_id,))[0][0] == 2
+    assert HealthMetricsPartitionQuery().ensure_partitions(months_until(month_start)) == 0
+
+
+def test_partitions_exist_ahead_of_current_month(postgres):
+    HealthMetricsPartitionQuery().ensure_partitions(3)
+    db = postgres()
+    for offset in range(4):
+        month = date.today().replace(day=1)
+        year, month_index = divmod(month.month - 1 + offset, 12)
+        name = f"patient_health_metrics_{month.year + year}_{month_index + 1:02d}"
+        assert db.execute_query("SELECT to_regclass(%s) IS NOT NULL", (name,)) == [(True,)]
@@ -0,0 +1,140 @@
+import itertools
+
+import pytest
+
+from mlcore import MLCore, ModelRegistry
+import mlcore.registry as registry_module
+
+
+class StubMLCore:
+    """
+    Stand-in for MLCore: the version comes from the URI, the warm-up outcome from settled.
+    """
+    settled = True
+
+    def __init__(self, model_uri):
+        self.model_uri = model_uri
+        self.closed = False
+
+    def load_model(self):
+        pass
+
+    def load_artifacts(self):
+        pass
+
+    def warm_up(self, *args):
+        return {"iterations": 40, "p99_ms": 1.5, "settled": self.settled}
+
+    def get_model_metadata(self):
+        return {"model_name": "ehr_xgb_model", "model_version": self.model_uri.rsplit("/", 1)[-1]}
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(registry_module, "MLCore", StubMLCore)
+    monkeypatch.setattr(StubMLCore, "settled", True)
+    model_registry = ModelRegistry()
+    yield model_registry
+    model_registry.close()
+
+
+def test_ready_once_the_warm_up_settled(registry):
+    assert not registry.is_ready()
+    registry.load("models:/ehr_xgb_model/1", background=False)
+
+    assert registry.is_ready()
+    readiness = registry.get_readiness()
+    assert readiness["active_model"] == "ehr_xgb_model/1"
+    assert readiness["warmup"]["settled"] is True
+
+
+def test_not_ready_while_the_warm_up_is_unsettled(registry):
+    StubMLCore.settled = False
+    registry.load("models:/ehr_xgb_model/1", background=False)
+
+    assert registry.get_active() is not None
+    assert not registry.is_ready()
+
+
+class TimedModel:
+    """
+    Gives warm_up a latency sequence instead of running a model.
+    """
+
+    def __init__(self, latencies):
+        self._latencies = iter(latencies)
+        self.clock = 0.0
+
+    def preprocess_records(self, records):
+        return records
+
+    def predict_proba(self, X):
+        self.clock += next(self._latencies)
+
+    def build_results(self, probabilities):
+        return []
+
+
+def run_warm_up(monkeypatch, latencies, **kwargs):
+    model = TimedModel(latencies)
+    monkeypatch.setattr("mlcore.mlcore.time.perf_counter", lambda: model.clock)
+    return MLCore.warm_up(model, **kwargs)
+
+
+def test_warm_up_stops_once_p99_is_stable(monkeypatch):
+    # Cold first window, then stable latencies
+    latencies = itertools.chain([0.5] * 10, itertools.repeat(0.001))
+    stats = run_warm_up(monkeypatch, latencies, batch_size=1, max_iterations=1000, window=10, p99_tolerance=0.2)
+
+    assert stats["settled"] is True
+    assert stats["iterations"] == 30
+    assert stats["p99_ms"] == pytest.approx(1.0)
+
+
+def test_warm_up_iterations_are_an_upper_bound(monkeypatch):
+    # Every window is twice as slow as the one before, the p99 never settles
+    latencies = (0.001 * 2 ** (i // 10) for i in itertools.count())
+    stats = run_warm_up(monkeypatch, latencies, batch_size=1, max_iterations=50, window=10, p99_tolerance=0.2)
+
+    assert stats["settled"] is False
+    assert stats["iterations"] == 50
+
+
+def test_rollback_can_roll_forward_again(registry):
+    registry.load("models:/ehr_xgb_model/1", background=False)
+    registry.load("models:/ehr_xgb_model/2", background=False)
+
+    assert registry.rollback() == "ehr_xgb_model/1"
+    assert registry.list_versions()["rollback_model"] == "ehr_xgb_model/2"
+    assert registry.rollback() == "ehr_xgb_model/2"
+    assert registry.get_readiness()["active_model"] == "ehr_xgb_model/2"
+
+
+@pytest.mark.parametrize("endpoint", [
+    "initialize_model", "load_model_version", "activate_model_version", "rollback_model_version",
+])
+def test_model_admin_endpoints_require_the_admin_role(fake_redis, endpoint):
+    from fastapi.testclient import TestClient
+    from main import app, API_VERSION
+    from utils import sign_token
+
+    client = TestClient(app)
+    path = f"/ml/{API_VERSION}/{endpoint}"
+    assert client.post(path).status_code == 401
+
+    patient_token = sign_token({"account_id": 1, "email": "patient@example.com", "role": "patient"})
+    assert client.post(path, headers={"Authorization": patient_token}).status_code == 401
+
+
+def test_model_admin_role_passes_auth(fake_redis):
+    from fastapi.testclient import TestClient
+    from main import app, API_VERSION
+    from utils import sign_token
+
+    doctor_token = sign_token({"account_id": 1, "email": "doctor@example.com", "role": "doctor"})
+    response = TestClient(app).post(f"/ml/{API_VERSION}/rollback_model_version", headers={"Authorization": doctor_token})
+    # Authorized, then rejected by the registry: nothing to roll back to
+    assert response.status_code == 400
@@ -0,0 +1,72 @@
+import os
+import asyncio
+import importlib
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+import pytest
+from fastapi import BackgroundTasks
+
+from models import LoginModel
+from utils import AsyncDatabase, Database, PasswordHasher
+
+# The package re-exports the class under the module's name, fetch the module itself
+login_module = importlib.import_module("controller.auth.LoginController")
+
+
+@pytest.fixture
+def hasher():
+    password_hasher = PasswordHasher(pool_size=1, queue_depth=4, rounds=5)
+    yield password_hasher
+    password_hasher.close()
+
+
+def test_broken_pool_is_shut_down_and_replaced(hasher):
+    async def scenario():
+        with pytest.raises(BrokenProcessPool):
+            # The worker process exits while running the call
+            await hasher._run(os._exit, 1)
+        return await hasher.hash("Secret123")
+
+    broken = hasher._get_executor()
+    password_hash = asyncio.run(scenario())
+
+    assert broken._shutdown_thread
+    assert hasher._executor is not broken
+    assert bcrypt.checkpw(b"Secret123", password_hash.encode("utf-8"))
+
+
+def test_login_rehashes_after_the_response(postgres, hasher, monkeypatch):
+    monkeypatch.setattr(login_module, "password_hasher", hasher)
+    monkeypatch.setattr(login_module, "LOGIN_AUDIT_BUFFER_ENABLED", False)
+    email = f"rehash-{uuid.uuid4().hex}@example.com"
+    old_hash = bcrypt.hashpw(b"Secret123", bcrypt.gensalt(rounds=4)).decode("utf-8")
+    db = Database()
+    with db.transaction():
+        account_id = db.execute_query(
+            "INSERT INTO accounts (fullname, email, password_hash) VALUES (%s, %s, %s) RETURNING account_id",
+            ("Rehash Patient", email, old_hash),
+        )[0][0]
+        db.execute_non_query("INSERT INTO patients (account_id) VALUES (%s)", (account_id,))
+
+    def stored_hash():
+        return db.execute_query("SELECT password_hash FROM accounts WHERE account_id = %s", (account_id,))[0][0]
+
+    async def scenario():
+        try:
+            background_tasks = BackgroundTasks()
+            payload = LoginModel(email=email, password="Secret123", role="patient")
+            response = await login_module.LoginController(payload, "127.0.0.1", "test", background_tasks).execute()
+            assert response["access_token"]
+            # Answered with the old hash still stored, the upgrade is queued
+            assert stored_hash() == old_hash
+            assert len(background_tasks.tasks) == 1
+            await background_tasks()
+        finally:
+            await AsyncDatabase.close_shared_pool()
+
+    asyncio.run(scenario())
+    new_hash = stored_hash()
+    assert new_hash.startswith("$2b$05$")
+    assert bcrypt.checkpw(b"Secret123", new_hash.encode("utf-8"))
@@ -0,0 +1,32 @@
+import time
+
+import numpy as np
+
+from mlcore.prediction_cache import PredictionCache
+
+
+def test_rows_are_shared_through_redis(fake_redis):
+    writer = PredictionCache("model/1/run", max_size=8)
+    keys = writer.make_keys(np.array([[1.0, 2.0], [3.0, 4.0]]))
+    writer.set_many({keys[0]: [0.2, 0.8], keys[1]: [0.6, 0.4]})
+
+    # Another worker process starts with an empty local tier
+    reader = PredictionCache("model/1/run", max_size=8)
+    assert reader.get_many(keys) == [[0.2, 0.8], [0.6, 0.4]]
+    assert reader.get_stats()["redis_hits"] == 2
+
+
+def test_redis_backing_off_at_load_does_not_disable_the_tier(fake_redis):
+    fake_redis._failures = 1
+    fake_redis._unavailable_until = time.monotonic() + 60
+
+    cache = PredictionCache("model/1/run", max_size=8)
+    keys = cache.make_keys(np.array([[1.0, 2.0]]))
+    # Served by the local tier alone while Redis is backing off
+    cache.set_many({keys[0]: [0.3, 0.7]})
+    assert cache.get_many(keys) == [[0.3, 0.7]]
+    assert cache.get_stats()["redis_enabled"]
+
+    fake_redis._unavailable_until = 0.0
+    cache.set_many({keys[0]: [0.3, 0.7]})
+    assert PredictionCache("model/1/run", max_size=8).get_many(keys) == [[0.3, 0.7]]
@@ -0,0 +1,222 @@
+"""
+Plans of the hot queries of the queries package on a seeded database.
+
+Every query is captured while the real query method runs, then explained with
+EXPLAIN (FORMAT JSON). A query passes when its plan uses the expected indexes and
+does not sequentially scan any table holding more than SEQ_SCAN_ROW_LIMIT rows.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from queries import (
+    LoginQuery,
+    LogoutQuery,
+    GetNewAccessTokenQuery,
+    CreatePatientAccountQuery,
+    CreateDoctorAccountQuery,
+    GetPatientInfoQuery,
+    GetVitalsTrendQuery,
+    UpdatePatientInfoQuery,
+)
+from utils import Database, AsyncDatabase
+
+SEED_ACCOUNTS = 50000
+SEED_METRICS = 100000
+SEQ_SCAN_ROW_LIMIT = 1000
+SEED_EMAILS = "plan-seed-%"
+
+
+@pytest.fixture(scope="module")
+def seeded(postgres):
+    """
+    Seed realistic volumes once per run: patients and doctors on separate accounts,
+    refresh tokens for several devices per account, login logs and readings spread over the last 60 days.
+    """
+    db = Database()
+    if db.execute_query("SELECT COUNT(*) FROM accounts WHERE email LIKE %s", (SEED_EMAILS,))[0][0] < SEED_ACCOUNTS:
+        with db.transaction():
+            db.execute_non_query("""
+                INSERT INTO accounts (fullname, email, password_hash)
+                SELECT 'Seed ' || n, 'plan-seed-' || n || '@example.com', 'not-a-hash'
+                FROM generate_series(1, %s) AS n
+            """, (SEED_ACCOUNTS,))
+            db.execute_non_query("""
+                INSERT INTO patients (account_id)
+                SELECT account_id FROM accounts WHERE email LIKE %s AND mod(account_id, 5) <> 0
+            """, (SEED_EMAILS,))
+            db.execute_non_query("""
+                INSERT INTO doctors (account_id, medical_license_number)
+                SELECT account_id, 'PLAN-' || account_id FROM accounts
+                WHERE email LIKE %s AND mod(account_id, 5) = 0
+            """, (SEED_EMAILS,))
+            db.execute_non_query("""
+                INSERT INTO refresh_tokens (token_hash, account_id, role, expires_time)
+                SELECT md5(account_id || '-' || device) || md5('refresh' || account_id || '-' || device),
+                    account_id, 'patient', CURRENT_TIMESTAMP + INTERVAL '30 days'
+                FROM accounts, generate_series(1, 3) AS device
+                WHERE email LIKE %s
+            """, (SEED_EMAILS,))
+            db.execute_non_query("""
+                INSERT INTO login_logs (account_id, ip_address, user_agent)
+                SELECT account_id, '127.0.0.1', 'seed' FROM accounts WHERE email LIKE %s
+            """, (SEED_EMAILS,))
+            db.execute_non_query("""
+                INSERT INTO patient_health_metrics (patient_id, heart_rate, glucose, recorded_time)
+                SELECT patient_id, 60 + random() * 40, 70 + random() * 30,
+                    CURRENT_TIMESTAMP - random() * INTERVAL '60 days'
+                FROM patients, generate_series(1, %s / (SELECT COUNT(*) FROM patients) + 1)
+                LIMIT %s
+            """, (SEED_METRICS, SEED_METRICS))
+    for table in ["accounts", "patients", "doctors", "refresh_tokens", "login_logs",
+                  "patient_health_metrics", "patient_latest_metrics"]:
+        db.execute_non_query(f"ANALYZE {table}")
+
+    patient = db.execute_query("""
+        SELECT accounts.account_id, accounts.email FROM accounts
+        JOIN patients ON patients.account_id = accounts.account_id
+        WHERE accounts.email LIKE %s ORDER BY accounts.account_id LIMIT 1
+    """, (SEED_EMAILS,))[0]
+    doctor = db.execute_query("""
+        SELECT doctors.account_id, doctors.medical_license_number FROM doctors
+        WHERE medical_license_number LIKE %s ORDER BY doctors.account_id LIMIT 1
+    """, ("PLAN-%",))[0]
+    return {"patient_account_id": patient[0], "patient_email": patient[1],
+            "doctor_account_id": doctor[0], "license": doctor[1]}
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """
+    Record every statement sent by the sync and async data layers, still running it.
+    """
+    statements = []
+    sync_execute = Database._execute
+    async_query = AsyncDatabase.execute_query
+    async_non_query = AsyncDatabase.execute_non_query
+
+    def record_sync(self, query, params, fetch):
+        statements.append((query, params))
+        return sync_execute(self, query, params, fetch)
+
+    async def record_query(self, query, params=None):
+        statements.append((query, params))
+        return await async_query(self, query, params)
+
+    async def record_non_query(self, query, params=None):
+        statements.append((query, params))
+        return await async_non_query(self, query, params)
+
+    monkeypatch.setattr(Database, "_execute", record_sync)
+    monkeypatch.setattr(AsyncDatabase, "execute_query", record_query)
+    monkeypatch.setattr(AsyncDatabase, "execute_non_query", record_non_query)
+    return statements
+
+
+def run_async(coroutine_function):
+    async def runner():
+        try:
+            return await coroutine_function()
+        finally:
+            await AsyncDatabase.close_shared_pool()
+    return asyncio.run(runner())
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(query, params):
+    """
+    :return: (root index names used, relations sequentially scanned with their row estimate)
+    """
+    db = Database()
+    plan = db.execute_query("EXPLAIN (FORMAT JSON) " + query, params)[0][0]
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+    indexes = set()
+    seq_scans = []
+    for node in plan_nodes(plan[0]["Plan"]):
+        if node.get("Index Name"):
+            # Indexes of partitions are reported by name, map them to the partitioned index
+            root = db.execute_query(
+                "SELECT COALESCE(pg_partition_root(%s::regclass), %s::regclass)::text",
+                (node["Index Name"], node["Index Name"]),
+            )[0][0]
+            indexes.add(root)
+        if node["Node Type"] == "Seq Scan":
+            rows = db.execute_query("SELECT reltuples FROM pg_class WHERE relname = %s", (node["Relation Name"],))[0][0]
+            seq_scans.append((node["Relation Name"], rows))
+    return indexes, seq_scans
+
+
+HOT_QUERIES = {
+    "login account by email": (
+        lambda s: run_async(lambda: LoginQuery().get_account_by_email(s["patient_email"])),
+        {"accounts_email_key"},
+    ),
+    "login patient by account": (
+        lambda s: run_async(lambda: LoginQuery().get_patient_by_account_id(s["patient_account_id"])),
+        {"idx_patients_account_id"},
+    ),
+    "login doctor by account": (
+        lambda s: run_async(lambda: LoginQuery().get_doctor_by_account_id(s["doctor_account_id"])),
+        {"idx_doctors_account_id"},
+    ),
+    "login rehash password": (
+        lambda s: run_async(lambda: LoginQuery().update_password_hash(s["patient_account_id"], "not-a-hash")),
+        {"accounts_pkey"},
+    ),
+    "signup email check": (
+        lambda s: CreatePatientAccountQuery().check_email_exists(s["patient_email"]),
+        {"accounts_email_key"},
+    ),
+    "signup license check": (
+        lambda s: CreateDoctorAccountQuery().check_medical_license_exists(s["license"]),
+        {"doctors_medical_license_number_key"},
+    ),
+    "refresh token rotation": (
+        lambda s: GetNewAccessTokenQuery().rotate_refresh_token("0" * 64, "patient", "1" * 64, 60),
+        {"uq_refresh_tokens_hash"},
+    ),
+    "logout revoke refresh token": (
+        lambda s: LogoutQuery().revoke_refresh_token(s["patient_account_id"], "0" * 64),
+        {"uq_refresh_tokens_hash"},
+    ),
+    "patient info": (
+        lambda s: run_async(lambda: GetPatientInfoQuery().get_patient_info(s["patient_account_id"])),
+        {"accounts_pkey", "idx_patients_account_id", "patient_latest_metrics_pkey"},
+    ),
+    "vitals trend": (
+        lambda s: GetVitalsTrendQuery().get_vitals_trend(
+            s["patient_account_id"], datetime.utcnow() - timedelta(days=30), datetime.utcnow(), 50
+        ),
+        {"idx_patients_account_id", "idx_health_metrics_patient_time"},
+    ),
+    "patient update": (
+        lambda s: UpdatePatientInfoQuery().update_patient(
+            s["patient_account_id"], {"bio": "seed"}, {"allergies": "none"}, {"heart_rate": 70.0}
+        ),
+        {"idx_patients_account_id", "accounts_pkey", "patients_pkey", "patient_latest_metrics_pkey"},
+    ),
+}
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_index(seeded, captured, name):
+    run, expected_indexes = HOT_QUERIES[name]
+    run(seeded)
+    # Snapshot first, the EXPLAIN statements below go through the same recorder
+    statements = list(captured)
+    assert statements, f"{name} sent no statement"
+
+    used_indexes = set()
+    for query, params in statements:
+        indexes, seq_scans = explain(query, params)
+        used_indexes |= indexes
+        large_scans = [(relation, rows) for relation, rows in seq_scans if rows > SEQ_SCAN_ROW_LIMIT]
+        assert not large_scans, f"{name} sequentially scans {large_scans}"
+    assert expected_indexes <= used_indexes, f"{name} uses {sorted(used_indexes)}, expected {sorted(expected_indexes)}"
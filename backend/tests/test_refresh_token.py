@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from controller import GetNewAccessTokenController
+from utils import Database, InvalidDataException, sign_token, generate_refresh_token, hash_refresh_token
+
+
+@pytest.fixture
+def refresh_token(make_patient):
+    account_id, _ = make_patient()
+    token = generate_refresh_token()
+    Database().execute_non_query(
+        """
+        INSERT INTO refresh_tokens (token_hash, account_id, role, expires_time)
+        VALUES (%s, %s, 'patient', CURRENT_TIMESTAMP + INTERVAL '1 day')
+        """,
+        (hash_refresh_token(token), account_id),
+    )
+    return account_id, token
+
+
+def test_refresh_rotates_the_token(fake_redis, refresh_token):
+    account_id, token = refresh_token
+    access_token = sign_token({"account_id": account_id, "email": "patient@example.com", "role": "patient"})
+
+    response = GetNewAccessTokenController(token, access_token, "patient").execute()
+    assert response["new_access_token"]
+    assert response["refresh_token"] != token
+
+    # The presented refresh token is single use
+    with pytest.raises(InvalidDataException):
+        GetNewAccessTokenController(token, None, "patient").execute()
+
+
+def test_refresh_survives_a_redis_failure(fake_redis, refresh_token):
+    account_id, token = refresh_token
+    access_token = sign_token({"account_id": account_id, "email": "patient@example.com", "role": "patient"})
+    fake_redis._unavailable_until = time.monotonic() + 60
+
+    # The rotation is committed, the client must get its new tokens even if revoking fails
+    response = GetNewAccessTokenController(token, access_token, "patient").execute()
+    assert response["new_access_token"]
+    assert response["refresh_token"] != token
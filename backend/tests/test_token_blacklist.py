@@ -0,0 +1,68 @@
+import time
+import random
+import string
+
+import pytest
+
+from utils.token_blacklist import BloomFilter, TokenBlacklist
+
+
+def random_entry(length=16):
+    return "".join(random.choices(string.ascii_letters + string.digits, k=length))
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_bloom_filter_has_no_false_negative_and_bounded_false_positives():
+    bloom_filter = BloomFilter(capacity=10000, error_rate=0.01)
+    added = {random_entry() for _ in range(10000)}
+    for entry in added:
+        bloom_filter.add(entry)
+
+    assert all(bloom_filter.might_contain(entry) for entry in added)
+
+    probes = [entry for entry in (random_entry() for _ in range(100000)) if entry not in added]
+    false_positives = sum(bloom_filter.might_contain(entry) for entry in probes)
+    assert false_positives / len(probes) < 0.02
+
+
+def test_contains_fails_closed_when_redis_is_down(fake_redis):
+    blacklist = TokenBlacklist(capacity=1000)
+    assert blacklist.contains("never-revoked") is False
+
+    # Redis backing off after a connection error: Cache() itself raises
+    fake_redis._unavailable_until = time.monotonic() + 60
+    assert blacklist.contains("never-revoked") is True
+    assert blacklist.get_stats()["redis_errors"] == 1
+
+
+def test_revocations_converge_between_instances(fake_redis):
+    first = TokenBlacklist(capacity=1000, rebuild_seconds=3600)
+    second = TokenBlacklist(capacity=1000, rebuild_seconds=3600)
+    first.add("revoked-before-start", 60)
+    first.start()
+    second.start()
+    try:
+        assert wait_until(lambda: first.get_stats()["synced"] and second.get_stats()["synced"])
+        # Loaded from the SCAN on start
+        assert second._filter.might_contain("revoked-before-start")
+
+        entries_before = first.get_stats()["entries"]
+        first.add("revoked-after-start", 60)
+        assert wait_until(lambda: second._filter.might_contain("revoked-after-start"))
+        assert second.contains("revoked-after-start") is True
+        assert second.contains("never-revoked") is False
+
+        # The publisher skips its own event instead of adding the entry twice
+        time.sleep(0.2)
+        assert first.get_stats()["entries"] == entries_before + 1
+    finally:
+        first.stop()
+        second.stop()
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app, API_VERSION
+from utils import Database, sign_token
+
+
+@pytest.fixture
+def patient_client(fake_redis, make_patient):
+    account_id, patient_id = make_patient()
+    token = sign_token({"account_id": account_id, "email": "patient@example.com", "role": "patient", "patient_id": patient_id})
+    client = TestClient(app)
+    client.headers["Authorization"] = token
+    return client, patient_id
+
+
+def test_updated_vitals_round_trip_through_the_trend(patient_client):
+    client, patient_id = patient_client
+    base = f"/api/{API_VERSION}/patient"
+
+    response = client.post(f"{base}/update_patient_info", json={"heart_rate": 72.0, "pain_severity": 3.0, "age": 41.0})
+    assert response.status_code == 200
+
+    # Stored as UTC: the reading falls inside a window ending now
+    recorded_time = Database().execute_query(
+        "SELECT recorded_time FROM patient_health_metrics WHERE patient_id = %s", (patient_id,)
+    )[0][0]
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert abs(recorded_time - now) < timedelta(minutes=1)
+
+    start_time = (now - timedelta(hours=1)).isoformat()
+    response = client.get(f"{base}/get_vitals_trend", params={"start_time": start_time, "buckets": 4})
+    assert response.status_code == 200
+    trend = response.json()["data"]
+
+    assert trend["readings"] == 1
+    assert trend["buckets"] == 4
+    for field, value in [("heart_rate", 72.0), ("pain_severity", 3.0), ("age", 41.0)]:
+        assert len(trend["vitals"][field]) == 1
+        assert trend["vitals"][field][0]["avg"] == value
+
+
+def test_trend_rejects_an_empty_window(patient_client):
+    client, _ = patient_client
+    now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+    response = client.get(
+        f"/api/{API_VERSION}/patient/get_vitals_trend", params={"start_time": now, "end_time": now}
+    )
+    assert response.status_code == 400
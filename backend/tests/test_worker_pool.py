@@ -0,0 +1,117 @@
+import asyncio
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+import mlcore.worker_pool as worker_pool_module
+from mlcore.worker_pool import InferencePool
+from utils import ServiceUnavailableException
+
+
+class FakeExecutor:
+    """
+    In-process stand-in for the ProcessPoolExecutor. mode is "ok" (doubles the input),
+    "crash" (the worker dies while scoring), "broken" (submit fails) or "hang".
+    """
+
+    def __init__(self, mode="ok"):
+        self.mode = mode
+        self.shutdown_calls = []
+
+    def submit(self, fn, *args):
+        if self.mode == "broken":
+            raise BrokenProcessPool("A child process terminated abruptly")
+        future = Future()
+        if self.mode == "ok":
+            future.set_result(args[0] * 2 if args else os.getpid())
+        elif self.mode == "crash":
+            future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_calls.append({"wait": wait, "cancel_futures": cancel_futures})
+
+
+class FakeInferencePool(InferencePool):
+    def __init__(self, *modes, **kwargs):
+        self.executors = [FakeExecutor(mode) for mode in modes]
+        self.created = []
+        super().__init__("models:/ehr_xgb_model/1", pool_size=1, queue_depth=2, queue_timeout_ms=10, **kwargs)
+
+    def _create_executor(self):
+        executor = self.executors.pop(0) if self.executors else FakeExecutor()
+        self.created.append(executor)
+        return executor
+
+
+def test_predict_async_awaits_the_worker_result():
+    pool = FakeInferencePool("ok")
+    result = asyncio.run(pool.predict_async(np.ones((2, 3))))
+    assert np.all(result == 2)
+    assert pool.get_stats()["in_flight"] == 0
+
+
+def test_crashed_worker_replaces_the_executor():
+    pool = FakeInferencePool("crash", "ok")
+    crashed = pool.executor
+
+    with pytest.raises(ServiceUnavailableException):
+        pool.predict(np.ones((1, 3)))
+
+    assert crashed.shutdown_calls == [{"wait": False, "cancel_futures": True}]
+    assert pool.executor is not crashed
+    assert pool.get_stats()["restarts"] == 1
+    # The slot was released and the fresh executor serves the next request
+    assert np.all(pool.predict(np.ones((1, 3))) == 2)
+    assert asyncio.run(pool.predict_async(np.ones((1, 3)))).shape == (1, 3)
+
+
+def test_crash_seen_by_concurrent_requests_restarts_once():
+    pool = FakeInferencePool("crash", "ok")
+    futures = [pool.submit(np.ones((1, 3))) for _ in range(2)]
+    for future in futures:
+        assert isinstance(future.exception(), BrokenProcessPool)
+        assert isinstance(pool._worker_crashed(future), ServiceUnavailableException)
+    assert pool.get_stats()["restarts"] == 1
+    assert len(pool.created) == 2
+
+
+def test_broken_executor_on_submit_is_replaced_and_retried():
+    pool = FakeInferencePool("broken", "ok")
+    assert np.all(pool.predict(np.ones((1, 3))) == 2)
+    assert pool.get_stats()["restarts"] == 1
+
+
+def test_start_gives_up_at_the_deadline():
+    pool = FakeInferencePool("hang")
+    with pytest.raises(ServiceUnavailableException):
+        pool.start(timeout=0.1)
+
+
+def test_worker_disables_the_prediction_cache(monkeypatch):
+    loaded = []
+
+    class StubMLCore:
+        def __init__(self, model_uri):
+            loaded.append(os.environ["PREDICTION_CACHE_ENABLED"])
+
+        def load_model(self):
+            pass
+
+        def load_artifacts(self):
+            pass
+
+        def warm_up(self):
+            pass
+
+    for name in ["INFERENCE_BACKEND", "PRED_BATCHING_ENABLED", "PREDICTION_CACHE_ENABLED", "MODEL_ENGINE_NTHREAD", "OMP_NUM_THREADS"]:
+        monkeypatch.setenv(name, os.environ.get(name, ""))
+    monkeypatch.setenv("PREDICTION_CACHE_ENABLED", "true")
+    monkeypatch.setattr("mlcore.mlcore.MLCore", StubMLCore)
+    monkeypatch.setattr(worker_pool_module, "_worker_ml_core", None)
+
+    worker_pool_module._init_worker("models:/ehr_xgb_model/1", 1)
+    assert loaded == ["false"]
@@ -1,9 +1,13 @@
 from .database import Database
+from .async_database import AsyncDatabase
+from .audit_buffer import LoginAuditBuffer, login_audit_buffer, LOGIN_AUDIT_BUFFER_ENABLED
 from .minio import Minio
 from .cache import Cache
+from .password_hasher import PasswordHasher, password_hasher
+from .token_blacklist import TokenBlacklist, token_blacklist, TOKEN_BLACKLIST_FILTER_ENABLED
 from .custom_exception import *
 from .response_model import StandardResponse
 from .standard_response import standard_response
 from .logger import logger
-from .middleware import login_required, patient_login_required, doctor_login_required
-from .token import sign_token, verify_token
\ No newline at end of file
+from .middleware import auth_required, login_required, patient_login_required, doctor_login_required, model_admin_required
+from .token import sign_token, verify_token, revoke_token, generate_refresh_token, hash_refresh_token, REFRESH_TOKEN_EXPIRATION_TIME
\ No newline at end of file
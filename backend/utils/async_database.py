@@ -0,0 +1,178 @@
+import os
+import re
+import itertools
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+import asyncpg
+
+from .logger import logger
+from .custom_exception import ServiceUnavailableException
+
+ACQUIRE_TIMEOUT = float(os.getenv("POSTGRES_POOL_ACQUIRE_TIMEOUT_MS", 5000)) / 1000.0
+
+# Connection of the transaction() block open in the current task
+_current_connection = ContextVar("async_database_connection", default=None)
+
+
+@lru_cache(maxsize=1024)
+def _translate_placeholders(query: str) -> str:
+    """
+    Rewrite psycopg2 style %s placeholders to asyncpg's $1, $2, ... so query classes
+    can share SQL between both layers.
+    """
+    counter = itertools.count(1)
+    return re.sub(r"%%|%s", lambda match: "%" if match.group(0) == "%%" else f"${next(counter)}", query)
+
+
+def _affected_rows(status: str) -> int:
+    # asyncpg returns the command tag, e.g. "INSERT 0 1" or "UPDATE 3"
+    last = status.rsplit(" ", 1)[-1] if status else ""
+    return int(last) if last.isdigit() else 0
+
+
+class AsyncDatabase:
+    """
+    asyncio counterpart of Database backed by an asyncpg pool.
+
+    Every connection keeps a cache of prepared statements, so repeated queries skip
+    parsing and planning on the server.
+    """
+
+    # Process-wide pool, created by init_pool at startup or on first use
+    _shared_pool = None
+    _shared_pool_lock = None
+
+    def __init__(self, connection_pool: asyncpg.Pool = None):
+        self.pool = connection_pool
+
+    @classmethod
+    async def init_pool(cls) -> asyncpg.Pool:
+        """
+        Create the shared asyncpg pool if it does not exist yet.
+        :return: The shared asyncpg pool.
+        """
+        if cls._shared_pool_lock is None:
+            cls._shared_pool_lock = asyncio.Lock()
+        async with cls._shared_pool_lock:
+            if cls._shared_pool:
+                return cls._shared_pool
+            try:
+                cls._shared_pool = await asyncpg.create_pool(
+                    user=os.getenv("POSTGRES_USER", "postgres"),
+                    password=os.getenv("POSTGRES_PASSWORD", "postgres"),
+                    host=os.getenv("POSTGRES_HOST", "database"),
+                    database=os.getenv("POSTGRES_DB", "test_db"),
+                    port=int(os.getenv("POSTGRES_PORT", 5432)),
+                    min_size=int(os.getenv("POSTGRES_ASYNC_POOL_MIN", 1)),
+                    max_size=int(os.getenv("POSTGRES_ASYNC_POOL_MAX", 10)),
+                    statement_cache_size=int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", 100)),
+                )
+                logger.info("PostgreSQL async connection pool created successfully.")
+            except Exception as err:
+                logger.error(f"Error creating PostgreSQL async connection pool: {err}")
+                raise Exception("Failed to create async connection pool")
+            return cls._shared_pool
+
+    @classmethod
+    async def close_shared_pool(cls):
+        """
+        Close the shared pool, called once on application shutdown.
+        """
+        if cls._shared_pool:
+            await cls._shared_pool.close()
+            cls._shared_pool = None
+            logger.info("PostgreSQL async connection pool closed successfully.")
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        if not self.pool:
+            self.pool = AsyncDatabase._shared_pool or await AsyncDatabase.init_pool()
+        return self.pool
+
+    @asynccontextmanager
+    async def _acquire(self):
+        pool = await self._get_pool()
+        try:
+            connection = await pool.acquire(timeout=ACQUIRE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out after {ACQUIRE_TIMEOUT * 1000:.0f} ms waiting for a database connection")
+            raise ServiceUnavailableException("Database is busy, please retry later")
+        try:
+            yield connection
+        finally:
+            await pool.release(connection)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run every statement of the block in a single transaction on one connection.
+        Queries awaited in the same task inside the block join the transaction, and
+        nested blocks join the outermost one.
+        """
+        current = _current_connection.get()
+        if current is not None:
+            yield current
+            return
+
+        async with self._acquire() as connection:
+            async with connection.transaction():
+                token = _current_connection.set(connection)
+                try:
+                    yield connection
+                finally:
+                    _current_connection.reset(token)
+
+    @asynccontextmanager
+    async def _connection(self):
+        current = _current_connection.get()
+        if current is not None:
+            yield current
+            return
+        async with self._acquire() as connection:
+            yield connection
+
+    async def execute_query(self, query, params=None):
+        """
+        Execute a SELECT query using a connection from the pool.
+        :param query: SQL query with %s placeholders.
+        :param params: Parameters for the query (optional).
+        :return: Query result as a list of tuples.
+        """
+        try:
+            async with self._connection() as connection:
+                records = await connection.fetch(_translate_placeholders(query), *(params or ()))
+            return [tuple(record) for record in records]
+        except Exception as err:
+            logger.error(f"Query execution error: {err}")
+            raise
+
+    async def execute_non_query(self, query, params=None):
+        """
+        Execute an INSERT/UPDATE/DELETE query.
+        Returns number of affected rows.
+        """
+        try:
+            async with self._connection() as connection:
+                status = await connection.execute(_translate_placeholders(query), *(params or ()))
+            return _affected_rows(status)
+        except Exception as err:
+            logger.error(f"Non-query execution error: {err}")
+            raise
+
+    async def copy_records(self, table, columns, records):
+        """
+        Bulk insert rows with COPY.
+        :param table: Target table.
+        :param columns: Column names, in the order of the values in each record.
+        :param records: List of tuples.
+        :return: Number of inserted rows.
+        """
+        try:
+            async with self._connection() as connection:
+                status = await connection.copy_records_to_table(table, columns=columns, records=records)
+            return _affected_rows(status)
+        except Exception as err:
+            logger.error(f"Copy execution error: {err}")
+            raise
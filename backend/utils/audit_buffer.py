@@ -0,0 +1,121 @@
+import os
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+
+from .async_database import AsyncDatabase
+from .logger import logger
+
+LOGIN_AUDIT_BUFFER_ENABLED = os.getenv("LOGIN_AUDIT_BUFFER_ENABLED", "true").lower() in ["true", "1", "yes"]
+LOGIN_AUDIT_BATCH_SIZE = int(os.getenv("LOGIN_AUDIT_BATCH_SIZE", 500))
+LOGIN_AUDIT_FLUSH_INTERVAL_MS = float(os.getenv("LOGIN_AUDIT_FLUSH_INTERVAL_MS", 1000))
+LOGIN_AUDIT_MAX_BUFFERED = int(os.getenv("LOGIN_AUDIT_MAX_BUFFERED", 10000))
+
+LOGIN_LOG_COLUMNS = ["account_id", "login_time", "ip_address", "user_agent"]
+
+
+class LoginAuditBuffer:
+    """
+    Write-behind sink for login_logs.
+
+    Login events are queued in memory and written with COPY in batches of batch_size,
+    at least every flush_interval_ms. A failed batch goes back to the front of the queue
+    and is retried on the next flush, and stop() flushes everything left on shutdown.
+    enqueue() returns False when the buffer is not running or full, and the caller then
+    writes the event itself so no event is dropped under back pressure.
+    """
+
+    def __init__(self, batch_size: int = 500, flush_interval_ms: float = 1000.0, max_buffered: int = 10000):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.001, float(flush_interval_ms) / 1000.0)
+        self.max_buffered = max(self.batch_size, int(max_buffered))
+        self.db = AsyncDatabase()
+
+        self._events = deque()
+        self._task = None
+        self._stopping = False
+        self._wakeup = None
+        self._flush_lock = None
+        self._flushed = 0
+        self._failed_flushes = 0
+        self._rejected = 0
+
+    def start(self):
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Login audit buffer started")
+
+    def enqueue(self, account_id, ip_address, user_agent) -> bool:
+        if self._task is None or self._stopping or len(self._events) >= self.max_buffered:
+            self._rejected += 1
+            return False
+        # Keep the time of the login, not the time of the flush
+        self._events.append((account_id, datetime.now(timezone.utc).replace(tzinfo=None), ip_address, user_agent))
+        if len(self._events) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write every buffered event, stopping at the first failed batch.
+        :return: Number of events written.
+        """
+        written = 0
+        async with self._flush_lock:
+            while self._events:
+                batch = [self._events.popleft() for _ in range(min(self.batch_size, len(self._events)))]
+                try:
+                    await self.db.copy_records("login_logs", LOGIN_LOG_COLUMNS, batch)
+                except Exception as e:
+                    # Put the batch back in order and retry on the next flush
+                    self._events.extendleft(reversed(batch))
+                    self._failed_flushes += 1
+                    logger.error(f"Failed to flush {len(batch)} login audit event(s): {e}")
+                    break
+                except BaseException:
+                    # Cancelled mid-COPY: keep the batch so the final flush still writes it
+                    self._events.extendleft(reversed(batch))
+                    raise
+                written += len(batch)
+                self._flushed += len(batch)
+        return written
+
+    async def stop(self):
+        if self._task is None:
+            return
+        # Let the flush loop finish the batch it is writing instead of cancelling it mid-COPY
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await self._task
+        except Exception as e:
+            logger.error(f"Login audit buffer flush loop failed: {e}")
+        self._task = None
+        await self.flush()
+        if self._events:
+            logger.error(f"{len(self._events)} login audit event(s) could not be written on shutdown")
+        else:
+            logger.info("Login audit buffer flushed and stopped")
+
+    def get_stats(self):
+        return {
+            "running": self._task is not None,
+            "buffered": len(self._events),
+            "flushed": self._flushed,
+            "failed_flushes": self._failed_flushes,
+            "rejected": self._rejected,
+        }
+
+
+login_audit_buffer = LoginAuditBuffer(LOGIN_AUDIT_BATCH_SIZE, LOGIN_AUDIT_FLUSH_INTERVAL_MS, LOGIN_AUDIT_MAX_BUFFERED)
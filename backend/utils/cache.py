@@ -1,28 +1,160 @@
 import redis
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
 from .logger import logger
 import os
 import json
+import time
+import threading
+
+
+class MeteredConnectionPool(redis.BlockingConnectionPool):
+    """
+    Bounded Redis connection pool that records how long callers wait for a connection.
+    Callers block up to timeout seconds when every connection is in use.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._in_use = set()
+        self._acquired = 0
+        self._timeouts = 0
+        self._max_wait = 0.0
+
+    def get_connection(self, *args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            connection = super().get_connection(*args, **kwargs)
+        except redis.ConnectionError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        wait = time.perf_counter() - start_time
+        with self._stats_lock:
+            self._in_use.add(id(connection))
+            self._acquired += 1
+            self._max_wait = max(self._max_wait, wait)
+        return connection
+
+    def release(self, connection):
+        # The base pool also releases connections that failed to connect inside get_connection
+        with self._stats_lock:
+            self._in_use.discard(id(connection))
+        super().release(connection)
+
+    def get_stats(self):
+        with self._stats_lock:
+            return {
+                "max_connections": self.max_connections,
+                "created_connections": len(self._connections),
+                "in_use": len(self._in_use),
+                "saturation": len(self._in_use) / self.max_connections,
+                "acquired": self._acquired,
+                "timeouts": self._timeouts,
+                "max_wait_ms": self._max_wait * 1000,
+            }
+
 
 class Cache:
+    # Process-wide pool and client, shared by every Cache instance
+    _shared_pool = None
+    _shared_client = None
+    _shared_lock = threading.Lock()
+    # Health state: after a connection error Redis is considered down until the backoff expires
+    _unavailable_until = 0.0
+    _failures = 0
+
     def __init__(self):
-        self.client = redis.StrictRedis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=os.getenv('REDIS_PORT', 6379),
-            db=int(os.getenv('REDIS_DB', 0)),
-            password=os.getenv('REDIS_PASSWORD', None),
-            decode_responses=True
-        )
+        self.client = Cache._get_client()
         self.__connect()
 
+    @classmethod
+    def _get_client(cls):
+        with cls._shared_lock:
+            if cls._shared_client is None:
+                cls._shared_pool = MeteredConnectionPool(
+                    host=os.getenv('REDIS_HOST', 'localhost'),
+                    port=int(os.getenv('REDIS_PORT', 6379)),
+                    db=int(os.getenv('REDIS_DB', 0)),
+                    password=os.getenv('REDIS_PASSWORD', None),
+                    decode_responses=True,
+                    max_connections=int(os.getenv('REDIS_POOL_MAX', 50)),
+                    timeout=float(os.getenv('REDIS_POOL_ACQUIRE_TIMEOUT_MS', 1000)) / 1000.0,
+                    socket_connect_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT_MS', 2000)) / 1000.0,
+                    socket_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT_MS', 2000)) / 1000.0,
+                    # Idle connections are checked with a PING before reuse instead of on every Cache()
+                    health_check_interval=int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30)),
+                    retry=Retry(ExponentialBackoff(cap=0.5, base=0.05), int(os.getenv('REDIS_RETRIES', 2))),
+                    retry_on_error=[redis.ConnectionError, redis.TimeoutError],
+                )
+                cls._shared_client = redis.StrictRedis(connection_pool=cls._shared_pool)
+            return cls._shared_client
+
+    @classmethod
+    def _mark_failure(cls, error):
+        # Back off exponentially, 0.5 s doubling up to 30 s, while Redis keeps failing
+        with cls._shared_lock:
+            cls._failures += 1
+            backoff = min(30.0, 0.5 * 2 ** (cls._failures - 1))
+            cls._unavailable_until = time.monotonic() + backoff
+        logger.error(f"Redis connection error, retrying in {backoff:.1f}s: {error}")
+
+    @classmethod
+    def _mark_success(cls):
+        if cls._failures:
+            with cls._shared_lock:
+                cls._failures = 0
+                cls._unavailable_until = 0.0
+            logger.info("Redis connection recovered")
+
     def __connect(self):
+        # No roundtrip here: fail fast only while a recent connection error is backing off
+        if time.monotonic() < Cache._unavailable_until:
+            logger.error("Redis connection error: Redis is unavailable")
+            self.client = None
+            raise Exception("Something went wrong")
+
+    def _call(self, func, *args, **kwargs):
+        # Track the health state from the outcome of every command, and skip the
+        # roundtrip entirely while a connection error is backing off
+        if time.monotonic() < Cache._unavailable_until:
+            raise redis.ConnectionError("Redis is unavailable")
         try:
-            # Test the connection
-            self.client.ping()
-        except redis.ConnectionError as e:
+            result = func(*args, **kwargs)
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            Cache._mark_failure(e)
+            raise
+        Cache._mark_success()
+        return result
+
+    def ping(self):
+        """
+        Check the connection with a roundtrip, raises if Redis is not reachable.
+        """
+        try:
+            return self._call(self.client.ping)
+        except Exception as e:
             logger.error(f"Redis connection error: {e}")
-            self.client = None
             raise Exception("Something went wrong")
 
+    @classmethod
+    def get_pool_stats(cls):
+        if cls._shared_pool is None:
+            return None
+        stats = cls._shared_pool.get_stats()
+        stats["available"] = time.monotonic() >= cls._unavailable_until
+        stats["consecutive_failures"] = cls._failures
+        return stats
+
+    @classmethod
+    def close_shared_pool(cls):
+        with cls._shared_lock:
+            if cls._shared_pool is not None:
+                cls._shared_pool.disconnect()
+                cls._shared_pool = None
+                cls._shared_client = None
+
     def get(self, key):
         """
         Get a value from the cache by key.
@@ -31,12 +163,25 @@ class Cache:
         """
         try:
             if self.client:
-                value = self.client.get(key)
+                value = self._call(self.client.get, key)
                 return value
         except Exception as e:
             logger.error(f"Error getting key '{key}': {e}")
             return None
 
+    def exists(self, key):
+        """
+        Check whether a key exists. Unlike get, errors are raised instead of being
+        reported as a missing key, for callers that must fail closed.
+        :param key: The key to check.
+        :return: True if the key exists.
+        """
+        try:
+            return self._call(self.client.exists, key) > 0
+        except Exception as e:
+            logger.error(f"Error checking key '{key}': {e}")
+            raise Exception("Something went wrong")
+
     def set(self, key, value, ttl=-1):
         """
         Set a key in the cache with an optional TTL (time to live).
@@ -48,9 +193,9 @@ class Cache:
         try:
             if self.client:
                 if ttl > 0:
-                    self.client.set(key, value, ex=ttl)
+                    self._call(self.client.set, key, value, ex=ttl)
                 else:
-                    self.client.set(key, value)
+                    self._call(self.client.set, key, value)
         except Exception as e:
             logger.error(f"Error setting key '{key}': {e}")
             raise Exception("Something went wrong")
@@ -62,7 +207,7 @@ class Cache:
         """
         try:
             if self.client:
-                self.client.delete(key)
+                self._call(self.client.delete, key)
         except Exception as e:
             logger.error(f"Error deleting key '{key}': {e}")
             raise Exception("Something went wrong")
@@ -78,9 +223,9 @@ class Cache:
             if self.client:
                 json_value = json.dumps(value)
                 if ttl > 0:
-                    self.client.set(key, json_value, ex=ttl)
+                    self._call(self.client.set, key, json_value, ex=ttl)
                 else:
-                    self.client.set(key, json_value)
+                    self._call(self.client.set, key, json_value)
         except Exception as e:
             logger.error(f"Error setting JSON key '{key}': {e}")
             raise Exception("Something went wrong")
@@ -93,11 +238,79 @@ class Cache:
         """
         try:
             if self.client:
-                json_value = self.client.get(key)
+                json_value = self._call(self.client.get, key)
                 if json_value:
                     return json.loads(json_value)
                 return None
         except Exception as e:
             logger.error(f"Error getting JSON key '{key}': {e}")
             return None
-        
\ No newline at end of file
+        
+    def get_many_json(self, keys):
+        """
+        Get several JSON values in one roundtrip.
+        :param keys: The keys to retrieve.
+        :return: List of values in the same order as keys, None for missing keys.
+        """
+        try:
+            if self.client and keys:
+                values = self._call(self.client.mget, keys)
+                return [json.loads(value) if value else None for value in values]
+            return [None] * len(keys)
+        except Exception as e:
+            logger.error(f"Error getting JSON keys: {e}")
+            return [None] * len(keys)
+        
+    def set_many_json(self, mapping, ttl=-1):
+        """
+        Set several JSON values in one roundtrip with an optional TTL (time to live).
+        :param mapping: Dict of key -> JSON value.
+        :param ttl: Time to live in seconds. Default is -1 (no expiration).
+        """
+        try:
+            if self.client and mapping:
+                pipeline = self.client.pipeline(transaction=False)
+                for key, value in mapping.items():
+                    if ttl > 0:
+                        pipeline.set(key, json.dumps(value), ex=ttl)
+                    else:
+                        pipeline.set(key, json.dumps(value))
+                self._call(pipeline.execute)
+        except Exception as e:
+            logger.error(f"Error setting JSON keys: {e}")
+            raise Exception("Something went wrong")
+
+    def publish(self, channel, message):
+        """
+        Publish a message on a pub/sub channel.
+        :param channel: The channel to publish on.
+        :param message: The message to publish.
+        :return: Number of subscribers that received the message.
+        """
+        try:
+            if self.client:
+                return self._call(self.client.publish, channel, message)
+        except Exception as e:
+            logger.error(f"Error publishing to channel '{channel}': {e}")
+            raise Exception("Something went wrong")
+
+    def scan_keys(self, pattern, count=1000):
+        """
+        Iterate over the keys matching a pattern without blocking the server like KEYS.
+        :param pattern: Glob style pattern, e.g. "prefix:*".
+        :param count: Keys per SCAN roundtrip.
+        :return: List of matching keys.
+        """
+        try:
+            if self.client:
+                return self._call(lambda: list(self.client.scan_iter(match=pattern, count=count)))
+            return []
+        except Exception as e:
+            logger.error(f"Error scanning keys '{pattern}': {e}")
+            raise Exception("Something went wrong")
+
+    def pubsub(self):
+        """
+        Create a pub/sub object, it holds a dedicated connection until closed.
+        """
+        return self.client.pubsub(ignore_subscribe_messages=True)
\ No newline at end of file
@@ -36,7 +36,22 @@ class TokenExpiredException(CustomException):
         super().__init__(message)
         self.status_code = 401
         
+class PayloadTooLargeException(CustomException):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.status_code = 413
+        
+class TooManyRequestsException(CustomException):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.status_code = 429
+        
 class ServerErrorException(CustomException):
     def __init__(self, message: str):
         super().__init__(message)
-        self.status_code = 500
\ No newline at end of file
+        self.status_code = 500
+        
+class ServiceUnavailableException(CustomException):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.status_code = 503
\ No newline at end of file
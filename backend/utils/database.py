@@ -1,34 +1,191 @@
 import os
+import time
+import threading
+from contextlib import contextmanager
 from psycopg2 import pool
 from .logger import logger
+from .custom_exception import ServiceUnavailableException
 
 
-class Database:
-    def __init__(self):
-        # Build connection config
-        self.config = {
-            "user": os.getenv("POSTGRES_USER", "postgres"),
-            "password": os.getenv("POSTGRES_PASSWORD", "postgres"),
-            "host": os.getenv("POSTGRES_HOST", "database"),
-            "database": os.getenv("POSTGRES_DB", "test_db"),
-            "port": int(os.getenv("POSTGRES_PORT", 5432)),
-        }
-        self.connection = None
-
-        pool_min = int(os.getenv("POSTGRES_POOL_MIN", 1))
-        pool_max = int(os.getenv("POSTGRES_POOL_MAX", 10))
+class ConnectionPool:
+    """
+    Thread-safe PostgreSQL connection pool shared by the whole process.
+
+    Callers wait at most acquire_timeout_ms for a free connection and get a
+    ServiceUnavailableException instead of blocking a worker thread indefinitely.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, acquire_timeout_ms: float, **config):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.acquire_timeout = max(0.0, float(acquire_timeout_ms)) / 1000.0
+        self.pool = pool.ThreadedConnectionPool(minconn=minconn, maxconn=maxconn, **config)
+
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._stats_lock = threading.Lock()
+        self._in_use = 0
+        self._waiting = 0
+        self._acquired = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def getconn(self):
+        start_time = time.perf_counter()
+        with self._stats_lock:
+            self._waiting += 1
+        acquired = self._slots.acquire(timeout=self.acquire_timeout)
+        wait = time.perf_counter() - start_time
+        with self._stats_lock:
+            self._waiting -= 1
+            if not acquired:
+                self._timeouts += 1
+        if not acquired:
+            logger.warning(f"Timed out after {wait * 1000:.0f} ms waiting for a database connection")
+            raise ServiceUnavailableException("Database is busy, please retry later")
+
+        try:
+            connection = self.pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._stats_lock:
+            self._in_use += 1
+            self._acquired += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        return connection
 
+    def putconn(self, connection):
         try:
-            self.pool = pool.SimpleConnectionPool(
-                minconn=pool_min,
-                maxconn=pool_max,
-                **self.config,
-            )
-            if self.pool:
+            # Connections broken by the server are dropped instead of handed out again
+            self.pool.putconn(connection, close=bool(connection.closed))
+        finally:
+            with self._stats_lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def closeall(self):
+        self.pool.closeall()
+
+    def get_stats(self):
+        with self._stats_lock:
+            return {
+                "min_connections": self.minconn,
+                "max_connections": self.maxconn,
+                "in_use": self._in_use,
+                "idle": len(self.pool._pool),
+                "waiting": self._waiting,
+                "saturation": self._in_use / self.maxconn,
+                "acquired": self._acquired,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": self._total_wait / self._acquired * 1000 if self._acquired else 0.0,
+                "max_wait_ms": self._max_wait * 1000,
+            }
+
+
+class Database:
+    # Process-wide pool, created by init_pool at startup or on first use
+    _shared_pool = None
+    _shared_pool_lock = threading.Lock()
+
+    def __init__(self, connection_pool: ConnectionPool = None):
+        self.pool = connection_pool or Database.get_pool()
+        # Connection of the transaction() block currently open on each thread
+        self._local = threading.local()
+
+    @classmethod
+    def init_pool(cls) -> ConnectionPool:
+        """
+        Create the shared connection pool if it does not exist yet.
+        :return: The shared ConnectionPool.
+        """
+        with cls._shared_pool_lock:
+            if cls._shared_pool:
+                return cls._shared_pool
+
+            config = {
+                "user": os.getenv("POSTGRES_USER", "postgres"),
+                "password": os.getenv("POSTGRES_PASSWORD", "postgres"),
+                "host": os.getenv("POSTGRES_HOST", "database"),
+                "database": os.getenv("POSTGRES_DB", "test_db"),
+                "port": int(os.getenv("POSTGRES_PORT", 5432)),
+            }
+            pool_min = int(os.getenv("POSTGRES_POOL_MIN", 1))
+            pool_max = int(os.getenv("POSTGRES_POOL_MAX", 10))
+            acquire_timeout_ms = float(os.getenv("POSTGRES_POOL_ACQUIRE_TIMEOUT_MS", 5000))
+
+            try:
+                cls._shared_pool = ConnectionPool(pool_min, pool_max, acquire_timeout_ms, **config)
                 logger.info("PostgreSQL connection pool created successfully.")
-        except Exception as err:
-            logger.error(f"Error creating PostgreSQL connection pool: {err}")
-            raise Exception("Failed to create connection pool")
+            except Exception as err:
+                logger.error(f"Error creating PostgreSQL connection pool: {err}")
+                raise Exception("Failed to create connection pool")
+            return cls._shared_pool
+
+    @classmethod
+    def get_pool(cls) -> ConnectionPool:
+        return cls._shared_pool or cls.init_pool()
+
+    @classmethod
+    def get_pool_stats(cls):
+        return cls._shared_pool.get_stats() if cls._shared_pool else None
+
+    @classmethod
+    def close_shared_pool(cls):
+        """
+        Close the shared pool, called once on application shutdown.
+        """
+        with cls._shared_pool_lock:
+            if cls._shared_pool:
+                cls._shared_pool.closeall()
+                cls._shared_pool = None
+                logger.info("PostgreSQL connection pool closed successfully.")
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the duration of the block and always return it to the pool.
+        """
+        connection = self.pool.getconn()
+        try:
+            connection.autocommit = False
+            yield connection
+        finally:
+            self.pool.putconn(connection)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run every statement of the block in a single transaction on one connection.
+        Commits when the block exits, rolls back if it raises. execute_query and
+        execute_non_query called on this thread inside the block join the transaction,
+        and nested blocks join the outermost one.
+        """
+        current = getattr(self._local, "connection", None)
+        if current is not None:
+            yield current
+            return
+
+        with self.connection() as connection:
+            self._local.connection = connection
+            try:
+                yield connection
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                self._local.connection = None
+
+    def _execute(self, query, params, fetch):
+        with self.transaction() as connection:
+            with connection.cursor() as cursor:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                return cursor.fetchall() if fetch else cursor.rowcount
 
     def execute_query(self, query, params=None):
         """
@@ -37,76 +194,32 @@ class Database:
         :param params: Parameters for the query (optional).
         :return: Query result.
         """
-        cursor = None
         try:
-            self.connection = self.pool.getconn()
-            cursor = self.connection.cursor()
-            self.connection.autocommit = False
-
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-
-            result = cursor.fetchall()
-            self.connection.commit()
-            return result
+            return self._execute(query, params, fetch=True)
         except Exception as err:
             logger.error(f"Query execution error: {err}")
-            if self.connection:
-                self.connection.rollback()
             raise
-        finally:
-            if cursor:
-                cursor.close()
-            if self.connection:
-                self.pool.putconn(self.connection)
 
     def execute_non_query(self, query, params=None):
         """
         Execute an INSERT/UPDATE/DELETE query.
         Returns number of affected rows.
         """
-        cursor = None
         try:
-            self.connection = self.pool.getconn()
-            cursor = self.connection.cursor()
-            self.connection.autocommit = False
-
-            cursor.execute(query, params)
-            affected = cursor.rowcount
-            self.connection.commit()
-            return affected
+            return self._execute(query, params, fetch=False)
         except Exception as err:
             logger.error(f"Non-query execution error: {err}")
-            if self.connection:
-                self.connection.rollback()
             raise
-        finally:
-            if cursor:
-                cursor.close()
-            if self.connection:
-                self.pool.putconn(self.connection)
-
-    def close_pool(self):
-        """
-        Close all connections in the pool.
-        """
-        try:
-            if self.pool:
-                self.pool.closeall()
-                logger.info("PostgreSQL connection pool closed successfully.")
-        except Exception as e:
-            logger.error(f"Error closing connection pool: {e}")
-            raise Exception("Something went wrong")
 
     def rollback(self):
         """
-        Rollback the current transaction.
+        Rollback the transaction() block open on the current thread.
+        Statements outside a transaction() block are already committed or rolled back.
         """
+        connection = getattr(self._local, "connection", None)
         try:
-            if self.connection:
-                self.connection.rollback()
+            if connection:
+                connection.rollback()
                 logger.info("Transaction rolled back successfully.")
         except Exception as e:
             logger.error(f"Error during rollback: {e}")
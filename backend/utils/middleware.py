@@ -1,86 +1,106 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
 from fastapi import Security
 from fastapi.security.api_key import APIKeyHeader
 from .custom_exception import UnauthorizedException
-from .token import verify_token
+from .token import verify_token, check_not_revoked
 from .logger import logger
-from .cache import Cache
+
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))
+AUTH_TOKEN_CACHE_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_CACHE_TTL_SECONDS", 60))
+# Role allowed to load, activate and roll back model versions
+MODEL_ADMIN_ROLE = os.getenv("MODEL_ADMIN_ROLE", "doctor")
 
 # Instantiate APIKeyHeader
 api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 
-def login_required(token: str = Security(api_key_header)):
+
+class VerifiedTokenCache:
     """
-    Middleware to check if the user is logged in.
+    LRU of token claims that already passed signature and payload validation, keyed by
+    a digest of the token so the tokens themselves are not kept in memory.
+
+    Entries live at most ttl seconds and never past the token's exp. The blacklist is
+    still checked on every request, so a revoked token is rejected even when cached.
     """
-    if not token:
-        logger.error("No token provided")
-        raise UnauthorizedException("You are not authenticated")
-    cache = Cache()
-    if cache.get(token):
-        logger.info("Token is in blacklist")
-        raise UnauthorizedException("You are not authenticated")
-    
-    try:
-        account_data = verify_token(token)
-        if not account_data or not isinstance(account_data, dict) or "account_id" not in account_data:
-            logger.error("Invalid token data")
-            raise UnauthorizedException("You are not authenticated")
-        return account_data
-    except UnauthorizedException as ue:
-        raise ue
-    except Exception as e:
-        logger.error(f"Error verifying token: {e}")
-        raise UnauthorizedException("You are not authenticated")
-    
-def patient_login_required(token: str = Security(api_key_header)):
+
+    def __init__(self, max_size: int = 10000, ttl: int = 60):
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def set(self, token: str, claims: dict):
+        key = self._key(token)
+        expires_at = min(time.time() + self.ttl, claims.get("exp", 0))
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+verified_token_cache = VerifiedTokenCache(AUTH_TOKEN_CACHE_SIZE, AUTH_TOKEN_CACHE_TTL_SECONDS)
+
+
+def auth_required(role: Optional[str] = None):
     """
-    Middleware to check if the user is a patient.
+    Build a dependency that checks the user is logged in, and has the given role if any.
+    :param role: Required role, e.g. "patient" or "doctor", None accepts every role.
+    :return: Dependency returning the token claims.
     """
-    if not token:
-        logger.error("No token provided")
-        raise UnauthorizedException("You are not authenticated")
-    cache = Cache()
-    if cache.get(token):
-        logger.info("Token is in blacklist")
-        raise UnauthorizedException("You are not authenticated")
-    
-    try:
-        account_data = verify_token(token)
-        if not account_data or not isinstance(account_data, dict) or "account_id" not in account_data:
-            logger.error("Invalid token data")
+    def dependency(token: str = Security(api_key_header)):
+        if not token:
+            logger.error("No token provided")
             raise UnauthorizedException("You are not authenticated")
-        if account_data.get("role") != "patient":
-            raise UnauthorizedException("You are not authorized to access this resource")
-        return account_data
-    except UnauthorizedException as ue:
-        raise ue
-    except Exception as e:
-        logger.error(f"Error verifying token: {e}")
-        raise UnauthorizedException("You are not authenticated")
-    
-    
-def doctor_login_required(token: str = Security(api_key_header)):
-    """
-    Middleware to check if the user is a doctor.
-    """
-    if not token:
-        logger.error("No token provided")
-        raise UnauthorizedException("You are not authenticated")
-    cache = Cache()
-    if cache.get(token):
-        logger.info("Token is in blacklist")
-        raise UnauthorizedException("You are not authenticated")
-    
-    try:
-        account_data = verify_token(token)
-        if not account_data or not isinstance(account_data, dict) or "account_id" not in account_data:
-            logger.error("Invalid token data")
+
+        try:
+            account_data = verified_token_cache.get(token)
+            if account_data is not None:
+                check_not_revoked(token, account_data)
+            else:
+                account_data = verify_token(token)
+                if not account_data or not isinstance(account_data, dict) or "account_id" not in account_data:
+                    logger.error("Invalid token data")
+                    raise UnauthorizedException("You are not authenticated")
+                verified_token_cache.set(token, account_data)
+        except UnauthorizedException as ue:
+            raise ue
+        except Exception as e:
+            logger.error(f"Error verifying token: {e}")
             raise UnauthorizedException("You are not authenticated")
-        if account_data.get("role") != "doctor":
+
+        if role and account_data.get("role") != role:
             raise UnauthorizedException("You are not authorized to access this resource")
-        return account_data
-    except UnauthorizedException as ue:
-        raise ue
-    except Exception as e:
-        logger.error(f"Error verifying token: {e}")
-        raise UnauthorizedException("You are not authenticated")
\ No newline at end of file
+        # Handlers get their own copy, the cached claims are shared between requests
+        return dict(account_data)
+
+    return dependency
+
+
+login_required = auth_required()
+patient_login_required = auth_required("patient")
+doctor_login_required = auth_required("doctor")
+model_admin_required = auth_required(MODEL_ADMIN_ROLE)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import os
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+from .custom_exception import TooManyRequestsException
+from .logger import logger
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_POOL_SIZE = int(os.getenv("PASSWORD_HASH_POOL_SIZE", 2))
+PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", 32))
+
+
+def _hash_password(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _check_password(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated pool of worker processes, so hashing uses every core
+    without holding the request threadpool or the event loop.
+
+    At most queue_depth hashes can be queued or running, further calls are rejected
+    right away with TooManyRequestsException instead of piling up behind a login burst.
+    """
+
+    def __init__(self, pool_size: int = 2, queue_depth: int = 32, rounds: int = 12):
+        self.pool_size = max(1, int(pool_size))
+        self.queue_depth = max(1, int(queue_depth))
+        self.rounds = int(rounds)
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.queue_depth)
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn instead of fork: the parent already runs XGBoost/OpenMP threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.pool_size,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def start(self):
+        """
+        Start the worker processes ahead of the first login.
+        """
+        executor = self._get_executor()
+        for _ in range(self.pool_size):
+            executor.submit(_worker_ready)
+        logger.info(f"Password hashing pool started with {self.pool_size} worker(s), bcrypt cost {self.rounds}")
+
+    async def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._rejected += 1
+            raise TooManyRequestsException("Too many login attempts in progress, please retry later")
+
+        with self._stats_lock:
+            self._in_flight += 1
+        executor = self._get_executor()
+        try:
+            return await asyncio.wrap_future(executor.submit(func, *args))
+        except BrokenProcessPool:
+            # A worker died, start a fresh pool on the next call. Concurrent calls see the
+            # same broken executor, only the first one shuts it down
+            with self._executor_lock:
+                if self._executor is executor:
+                    logger.error("Password hashing pool is broken, restarting it")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+            raise
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+                self._completed += 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password with the configured bcrypt cost.
+        :param password: The plain text password.
+        :return: The bcrypt hash.
+        """
+        return await self._run(_hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Check a password against a bcrypt hash.
+        :param password: The plain text password.
+        :param hashed_password: The stored bcrypt hash.
+        :return: True if the password matches.
+        """
+        return await self._run(_check_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Check whether a hash was made with a different cost than the configured one.
+        :param hashed_password: The stored bcrypt hash, e.g. "$2b$12$...".
+        """
+        try:
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def get_stats(self):
+        with self._stats_lock:
+            return {
+                "pool_size": self.pool_size,
+                "queue_depth": self.queue_depth,
+                "rounds": self.rounds,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def close(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(
+    pool_size=PASSWORD_HASH_POOL_SIZE,
+    queue_depth=PASSWORD_HASH_QUEUE_DEPTH,
+    rounds=BCRYPT_ROUNDS,
+)
@@ -13,7 +13,7 @@ def standard_response(func: Callable[..., T]) -> Callable[..., StandardResponse[
     @wraps(func)
     async def async_wrapper(*args, **kwargs) -> StandardResponse[T]:
         try:
-            result = func(*args, **kwargs)
+            result = await func(*args, **kwargs)
             return StandardResponse[T](
                 status="success",
                 data=result,
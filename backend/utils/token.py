@@ -1,12 +1,17 @@
 import jwt
 import os
+import string
+import secrets
+import hashlib
 from datetime import datetime, timedelta, timezone
 from .logger import logger
 from .custom_exception import UnauthorizedException
+from .token_blacklist import token_blacklist
 
 
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your_secret_key")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+REFRESH_TOKEN_EXPIRATION_TIME = int(os.getenv("REFRESH_TOKEN_EXPIRATION_DAYS", 30)) * 24 * 60 * 60
 
 def sign_token(payload, expires_in: int = 3600) -> str:
     """
@@ -15,9 +20,10 @@ def sign_token(payload, expires_in: int = 3600) -> str:
     :param expires_in: Expiration time in seconds (default is 3600 seconds).
     :return: The signed JWT token.
     """
-    # Set the expiration time
+    # Set the expiration time and a unique id, revoking the token blacklists only the id
     try:
         payload['exp'] = datetime.now(tz=timezone.utc) + timedelta(seconds=expires_in)
+        payload['jti'] = secrets.token_urlsafe(12)
         token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
         return token
     except Exception as e:
@@ -33,7 +39,6 @@ def verify_token(token: str):
     """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         raise UnauthorizedException("Token has expired")
     except jwt.InvalidTokenError:
@@ -41,4 +46,64 @@ def verify_token(token: str):
         raise UnauthorizedException("You are not authenticated")
     except Exception as e:
         logger.error(f"Error verifying JWT: {e}")
-        raise Exception("Something went wrong")
\ No newline at end of file
+        raise Exception("Something went wrong")
+
+    check_not_revoked(token, payload)
+    return payload
+
+
+def check_not_revoked(token: str, payload: dict):
+    """
+    Raise if a verified token has been revoked.
+    :param token: The JWT token.
+    :param payload: The verified payload of the token.
+    """
+    if token_blacklist.contains(token_id(token, payload)):
+        logger.info("Token is in blacklist")
+        raise UnauthorizedException("You are not authenticated")
+
+
+def token_id(token: str, payload: dict) -> str:
+    """
+    Id of a token in the blacklist.
+    :param token: The JWT token.
+    :param payload: The verified payload of the token.
+    :return: The jti claim, or a digest of the token for tokens signed without one.
+    """
+    return payload.get("jti") or hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def revoke_token(token: str) -> bool:
+    """
+    Blacklist a token until it expires.
+    :param token: The JWT token to revoke.
+    :return: False if the token is invalid or already expired, nothing to revoke then.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.InvalidTokenError:
+        return False
+    # Keep the entry only as long as the token could still be accepted
+    ttl = int(payload["exp"] - datetime.now(tz=timezone.utc).timestamp()) + 1
+    if ttl <= 0:
+        return False
+    token_blacklist.add(token_id(token, payload), ttl)
+    return True
+
+
+def generate_refresh_token() -> str:
+    """
+    Generate a new random refresh token.
+    :return: The refresh token to hand to the client.
+    """
+    alphabet = string.ascii_lowercase + string.digits
+    return ''.join(secrets.choice(alphabet) for _ in range(64))
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    """
+    Hash a refresh token for storage and lookup, the token itself is never stored.
+    :param refresh_token: The refresh token from the client.
+    :return: Hex encoded SHA-256 of the token.
+    """
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
\ No newline at end of file
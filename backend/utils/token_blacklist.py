@@ -0,0 +1,190 @@
+import os
+import math
+import time
+import uuid
+import hashlib
+import threading
+
+from .cache import Cache
+from .logger import logger
+
+TOKEN_BLACKLIST_FILTER_ENABLED = os.getenv("TOKEN_BLACKLIST_FILTER_ENABLED", "true").lower() in ["true", "1", "yes"]
+TOKEN_BLACKLIST_FILTER_CAPACITY = int(os.getenv("TOKEN_BLACKLIST_FILTER_CAPACITY", 100000))
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = float(os.getenv("TOKEN_BLACKLIST_FILTER_ERROR_RATE", 0.001))
+# Bloom filters can not forget entries, so the filter is rebuilt from Redis to drop expired ones
+TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS = int(os.getenv("TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS", 300))
+
+BLACKLIST_KEY_PREFIX = "blacklist:"
+BLACKLIST_CHANNEL = "token_blacklist"
+
+
+class BloomFilter:
+    """
+    Fixed size Bloom filter: might_contain never returns False for an added entry, and
+    returns True for an entry that was not added with probability about error_rate
+    while at most capacity entries are stored.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, int(capacity))
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, entry: str):
+        # Double hashing, k positions from the two halves of one SHA-256 digest
+        digest = hashlib.sha256(entry.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, entry: str):
+        with self._lock:
+            for position in self._positions(entry):
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def might_contain(self, entry: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(entry))
+
+
+class TokenBlacklist:
+    """
+    Ids of revoked access tokens, stored in Redis under "blacklist:<entry>" with a TTL.
+
+    Every instance keeps a Bloom filter of the blacklist, so checking a token that was
+    never revoked, which is nearly every request, needs no Redis roundtrip. Only filter
+    hits are confirmed with a GET. The filter is loaded with SCAN and kept in sync by a
+    subscriber thread that receives every add() over pub/sub, so revocations on other
+    instances are seen within milliseconds. While the subscription is down the filter is
+    not trusted and every check falls back to Redis; a silently dropped subscription is
+    detected by the Redis health check, which bounds the staleness window.
+
+    A check that can not reach Redis fails closed: the token is treated as revoked.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001, rebuild_seconds: int = 300):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.rebuild_seconds = rebuild_seconds
+        self._filter = BloomFilter(self.capacity, self.error_rate)
+        # Events are tagged with the publishing instance, which already added the entry
+        self.node_id = uuid.uuid4().hex
+        self._synced = False
+        self._stopped = threading.Event()
+        self._thread = None
+        self._filter_skips = 0
+        self._redis_checks = 0
+        self._redis_errors = 0
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="token-blacklist-sync", daemon=True)
+        self._thread.start()
+        logger.info("Token blacklist filter started")
+
+    def stop(self):
+        self._stopped.set()
+        self._synced = False
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def add(self, entry: str, ttl: int):
+        """
+        Blacklist an entry for ttl seconds and notify every instance.
+        :param entry: The token id to blacklist.
+        :param ttl: Time to live in seconds.
+        """
+        cache = Cache()
+        cache.set(BLACKLIST_KEY_PREFIX + entry, 1, ttl)
+        self._filter.add(entry)
+        try:
+            cache.publish(BLACKLIST_CHANNEL, f"{self.node_id}:{entry}")
+        except Exception as e:
+            # Subscribers resync from Redis when they reconnect, the key itself is written
+            logger.warning(f"Could not publish token blacklist event: {e}")
+
+    def contains(self, entry: str) -> bool:
+        """
+        Check whether an entry is blacklisted.
+        :param entry: The token id to check.
+        :return: True if the entry is blacklisted, or if Redis could not be checked.
+        """
+        if self._synced and not self._filter.might_contain(entry):
+            self._filter_skips += 1
+            return False
+        self._redis_checks += 1
+        try:
+            return Cache().exists(BLACKLIST_KEY_PREFIX + entry)
+        except Exception as e:
+            # Fail closed, a revoked token must not pass because Redis is unreachable
+            self._redis_errors += 1
+            logger.error(f"Token blacklist check failed, rejecting the token: {e}")
+            return True
+
+    def _rebuild(self):
+        keys = Cache().scan_keys(BLACKLIST_KEY_PREFIX + "*")
+        entries = [key[len(BLACKLIST_KEY_PREFIX):] for key in keys]
+        # Grow with the blacklist so the false positive rate stays near error_rate
+        bloom_filter = BloomFilter(max(self.capacity, 2 * len(entries)), self.error_rate)
+        for entry in entries:
+            bloom_filter.add(entry)
+        self._filter = bloom_filter
+        return len(entries)
+
+    def _run(self):
+        backoff = 0.5
+        while not self._stopped.is_set():
+            pubsub = None
+            try:
+                pubsub = Cache().pubsub()
+                # Subscribe before loading, so nothing added during the SCAN is missed
+                pubsub.subscribe(BLACKLIST_CHANNEL)
+                loaded = self._rebuild()
+                self._synced = True
+                backoff = 0.5
+                logger.info(f"Token blacklist filter loaded with {loaded} entries")
+                rebuild_at = time.monotonic() + self.rebuild_seconds
+
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        node_id, _, entry = message["data"].partition(":")
+                        if node_id != self.node_id:
+                            self._filter.add(entry)
+                    if time.monotonic() >= rebuild_at:
+                        self._rebuild()
+                        rebuild_at = time.monotonic() + self.rebuild_seconds
+            except Exception as e:
+                self._synced = False
+                logger.error(f"Token blacklist filter out of sync, checking Redis until it recovers: {e}")
+                self._stopped.wait(backoff)
+                backoff = min(30.0, backoff * 2)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def get_stats(self):
+        return {
+            "synced": self._synced,
+            "entries": self._filter.count,
+            "filter_bits": self._filter.size,
+            "hash_count": self._filter.hash_count,
+            "filter_skips": self._filter_skips,
+            "redis_checks": self._redis_checks,
+            "redis_errors": self._redis_errors,
+        }
+
+
+token_blacklist = TokenBlacklist(
+    capacity=TOKEN_BLACKLIST_FILTER_CAPACITY,
+    error_rate=TOKEN_BLACKLIST_FILTER_ERROR_RATE,
+    rebuild_seconds=TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS,
+)
\ No newline at end of file
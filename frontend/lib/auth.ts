@@ -81,12 +81,13 @@ export class AuthManager {
 
     try {
       const endpoint = '/api/v1/auth/get_new_access_token'
-       
 
+      // Sent in the body, a refresh token in the query string would end up in logs
       const response = await fetch(`${this.API_BASE_URL}${endpoint}`, {
-        method: 'GET',
+        method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Authorization': `${authData.access_token}`,
         },
         body: JSON.stringify({
           refresh_token: authData.refresh_token,
@@ -96,13 +97,14 @@ export class AuthManager {
 
       if (response.ok) {
         const data = await response.json()
-        const newAccessToken = data.data?.access_token || data.data?.access_token || data.access_token
+        const newAccessToken = data.data?.new_access_token
 
         if (newAccessToken) {
-          // Update the access token in storage
+          // Refresh tokens are single use, keep the rotated one for the next refresh
           const updatedAuthData = {
             ...authData,
-            access_token: newAccessToken
+            access_token: newAccessToken,
+            refresh_token: data.data?.refresh_token || authData.refresh_token
           }
           this.setAuthData(updatedAuthData)
           return newAccessToken